@@ -1,12 +1,21 @@
 import streamlit as st
+import hashlib
+import io
 import json
 import os  # Add this line
+import uuid
+import zipfile
 from datetime import datetime
-from resume_generator import ResumeGenerator
-from cover_letter_generator import CoverLetterGenerator
-from pdf_generator import PDFGenerator
-from templates import get_available_templates
-from utils import validate_email, validate_phone
+from pdf_generator import PDFGenerator, render_all_templates
+from templates import get_available_templates, get_industry_recommendations
+from utils import validate_email, validate_phone, check_ats_compatibility, highlight_skills
+import metrics
+import profiling
+import tracing
+from job_queue import SPECULATIVE_PRIORITY, get_job_queue, start_workers
+from cover_letter_generator import CoverLetterGenerator, adapt_cover_letter, find_similar_cover_letter
+from keyword_engine import record_job_description
+from posting_index import get_posting_index
 
 # Add your API key here
 
@@ -156,6 +165,11 @@ def main():
     
     st.sidebar.markdown('<div class="sidebar-header"><h3>📋 Navigation</h3></div>', unsafe_allow_html=True)
     
+    # Generation runs in background jobs; pick up any that finished since the last rerun
+    start_workers()
+    collect_generation_job('resume', 'generated_resume')
+    collect_generation_job('cover_letter', 'generated_cover_letter')
+    
     # Progress tracking
     progress_items = [
         ("Personal Information", bool(st.session_state.personal_info.get('first_name'))),
@@ -176,23 +190,36 @@ def main():
     
     page = st.sidebar.selectbox(
         "Choose a section:",
-        ["Personal Information", "Work Experience", "Education", "Skills", "Resume Generator", "Cover Letter Generator", "Document Preview"]
+        ["Personal Information", "Work Experience", "Education", "Skills", "Resume Generator", "Cover Letter Generator", "Document Preview", "Recruiter Mode"]
     )
     
-    if page == "Personal Information":
-        personal_info_page()
-    elif page == "Work Experience":
-        work_experience_page()
-    elif page == "Education":
-        education_page()
-    elif page == "Skills":
-        skills_page()
-    elif page == "Resume Generator":
-        resume_generator_page()
-    elif page == "Cover Letter Generator":
-        cover_letter_page()
-    elif page == "Document Preview":
-        document_preview_page()
+    # Serve /metrics when METRICS_PORT is set (started once per process)
+    metrics.start_metrics_server()
+    
+    pages = {
+        "Personal Information": personal_info_page,
+        "Work Experience": work_experience_page,
+        "Education": education_page,
+        "Skills": skills_page,
+        "Resume Generator": resume_generator_page,
+        "Cover Letter Generator": cover_letter_page,
+        "Document Preview": document_preview_page,
+        "Recruiter Mode": recruiter_page
+    }
+    
+    # APP_PROFILE (or ?profile= with APP_PROFILE_QUERY=1) profiles the render; off by default
+    profile_mode = profiling.profiling_mode(st.query_params)
+    
+    # st.rerun() ends a render by raising, so the render is counted on the way out
+    try:
+        with metrics.timed('page_render_duration_seconds', page=page):
+            if profile_mode:
+                profiling.profile_call(pages[page], page, profile_mode)
+            else:
+                pages[page]()
+    finally:
+        metrics.increment('page_renders_total', page=page)
+        metrics.export_metrics()
 
 def personal_info_page():
     st.markdown('<div class="section-header"><h2>📋 Personal Information</h2></div>', unsafe_allow_html=True)
@@ -312,6 +339,10 @@ def work_experience_page():
                         'current': current_job
                     }
                     st.session_state.work_experience.append(experience)
+                    if os.getenv('SPECULATIVE_ENHANCEMENT') == '1':
+                        # Start on the bullets now so they are ready when the resume is generated
+                        get_job_queue().submit('enhance_experience', {'experience': experience},
+                                               priority=SPECULATIVE_PRIORITY)
                     st.success("Work experience added successfully!")
                     st.rerun()
                 else:
@@ -493,31 +524,34 @@ def resume_generator_page():
     st.subheader("Template Preview")
     st.markdown(templates[selected_template]['description'])
     
-    # Generate resume
-    if st.button("Generate Resume with AI"):
-        with st.spinner("Generating your resume..."):
-            try:
-                generator = ResumeGenerator()
-                
-                user_data = {
-                    'personal_info': st.session_state.personal_info,
-                    'work_experience': st.session_state.work_experience,
-                    'education': st.session_state.education,
-                    'skills': st.session_state.skills
-                }
-                
-                resume_content = generator.generate_resume(user_data, selected_template)
-                st.session_state.generated_resume = {
-                    'content': resume_content,
-                    'template': selected_template,
-                    'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
-                st.success("Resume generated successfully!")
-                st.rerun()
-                
-            except Exception as e:
-                st.error(f"Error generating resume: {str(e)}")
+    # Generate resume (in a background job, so a refresh doesn't lose it)
+    job = collect_generation_job('resume', 'generated_resume')
+    generating = job is not None and job['status'] in ('queued', 'running')
+    
+    if st.button("Generate Resume with AI", disabled=generating):
+        # Trace the request from the click (when TRACE_EXPORT is set); the job itself is traced by the worker
+        with tracing.span('ui.generate_resume', template=selected_template):
+            user_data = {
+                'personal_info': st.session_state.personal_info,
+                'work_experience': st.session_state.work_experience,
+                'education': st.session_state.education,
+                'skills': st.session_state.skills
+            }
+            # Only new or changed entries are sent to the LLM again
+            previous = st.session_state.generated_resume['content'] if st.session_state.generated_resume else None
+            submit_generation_job('resume', {
+                'user_data': user_data,
+                'template_name': selected_template,
+                'previous_resume': previous
+            })
+        st.rerun()
+    
+    if generating:
+        show_job_progress('resume', "Generating your resume...")
+    elif job and job['status'] == 'failed':
+        st.error(f"Error generating resume: {job['error']}")
+    elif job and st.session_state.pop('resume_job_announce', None) == job['id']:
+        st.success("Resume generated successfully!")
     
     # Display generated resume
     if st.session_state.generated_resume:
@@ -526,46 +560,162 @@ def resume_generator_page():
         
         # Display resume content
         content = st.session_state.generated_resume['content']
+        render_resume_sections(content)
         
-        # Personal Info Section
-        if 'personal_summary' in content:
-            st.markdown(f"**{content['personal_info']['first_name']} {content['personal_info']['last_name']}**")
-            st.markdown(f"*{content['personal_info']['email']} • {content['personal_info']['phone']} • {content['personal_info']['location']}*")
-            if content['personal_info'].get('linkedin'):
-                st.markdown(f"LinkedIn: {content['personal_info']['linkedin']}")
-            st.markdown("---")
-            st.markdown("**Professional Summary**")
-            st.markdown(content['professional_summary'])
-            st.markdown("---")
-        
-        # Work Experience
-        if 'work_experience' in content:
-            st.markdown("**Professional Experience**")
-            for exp in content['work_experience']:
-                st.markdown(f"**{exp['job_title']}** - {exp['company']}")
-                st.markdown(f"*{exp['start_date']} to {exp['end_date']} • {exp['location']}*")
-                for bullet in exp['enhanced_description']:
-                    st.markdown(f"• {bullet}")
-                st.markdown("")
-            st.markdown("---")
-        
-        # Education
-        if content.get('education'):
-            st.markdown("**Education**")
-            for edu in content['education']:
-                st.markdown(f"**{edu['degree']}** in {edu['major']}")
-                st.markdown(f"*{edu['school']} • {edu['graduation_date']}*")
-                if edu.get('gpa'):
-                    st.markdown(f"GPA: {edu['gpa']}")
-                st.markdown("")
-            st.markdown("---")
-        
-        # Skills
-        if content.get('skills'):
-            st.markdown("**Skills**")
-            for category, skills_list in content['skills'].items():
-                if skills_list:
-                    st.markdown(f"**{category}:** {', '.join(skills_list)}")
+        # ATS check is cheap enough to re-run on every rerun
+        with st.expander("ATS Compatibility Check", expanded=False):
+            target_job_description = st.text_area(
+                "Target Job Description (Optional)",
+                key="ats_job_description",
+                help="Paste a job description to check keyword coverage"
+            )
+            ats_result = check_ats_compatibility(content, target_job_description or None)
+            if target_job_description:
+                # Every job description checked against improves the keyword statistics
+                record_job_description(target_job_description)
+            st.metric("ATS Score", f"{ats_result['ats_score']}/100")
+            
+            if ats_result['keyword_coverage']:
+                coverage = ats_result['keyword_coverage']
+                st.markdown(f"**Keyword coverage:** {coverage['coverage']}%")
+                if coverage['missing']:
+                    st.markdown(f"**Missing keywords:** {', '.join(coverage['missing'])}")
+            
+            for section, entries in ats_result['sections'].items():
+                st.markdown(f"**{section.title()}**")
+                for entry in entries:
+                    st.markdown(f"- {entry['issue']} — {entry['recommendation']}")
+
+def render_resume_sections(content):
+    """Show the sections of a (possibly partially generated) resume that exist so far"""
+    # Personal Info Section
+    if 'personal_info' in content:
+        st.markdown(f"**{content['personal_info']['first_name']} {content['personal_info']['last_name']}**")
+        st.markdown(f"*{content['personal_info']['email']} • {content['personal_info']['phone']} • {content['personal_info']['location']}*")
+        if content['personal_info'].get('linkedin'):
+            st.markdown(f"LinkedIn: {content['personal_info']['linkedin']}")
+        st.markdown("---")
+    
+    if content.get('professional_summary'):
+        st.markdown("**Professional Summary**")
+        st.markdown(content['professional_summary'])
+        st.markdown("---")
+    
+    # Work Experience
+    if any(content.get('work_experience') or []):
+        st.markdown("**Professional Experience**")
+        for exp in content['work_experience']:
+            if exp is None:
+                continue  # Still being enhanced
+            st.markdown(f"**{exp['job_title']}** - {exp['company']}")
+            st.markdown(f"*{exp['start_date']} to {exp['end_date']} • {exp['location']}*")
+            for bullet in exp['enhanced_description']:
+                st.markdown(f"• {bullet}")
+            st.markdown("")
+        st.markdown("---")
+    
+    # Education
+    if content.get('education'):
+        st.markdown("**Education**")
+        for edu in content['education']:
+            st.markdown(f"**{edu['degree']}** in {edu['major']}")
+            st.markdown(f"*{edu['school']} • {edu['graduation_date']}*")
+            if edu.get('gpa'):
+                st.markdown(f"GPA: {edu['gpa']}")
+            st.markdown("")
+        st.markdown("---")
+    
+    # Skills
+    if content.get('skills'):
+        st.markdown("**Skills**")
+        for category, skills_list in content['skills'].items():
+            if skills_list:
+                st.markdown(f"**{category}:** {', '.join(skills_list)}")
+
+def job_owner():
+    """Whose jobs this session may see: this browser, or this session when the browser can't be told apart
+
+    The browser is recognised by Streamlit's XSRF cookie, which survives a
+    refresh but, unlike the URL, isn't passed on when a link is shared.
+    """
+    if 'job_owner' not in st.session_state:
+        try:
+            cookie = st.context.cookies.get('_streamlit_xsrf')
+        except Exception:
+            cookie = None
+        if isinstance(cookie, str) and cookie:
+            st.session_state.job_owner = hashlib.sha256(cookie.encode('utf-8')).hexdigest()
+        else:
+            st.session_state.job_owner = uuid.uuid4().hex
+    return st.session_state.job_owner
+
+def submit_generation_job(kind, payload):
+    """Queue a background generation job for this session and remember its id"""
+    job_id = get_job_queue().submit(kind, payload, owner=job_owner())
+    st.session_state[f'{kind}_job_id'] = job_id
+    # Keep the id in the URL so a refresh or reconnect picks the job up again
+    st.query_params[f'{kind}_job'] = job_id
+    return job_id
+
+def collect_generation_job(kind, state_key):
+    """Return this session's latest job of a kind, storing its result once it is done"""
+    job_id = st.session_state.get(f'{kind}_job_id') or st.query_params.get(f'{kind}_job')
+    if not job_id:
+        return None
+    
+    # A job id from a shared URL belongs to someone else
+    job = get_job_queue().get(job_id, owner=job_owner())
+    if job is None:
+        st.session_state.pop(f'{kind}_job_id', None)
+        if f'{kind}_job' in st.query_params:
+            del st.query_params[f'{kind}_job']
+        return None
+    
+    st.session_state[f'{kind}_job_id'] = job_id
+    if job and job['status'] == 'done' and st.session_state.get(f'{kind}_job_applied') != job_id:
+        st.session_state[state_key] = job['result']
+        st.session_state[f'{kind}_job_applied'] = job_id
+        st.session_state[f'{kind}_job_announce'] = job_id
+    return job
+
+@st.fragment(run_every=1)
+def show_job_progress(kind, label):
+    """Poll a running job once a second and rerun the whole app when it finishes"""
+    job = get_job_queue().get(st.session_state[f'{kind}_job_id'], owner=job_owner())
+    if job is None or job['status'] in ('done', 'failed'):
+        st.rerun()
+    
+    progress = job['progress'] or {}
+    total = progress.get('total') or 1
+    message = progress.get('message') or ("Waiting for a worker..." if job['status'] == 'queued' else label)
+    st.progress(min(progress.get('completed', 0) / total, 1.0), text=f"{label} {message}")
+    
+    # Show each section as soon as the worker reports it
+    if progress.get('partial'):
+        render_resume_sections(dict(progress['partial'],
+                                    personal_info=st.session_state.personal_info,
+                                    education=st.session_state.education))
+
+def get_work_experience_with_enhancements():
+    """Attach AI-enhanced bullets from the generated resume to matching work experience entries"""
+    if not st.session_state.generated_resume:
+        return st.session_state.work_experience
+    
+    enhanced = {
+        (exp['job_title'], exp['company'], exp['description']): exp.get('enhanced_description')
+        for exp in st.session_state.generated_resume['content'].get('work_experience', [])
+    }
+    
+    experiences = []
+    for exp in st.session_state.work_experience:
+        bullets = enhanced.get((exp['job_title'], exp['company'], exp['description']))
+        if bullets:
+            exp = dict(exp, enhanced_description=bullets)
+        experiences.append(exp)
+    
+    return experiences
+
+COVER_LETTER_TONES = ["Professional", "Enthusiastic", "Conservative", "Creative"]
 
 def cover_letter_page():
     st.markdown('<div class="section-header"><h2>📝 Cover Letter Generator</h2></div>', unsafe_allow_html=True)
@@ -582,6 +732,7 @@ def cover_letter_page():
     </div>
     """, unsafe_allow_html=True)
     
+    drafts_request = None
     with st.form("cover_letter_form"):
         col1, col2 = st.columns(2)
         
@@ -602,55 +753,181 @@ def cover_letter_page():
             help="Paste the job description or key requirements"
         )
         
-        tone = st.selectbox(
-            "Cover Letter Tone",
-            ["Professional", "Enthusiastic", "Conservative", "Creative"]
-        )
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            tone = st.selectbox(
+                "Cover Letter Tone",
+                COVER_LETTER_TONES
+            )
+            compare_tones = st.multiselect(
+                "Compare Tones (Optional)",
+                COVER_LETTER_TONES,
+                help="Write a draft in each selected tone side by side instead of a single letter"
+            )
+            reuse_paragraphs = st.checkbox(
+                "Reuse my profile paragraphs",
+                help="Write the paragraphs about your background once and only the opening and job match for "
+                     "each posting. Much faster when applying to many jobs."
+            )
+        
+        with col4:
+            industry = st.selectbox(
+                "Industry (Optional)",
+                ["None"] + list(get_industry_recommendations().keys()),
+                help="Tailor language and terminology to a specific industry"
+            )
         
         submitted = st.form_submit_button("Generate Cover Letter")
         
         if submitted:
-            if company_name and job_title and job_description:
-                with st.spinner("Generating your cover letter..."):
-                    try:
-                        generator = CoverLetterGenerator()
-                        
-                        job_info = {
-                            'company_name': company_name,
-                            'job_title': job_title,
-                            'hiring_manager': hiring_manager,
-                            'company_info': company_info,
-                            'job_description': job_description,
-                            'tone': tone
-                        }
-                        
-                        user_data = {
-                            'personal_info': st.session_state.personal_info,
-                            'work_experience': st.session_state.work_experience,
-                            'education': st.session_state.education,
-                            'skills': st.session_state.skills
-                        }
-                        
-                        cover_letter = generator.generate_cover_letter(user_data, job_info)
-                        st.session_state.generated_cover_letter = {
-                            'content': cover_letter,
-                            'job_info': job_info,
-                            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        
-                        st.success("Cover letter generated successfully!")
+            if len(compare_tones) == 1:
+                # Comparing a single tone is just writing the letter in that tone
+                tone = compare_tones[0]
+            if len(compare_tones) > 1 and reuse_paragraphs:
+                st.error("Profile paragraphs can't be reused while comparing tones; "
+                         "untick \"Reuse my profile paragraphs\" or choose a single tone")
+            elif company_name and job_title and job_description:
+                with tracing.span('ui.generate_cover_letter', tone=tone, industry=industry):
+                    job_info = {
+                        'company_name': company_name,
+                        'job_title': job_title,
+                        'hiring_manager': hiring_manager,
+                        'company_info': company_info,
+                        'job_description': job_description,
+                        'tone': tone,
+                        'industry': industry if industry != "None" else ''
+                    }
+                    
+                    user_data = {
+                        'personal_info': st.session_state.personal_info,
+                        'work_experience': get_work_experience_with_enhancements(),
+                        'education': st.session_state.education,
+                        'skills': st.session_state.skills
+                    }
+                    
+                    if len(compare_tones) > 1:
+                        # Streamed on this page below, outside the form
+                        drafts_request = (user_data, job_info, compare_tones)
+                    else:
+                        payload = {'user_data': user_data, 'job_info': job_info, 'reuse_paragraphs': reuse_paragraphs}
+                        # Offer the letter written for a near-duplicate posting before writing a new one
+                        try:
+                            previous = find_similar_cover_letter(get_posting_index(), user_data, job_info)
+                        except Exception as e:
+                            st.warning(f"Could not check for similar job postings: {str(e)}")
+                            previous = None
+                        if previous:
+                            st.session_state.cover_letter_duplicate = {'previous': previous, 'payload': payload}
+                        else:
+                            submit_generation_job('cover_letter', payload)
                         st.rerun()
-                        
-                    except Exception as e:
-                        st.error(f"Error generating cover letter: {str(e)}")
             else:
                 st.error("Please fill in company name, job title, and job description")
     
+    if drafts_request:
+        generate_cover_letter_drafts(*drafts_request)
+    show_cover_letter_drafts()
+    show_duplicate_posting_offer()
+    
+    job = collect_generation_job('cover_letter', 'generated_cover_letter')
+    if job and job['status'] in ('queued', 'running'):
+        show_job_progress('cover_letter', "Generating your cover letter...")
+    elif job and job['status'] == 'failed':
+        st.error(f"Error generating cover letter: {job['error']}")
+    elif job and st.session_state.pop('cover_letter_job_announce', None) == job['id']:
+        st.success("Cover letter generated successfully!")
+    
     # Display generated cover letter
     if st.session_state.generated_cover_letter:
         st.subheader("Generated Cover Letter")
+        content = st.session_state.generated_cover_letter['content']
+        if st.checkbox("Highlight skills", key="highlight_cover_letter_skills",
+                       help="Show every skill the letter mentions in bold"):
+            content = highlight_skills(content, [skill['name'] for skill in st.session_state.skills])
         st.markdown("---")
-        st.markdown(st.session_state.generated_cover_letter['content'])
+        st.markdown(content)
+
+def generate_cover_letter_drafts(user_data, job_info, tones):
+    """Stream a draft per tone into its own column, all generated at the same time"""
+    st.subheader("Cover Letter Drafts")
+    placeholders = {}
+    for tone, column in zip(tones, st.columns(len(tones))):
+        with column:
+            st.markdown(f"**{tone}**")
+            placeholders[tone] = st.empty()
+    
+    drafts = {tone: '' for tone in tones}
+    error = None
+    try:
+        with tracing.span('ui.generate_cover_letter_drafts', tones=len(tones)):
+            for tone, chunk in CoverLetterGenerator().stream_cover_letter_drafts(user_data, job_info, tones):
+                drafts[tone] += chunk
+                placeholders[tone].markdown(drafts[tone])
+        record_job_description(job_info.get('job_description', ''))
+    except Exception as e:
+        error = str(e)
+    
+    # Rerun so the finished drafts are shown with their buttons
+    st.session_state.cover_letter_drafts = {
+        'drafts': {tone: text.strip() for tone, text in drafts.items() if text.strip()},
+        'job_info': job_info,
+        'error': error,
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+    st.rerun()
+
+def show_cover_letter_drafts():
+    """Show the latest tone drafts side by side, each with a button to keep it"""
+    drafts = st.session_state.get('cover_letter_drafts')
+    if not drafts:
+        return
+    if drafts['error']:
+        st.error(f"Error generating cover letter drafts: {drafts['error']}")
+    if not drafts['drafts']:
+        return
+    
+    st.subheader("Cover Letter Drafts")
+    for (tone, text), column in zip(drafts['drafts'].items(), st.columns(len(drafts['drafts']))):
+        with column:
+            st.markdown(f"**{tone}**")
+            st.markdown(text)
+            if st.button(f"Use {tone} Draft", key=f"use_draft_{tone}"):
+                st.session_state.generated_cover_letter = {
+                    'content': text,
+                    'job_info': dict(drafts['job_info'], tone=tone),
+                    'generated_at': drafts['generated_at']
+                }
+                st.success(f"{tone} draft selected")
+
+def show_duplicate_posting_offer():
+    """Let the user reuse the letter of a near-duplicate posting or write a new one"""
+    duplicate = st.session_state.get('cover_letter_duplicate')
+    if not duplicate:
+        return
+    
+    previous = duplicate['previous']
+    previous_job = previous['result']['job_info']
+    st.info(f"This job description is {round(previous['similarity'] * 100)}% similar to the one for "
+            f"{previous_job.get('job_title')} at {previous_job.get('company_name')} you already have a letter for.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Reuse Adapted Letter"):
+            job_info = duplicate['payload']['job_info']
+            st.session_state.generated_cover_letter = {
+                'content': adapt_cover_letter(previous, job_info),
+                'job_info': job_info,
+                'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            record_job_description(job_info.get('job_description', ''))
+            del st.session_state.cover_letter_duplicate
+            st.rerun()
+    with col2:
+        if st.button("Write a New Letter"):
+            submit_generation_job('cover_letter', duplicate['payload'])
+            del st.session_state.cover_letter_duplicate
+            st.rerun()
 
 def document_preview_page():
     st.markdown('<div class="section-header"><h2>📋 Document Preview & Export</h2></div>', unsafe_allow_html=True)
@@ -669,8 +946,9 @@ def document_preview_page():
             st.success("✅ Resume generated")
             if st.button("Download Resume as PDF"):
                 try:
-                    pdf_gen = PDFGenerator()
-                    pdf_bytes = pdf_gen.generate_resume_pdf(st.session_state.generated_resume)
+                    with tracing.span('ui.download_resume_pdf'):
+                        pdf_gen = PDFGenerator()
+                        pdf_bytes = pdf_gen.generate_resume_pdf(st.session_state.generated_resume)
                     
                     st.download_button(
                         label="📄 Download Resume PDF",
@@ -680,6 +958,25 @@ def document_preview_page():
                     )
                 except Exception as e:
                     st.error(f"Error generating PDF: {str(e)}")
+            
+            # Compare templates without generating again: every template renders from the same content
+            if st.button("Download All Templates"):
+                try:
+                    with tracing.span('ui.download_all_templates'):
+                        pdfs = render_all_templates(st.session_state.generated_resume)
+                        buffer = io.BytesIO()
+                        with zipfile.ZipFile(buffer, 'w') as archive:
+                            for template_name, pdf_bytes in pdfs.items():
+                                archive.writestr(f"resume_{template_name.lower()}.pdf", pdf_bytes)
+                    
+                    st.download_button(
+                        label="🗂️ Download Resume in All Templates",
+                        data=buffer.getvalue(),
+                        file_name=f"resumes_{st.session_state.personal_info.get('first_name', 'user')}_{datetime.now().strftime('%Y%m%d')}.zip",
+                        mime="application/zip"
+                    )
+                except Exception as e:
+                    st.error(f"Error generating PDFs: {str(e)}")
         else:
             st.info("No resume generated yet")
     
@@ -689,8 +986,9 @@ def document_preview_page():
             st.success("✅ Cover letter generated")
             if st.button("Download Cover Letter as PDF"):
                 try:
-                    pdf_gen = PDFGenerator()
-                    pdf_bytes = pdf_gen.generate_cover_letter_pdf(st.session_state.generated_cover_letter)
+                    with tracing.span('ui.download_cover_letter_pdf'):
+                        pdf_gen = PDFGenerator()
+                        pdf_bytes = pdf_gen.generate_cover_letter_pdf(st.session_state.generated_cover_letter)
                     
                     st.download_button(
                         label="📝 Download Cover Letter PDF",
@@ -703,5 +1001,71 @@ def document_preview_page():
         else:
             st.info("No cover letter generated yet")
 
+def recruiter_page():
+    st.markdown('<div class="section-header"><h2>🔎 Recruiter Mode</h2></div>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="info-box">
+        <strong>👥 Rank Candidates:</strong> Upload exported candidate profiles and paste a job description.
+        Every profile is scored locally in well under a second; only the top candidates you pick go to the AI for a detailed analysis.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    try:
+        from recruiter import CandidateRanker
+    except ImportError as e:
+        st.error(f"Recruiter Mode needs numpy and scipy: pip install numpy scipy ({str(e)})")
+        return
+    
+    uploads = st.file_uploader("Candidate Profiles (exported JSON)", type=['json'], accept_multiple_files=True)
+    job_description = st.text_area("Job Description", key="recruiter_job_description", height=150)
+    col1, col2 = st.columns(2)
+    with col1:
+        top_k = st.number_input("Candidates to show", min_value=1, max_value=100, value=10)
+    with col2:
+        analyze = st.checkbox("Analyze the top candidates with AI", help="One LLM call per listed candidate")
+    
+    if not uploads or not job_description:
+        return
+    
+    # Index the profiles once per set of uploaded files
+    upload_key = tuple((upload.name, upload.size) for upload in uploads)
+    if st.session_state.get('recruiter_upload_key') != upload_key:
+        profiles = []
+        for upload in uploads:
+            try:
+                data = json.loads(upload.getvalue())
+            except ValueError:
+                st.warning(f"Skipped {upload.name}: not valid JSON")
+                continue
+            profiles.extend(data if isinstance(data, list) else [data])
+        st.session_state.recruiter_ranker = CandidateRanker(profiles)
+        st.session_state.recruiter_upload_key = upload_key
+    ranker = st.session_state.recruiter_ranker
+    
+    if st.button("Rank Candidates"):
+        with tracing.span('ui.rank_candidates', profiles=len(ranker.profiles)):
+            ranked = ranker.rank(job_description, int(top_k))
+            if analyze:
+                with st.spinner("Analyzing the top candidates..."):
+                    ranked = ranker.analyze_top(job_description, ranked)
+        
+        st.subheader(f"Top {len(ranked)} of {len(ranker.profiles)} Candidates")
+        st.dataframe([{
+            'Candidate': result['name'],
+            'Score': result['score'],
+            'Skill Coverage %': result['skill_coverage'],
+            'Text Relevance': result['text_relevance'],
+            'Missing Skills': ', '.join(result['missing_skills'])
+        } for result in ranked], use_container_width=True)
+        
+        for result in ranked:
+            if result.get('analysis'):
+                with st.expander(f"{result['name']} — {result['analysis']['match_percentage']}% match"):
+                    for strength in result['analysis']['strengths']:
+                        st.markdown(f"✅ {strength}")
+                    for recommendation in result['analysis']['recommendations']:
+                        st.markdown(f"💡 {recommendation}")
+
 if __name__ == "__main__":
     main()
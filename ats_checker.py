@@ -0,0 +1,218 @@
+import io
+import re
+from functools import lru_cache
+
+from job_match import normalize_skill
+from keyword_engine import KeywordExtractor, get_default_corpus
+from skill_matcher import get_skill_matcher
+
+# Characters that many ATS parsers drop or garble
+PROBLEMATIC_CHARS = '•→★◆▪▫►✓✔●○■□➢➤'
+_PROBLEMATIC_PATTERN = re.compile(f"[{re.escape(PROBLEMATIC_CHARS)}]")
+_NUMBER_PATTERN = re.compile(r'\d')
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_HEADER_PATTERNS = {
+    'experience': re.compile(r'^\s*(professional\s+|work\s+)?experience\s*$', re.IGNORECASE | re.MULTILINE),
+    'education': re.compile(r'^\s*education\s*$', re.IGNORECASE | re.MULTILINE),
+    'skills': re.compile(r'^\s*(technical\s+)?skills\s*$', re.IGNORECASE | re.MULTILINE)
+}
+
+MAX_LINE_LENGTH = 100
+MAX_BULLET_LENGTH = 200
+MAX_SUMMARY_WORDS = 100
+
+# Score penalties per issue, by severity
+PENALTIES = {'high': 15, 'medium': 7, 'low': 3}
+
+
+class ATSReport:
+    """Collects issues per section while a resume is analyzed"""
+
+    def __init__(self):
+        self.sections = {}
+        self.penalty = 0
+
+    def add(self, section, severity, issue, recommendation):
+        """Record one issue for a section"""
+        self.sections.setdefault(section, []).append({
+            'severity': severity,
+            'issue': issue,
+            'recommendation': recommendation
+        })
+        self.penalty += PENALTIES[severity]
+
+    def check_text(self, section, label, text):
+        """Run the checks that apply to any free text"""
+        found = set(_PROBLEMATIC_PATTERN.findall(text))
+        if found:
+            chars = ' '.join(sorted(found))
+            self.add(section, 'low', f"{label} contains special characters ({chars}) that might not be ATS-friendly",
+                     "Replace them with standard dashes or plain text")
+
+    def result(self, keyword_coverage=None):
+        """Build the final report dictionary"""
+        structure_score = max(0, 100 - self.penalty)
+        if keyword_coverage is None:
+            ats_score = structure_score
+        else:
+            ats_score = round(0.7 * structure_score + 0.3 * keyword_coverage['coverage'])
+
+        issues = [entry['issue'] for entries in self.sections.values() for entry in entries]
+        recommendations = list(dict.fromkeys(
+            entry['recommendation'] for entries in self.sections.values() for entry in entries
+        ))
+
+        return {
+            'issues': issues,
+            'recommendations': recommendations,
+            'ats_score': ats_score,
+            'sections': self.sections,
+            'keyword_coverage': keyword_coverage
+        }
+
+
+@lru_cache(maxsize=64)
+def job_keywords(job_description, skills=(), top_n=20):
+    """Skills and top phrases of a job description (cached, the description rarely changes between checks)
+
+    Known skills (and any extra skills given) come first, most mentioned
+    first, followed by the 1-3 word phrases that are most distinctive
+    against past job descriptions (TF-IDF). Phrases that are just another
+    way of writing a skill already listed ("js" next to "JavaScript") are
+    skipped.
+    """
+    matcher = get_skill_matcher(skills)
+    keywords = [skill for skill, count in matcher.count(job_description).most_common()]
+    covered = {normalize_skill(keyword) for keyword in keywords}
+    for term in KeywordExtractor(get_default_corpus()).extract(job_description, top_n=top_n + len(keywords)):
+        if len(keywords) >= top_n:
+            break
+        normalized = normalize_skill(matcher.canonicalize(term))
+        if normalized not in covered:
+            keywords.append(term)
+            covered.add(normalized)
+    return tuple(keywords[:top_n])
+
+
+def _keyword_coverage(resume_text, job_description, top_n=20):
+    """Measure how many of the job's keywords appear in the resume text"""
+    keywords = job_keywords(job_description, top_n=top_n)
+    resume_skills = set(get_skill_matcher(tuple(keywords)).count(resume_text))
+    resume_lower = ' '.join(resume_text.lower().split())
+
+    found = [keyword for keyword in keywords if keyword in resume_skills or keyword.lower() in resume_lower]
+    missing = [keyword for keyword in keywords if keyword not in found]
+
+    return {
+        'coverage': round(100 * len(found) / len(keywords)) if keywords else 100,
+        'found': found,
+        'missing': missing
+    }
+
+
+def analyze_resume(content, job_description=None):
+    """Analyze a structured resume (generated content or raw user data) for ATS issues
+
+    Walks each section once, reporting issues per section, and optionally
+    measures keyword coverage against a job description.
+    """
+    report = ATSReport()
+    text_parts = []
+
+    personal_info = content.get('personal_info') or {}
+    if not personal_info.get('email'):
+        report.add('contact', 'high', "Missing email address", "Add an email address to your contact details")
+    elif not _EMAIL_PATTERN.match(personal_info['email']):
+        report.add('contact', 'medium', "Email address looks invalid", "Check the spelling of your email address")
+    if not personal_info.get('phone'):
+        report.add('contact', 'medium', "Missing phone number", "Add a phone number to your contact details")
+    if not personal_info.get('location'):
+        report.add('contact', 'low', "Missing location", "Add your city and state")
+
+    summary = content.get('professional_summary') or personal_info.get('professional_summary') or ''
+    if summary:
+        text_parts.append(summary)
+        report.check_text('summary', "Summary", summary)
+        if len(summary.split()) > MAX_SUMMARY_WORDS:
+            report.add('summary', 'low', "Professional summary is long",
+                       f"Keep the summary under {MAX_SUMMARY_WORDS} words")
+    else:
+        report.add('summary', 'low', "No professional summary", "Add a short professional summary")
+
+    for exp in content.get('work_experience') or []:
+        label = f"{exp.get('job_title', 'Position')} at {exp.get('company', 'company')}"
+        text_parts.append(f"{exp.get('job_title', '')} {exp.get('company', '')}")
+
+        if not exp.get('start_date') or not exp.get('end_date'):
+            report.add('experience', 'medium', f"{label} is missing dates", "Include start and end dates for every position")
+
+        bullets = exp.get('enhanced_description') or [exp.get('description', '')]
+        has_numbers = False
+        for bullet in bullets:
+            text_parts.append(bullet)
+            report.check_text('experience', label, bullet)
+            if len(bullet) > MAX_BULLET_LENGTH:
+                report.add('experience', 'low', f"{label} has a very long bullet point",
+                           "Break long sentences into shorter, more digestible bullet points")
+            if _NUMBER_PATTERN.search(bullet):
+                has_numbers = True
+        if not has_numbers:
+            report.add('experience', 'low', f"{label} has no quantified results",
+                       "Add numbers, percentages or metrics to show impact")
+
+    education = content.get('education') or []
+    if not education:
+        report.add('education', 'medium', "Missing education section", "Include your education with degrees and dates")
+    for edu in education:
+        text_parts.append(' '.join(str(edu.get(field) or '') for field in ('degree', 'major', 'school', 'achievements')))
+        if not edu.get('graduation_date'):
+            report.add('education', 'low', f"{edu.get('degree', 'Degree')} is missing a graduation date",
+                       "Include graduation dates (or expected dates)")
+
+    skills = content.get('skills') or []
+    if isinstance(skills, dict):
+        skill_names = [name for names in skills.values() for name in names]
+    else:
+        skill_names = [skill['name'] for skill in skills]
+    if not skill_names:
+        report.add('skills', 'high', "Missing skills section", "Include a skills section with relevant keywords")
+    text_parts.append(', '.join(skill_names))
+
+    coverage = _keyword_coverage('\n'.join(text_parts), job_description) if job_description else None
+    return report.result(coverage)
+
+
+def analyze_text(text, job_description=None):
+    """Analyze plain resume text (e.g. extracted from the rendered PDF) for ATS issues"""
+    report = ATSReport()
+
+    report.check_text('document', "Document", text)
+
+    long_lines = sum(1 for line in text.split('\n') if len(line) > MAX_LINE_LENGTH)
+    if long_lines:
+        report.add('document', 'low', f"{long_lines} lines are very long and might not parse well",
+                   "Break long sentences into shorter, more digestible bullet points")
+
+    missing_headers = [name for name, pattern in _HEADER_PATTERNS.items() if not pattern.search(text)]
+    if missing_headers:
+        report.add('document', 'medium', f"Missing standard section headers: {', '.join(missing_headers)}",
+                   "Include standard section headers for better ATS parsing")
+
+    coverage = _keyword_coverage(text, job_description) if job_description else None
+    return report.result(coverage)
+
+
+def extract_pdf_text(pdf_bytes):
+    """Extract the text of a rendered PDF (requires the optional pypdf package)"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise Exception("PDF text extraction requires the pypdf package: pip install pypdf")
+
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def analyze_pdf(pdf_bytes, job_description=None):
+    """Analyze a rendered resume PDF for ATS issues"""
+    return analyze_text(extract_pdf_text(pdf_bytes), job_description)
@@ -0,0 +1,54 @@
+from benchmarks.common import make_job_info, make_user_data, measure
+
+from cover_letter_generator import CoverLetterGenerator
+from llm_backend import FakeBackend
+from resume_generator import ResumeGenerator
+
+
+def bench_generate_resume(experience_counts=(1, 3, 5, 10), concurrency_levels=(1, 2, 4, 8),
+                          latency_ms=50, repeats=3):
+    """generate_resume latency against number of experiences and concurrency"""
+    results = []
+    for experiences in experience_counts:
+        user_data = make_user_data(experiences=experiences)
+        for concurrency in concurrency_levels:
+            backend = FakeBackend(latency_ms=latency_ms, seed=1)
+            generator = ResumeGenerator(backend, max_concurrency=concurrency)
+            stats = measure(lambda: generator.generate_resume(user_data, 'Professional'), repeats=repeats)
+            stats.update({
+                'experiences': experiences,
+                'concurrency': concurrency,
+                'llm_latency_ms': latency_ms,
+                'llm_calls_per_run': backend.call_count // (repeats + 1)
+            })
+            results.append(stats)
+    return results
+
+
+def bench_generate_cover_letter(experience_counts=(1, 5, 20), latency_ms=50, repeats=3):
+    """generate_cover_letter latency against profile size (prompt building and ranking included)"""
+    results = []
+    for experiences in experience_counts:
+        user_data = make_user_data(experiences=experiences, skills=30)
+        generator = CoverLetterGenerator(FakeBackend(latency_ms=latency_ms, seed=1))
+        stats = measure(lambda: generator.generate_cover_letter(user_data, make_job_info()), repeats=repeats)
+        stats.update({
+            'experiences': experiences,
+            'llm_latency_ms': latency_ms,
+            'prompt_tokens': generator.token_usage[-1]['prompt_tokens']
+        })
+        results.append(stats)
+    return results
+
+
+def run(quick=False):
+    """Run all generation benchmarks"""
+    if quick:
+        return {
+            'generate_resume': bench_generate_resume((1, 5), (1, 4), latency_ms=10, repeats=2),
+            'generate_cover_letter': bench_generate_cover_letter((1, 5), latency_ms=10, repeats=2)
+        }
+    return {
+        'generate_resume': bench_generate_resume(),
+        'generate_cover_letter': bench_generate_cover_letter()
+    }
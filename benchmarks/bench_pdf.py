@@ -0,0 +1,112 @@
+import time
+
+from benchmarks.common import make_user_data, measure, measure_peak_memory
+
+from pdf_generator import PDFGenerator
+
+
+def _resume_data(experiences):
+    """Generated-resume style data of a given size, without any LLM involved"""
+    user_data = make_user_data(experiences=experiences, education=2, skills=20)
+    for exp in user_data['work_experience']:
+        exp['enhanced_description'] = [
+            f"Delivered outcome {i} for {exp['company']} by improving pipeline throughput by {10 * i}%"
+            for i in range(1, 5)
+        ]
+    content = {
+        'personal_info': user_data['personal_info'],
+        'professional_summary': 'Data engineer with a decade of experience building reliable pipelines. ' * 3,
+        'work_experience': user_data['work_experience'],
+        'education': user_data['education'],
+        'skills': {'Technical Skills': [s['name'] for s in user_data['skills']], 'Soft Skills': ['Leadership']},
+        'template': 'Professional'
+    }
+    return {'content': content, 'template': 'Professional'}
+
+
+def _cover_letter_data(paragraphs):
+    text = '\n\n'.join(
+        f"Paragraph {i}: I am excited to apply my experience building data platforms to this role. " * 4
+        for i in range(paragraphs)
+    )
+    return {'content': text, 'job_info': {'company_name': 'Acme', 'job_title': 'Engineer'}}
+
+
+def _throughput(func, seconds=1.0):
+    """Documents per second over a fixed time window"""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        func()
+        count += 1
+    return round(count / (time.perf_counter() - start), 2)
+
+
+def bench_resume_pdf(sizes=(1, 5, 10, 25), repeats=5, window=1.0):
+    """generate_resume_pdf latency, throughput, size and peak memory against document size"""
+    generator = PDFGenerator()
+    results = []
+    for experiences in sizes:
+        data = _resume_data(experiences)
+        stats = measure(lambda: generator.generate_resume_pdf(data), repeats=repeats)
+        pdf_bytes, peak_kib = measure_peak_memory(lambda: generator.generate_resume_pdf(data))
+        stats.update({
+            'experiences': experiences,
+            'pdf_bytes': len(pdf_bytes),
+            'peak_memory_kib': peak_kib,
+            'docs_per_second': _throughput(lambda: generator.generate_resume_pdf(data), window)
+        })
+        results.append(stats)
+    return results
+
+
+def bench_cover_letter_pdf(sizes=(3, 10, 40), repeats=5, window=1.0):
+    """generate_cover_letter_pdf latency, throughput and peak memory against letter length"""
+    generator = PDFGenerator()
+    results = []
+    for paragraphs in sizes:
+        data = _cover_letter_data(paragraphs)
+        stats = measure(lambda: generator.generate_cover_letter_pdf(data), repeats=repeats)
+        pdf_bytes, peak_kib = measure_peak_memory(lambda: generator.generate_cover_letter_pdf(data))
+        stats.update({
+            'paragraphs': paragraphs,
+            'pdf_bytes': len(pdf_bytes),
+            'peak_memory_kib': peak_kib,
+            'docs_per_second': _throughput(lambda: generator.generate_cover_letter_pdf(data), window)
+        })
+        results.append(stats)
+    return results
+
+
+def bench_portfolio_pdf(sizes=(1, 10), repeats=5, window=1.0):
+    """create_portfolio_pdf latency, throughput and peak memory"""
+    generator = PDFGenerator()
+    results = []
+    for experiences in sizes:
+        resume = _resume_data(experiences)
+        letter = _cover_letter_data(4)
+        stats = measure(lambda: generator.create_portfolio_pdf(resume, letter), repeats=repeats)
+        pdf_bytes, peak_kib = measure_peak_memory(lambda: generator.create_portfolio_pdf(resume, letter))
+        stats.update({
+            'experiences': experiences,
+            'pdf_bytes': len(pdf_bytes),
+            'peak_memory_kib': peak_kib,
+            'docs_per_second': _throughput(lambda: generator.create_portfolio_pdf(resume, letter), window)
+        })
+        results.append(stats)
+    return results
+
+
+def run(quick=False):
+    """Run all PDF benchmarks"""
+    if quick:
+        return {
+            'generate_resume_pdf': bench_resume_pdf((1, 10), repeats=2, window=0.2),
+            'generate_cover_letter_pdf': bench_cover_letter_pdf((3,), repeats=2, window=0.2),
+            'create_portfolio_pdf': bench_portfolio_pdf((1,), repeats=2, window=0.2)
+        }
+    return {
+        'generate_resume_pdf': bench_resume_pdf(),
+        'generate_cover_letter_pdf': bench_cover_letter_pdf(),
+        'create_portfolio_pdf': bench_portfolio_pdf()
+    }
@@ -0,0 +1,107 @@
+from benchmarks.common import SAMPLE_JOB_DESCRIPTION, make_user_data, measure
+
+from ats_checker import analyze_resume
+from job_match import score_job_match
+from keyword_engine import KeywordCorpus, KeywordExtractor
+from recruiter import CandidateRanker
+from skill_gap import SkillGapMatrix
+from skill_matcher import get_skill_matcher
+
+
+def bench_keyword_extraction(sizes=(1, 10, 50), repeats=10):
+    """Keyword extraction latency against job description length, single and batched"""
+    extractor = KeywordExtractor(KeywordCorpus())
+    results = []
+    for multiplier in sizes:
+        text = SAMPLE_JOB_DESCRIPTION * multiplier
+        stats = measure(lambda: extractor.extract(text), repeats=repeats)
+        stats.update({'characters': len(text), 'mode': 'single'})
+        results.append(stats)
+
+    batch = [SAMPLE_JOB_DESCRIPTION + f" Requirement {i}." for i in range(200)]
+    stats = measure(lambda: extractor.extract_batch(batch), repeats=max(1, repeats // 5))
+    stats.update({'documents': len(batch), 'mode': 'batch'})
+    results.append(stats)
+    return results
+
+
+def bench_skill_matching(sizes=(1, 10, 100), repeats=10):
+    """One-pass skill scanning latency against text length"""
+    matcher = get_skill_matcher(('Airflow', 'dbt', 'Snowflake'))
+    results = []
+    for multiplier in sizes:
+        text = SAMPLE_JOB_DESCRIPTION * multiplier
+        stats = measure(lambda: matcher.find_all(text), repeats=repeats)
+        stats.update({'characters': len(text)})
+        results.append(stats)
+    return results
+
+
+def bench_ats_check(sizes=(1, 10, 50), repeats=10):
+    """ATS analysis latency against profile size, with keyword coverage"""
+    results = []
+    for experiences in sizes:
+        user_data = make_user_data(experiences=experiences, skills=20)
+        stats = measure(lambda: analyze_resume(user_data, SAMPLE_JOB_DESCRIPTION), repeats=repeats)
+        stats.update({'experiences': experiences})
+        results.append(stats)
+    return results
+
+
+def bench_job_match(sizes=(1, 10, 50), repeats=10):
+    """Local job-match scoring latency against profile size"""
+    results = []
+    for experiences in sizes:
+        user_data = make_user_data(experiences=experiences, skills=20)
+        stats = measure(lambda: score_job_match(user_data, SAMPLE_JOB_DESCRIPTION), repeats=repeats)
+        stats.update({'experiences': experiences})
+        results.append(stats)
+    return results
+
+
+def bench_candidate_ranking(sizes=(100, 1000, 5000), repeats=10):
+    """Recruiter ranking: indexing and per-job ranking latency against number of profiles"""
+    results = []
+    for count in sizes:
+        profiles = [make_user_data(experiences=1 + i % 4, skills=4 + i % 12) for i in range(count)]
+        stats = measure(lambda: CandidateRanker(profiles), repeats=max(1, repeats // 5))
+        stats.update({'profiles': count, 'mode': 'index'})
+        results.append(stats)
+
+        ranker = CandidateRanker(profiles)
+        stats = measure(lambda: ranker.rank(SAMPLE_JOB_DESCRIPTION, 10), repeats=repeats)
+        stats.update({'profiles': count, 'mode': 'rank'})
+        results.append(stats)
+    return results
+
+
+def bench_skill_gap_matrix(sizes=(100, 1000), repeats=3):
+    """Skill-gap matrix build and CSV export latency for N candidates x N jobs"""
+    extra_skills = ['Terraform', 'React', 'Tableau', 'Java', 'Snowflake', 'TypeScript', 'PostgreSQL', 'Leadership']
+    results = []
+    for count in sizes:
+        profiles = [make_user_data(experiences=1 + i % 4, skills=4 + i % 12) for i in range(count)]
+        jobs = [SAMPLE_JOB_DESCRIPTION + ' Also: ' + ', '.join(extra_skills[i % 8:] + extra_skills[:i % 3])
+                for i in range(count)]
+        stats = measure(lambda: SkillGapMatrix(profiles, jobs), repeats=repeats)
+        stats.update({'pairs': count * count, 'mode': 'build'})
+        results.append(stats)
+
+        matrix = SkillGapMatrix(profiles, jobs)
+        stats = measure(lambda: matrix.columns(), repeats=repeats)
+        stats.update({'pairs': count * count, 'mode': 'skill names'})
+        results.append(stats)
+    return results
+
+
+def run(quick=False):
+    """Run all utility hot-path benchmarks"""
+    repeats = 3 if quick else 10
+    return {
+        'keyword_extraction': bench_keyword_extraction(repeats=repeats),
+        'skill_matching': bench_skill_matching(repeats=repeats),
+        'ats_check': bench_ats_check(repeats=repeats),
+        'job_match': bench_job_match(repeats=repeats),
+        'candidate_ranking': bench_candidate_ranking((100, 1000) if quick else (100, 1000, 5000), repeats=repeats),
+        'skill_gap_matrix': bench_skill_gap_matrix((100,) if quick else (100, 1000), repeats=max(1, repeats // 3))
+    }
@@ -0,0 +1,133 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Benchmarks import the app modules from the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+SAMPLE_JOB_DESCRIPTION = """
+We are looking for a Senior Data Engineer to join our platform team. You will design and build
+scalable data pipelines in Python and SQL, run Spark jobs on AWS, and deploy services with Docker
+and Kubernetes. Experience with Kafka, Airflow and machine learning pipelines is a plus.
+Strong communication skills and experience mentoring engineers are required. You will partner
+with data scientists to productionize machine learning models and improve data quality.
+"""
+
+
+def make_user_data(experiences=3, description_words=60, skills=12, education=1):
+    """Build a synthetic but realistic profile of the requested size"""
+    words = ("built scalable data pipelines in python and sql reducing processing time by 40 percent "
+             "led a team of engineers to migrate services to aws with docker and kubernetes "
+             "partnered with product managers to ship analytics dashboards used by executives").split()
+    skill_names = ['Python', 'SQL', 'Spark', 'AWS', 'Docker', 'Kubernetes', 'Kafka', 'Airflow', 'Tableau',
+                   'Java', 'Go', 'Terraform', 'React', 'Excel', 'Leadership', 'Communication']
+
+    return {
+        'personal_info': {
+            'first_name': 'Jordan', 'last_name': 'Lee', 'email': 'jordan.lee@example.com',
+            'phone': '(555) 123-4567', 'location': 'Austin, TX', 'linkedin': 'linkedin.com/in/jordanlee',
+            'github': '', 'website': '', 'professional_summary': ''
+        },
+        'work_experience': [
+            {
+                'job_title': f'Data Engineer {i + 1}', 'company': f'Company {i + 1}', 'location': 'Remote',
+                'start_date': f'{2010 + i}-01-01', 'end_date': f'{2011 + i}-01-01',
+                'description': ' '.join(words[(i + j) % len(words)] for j in range(description_words)),
+                'current': False
+            }
+            for i in range(experiences)
+        ],
+        'education': [
+            {
+                'degree': 'Bachelor of Science', 'major': 'Computer Science', 'school': f'University {i + 1}',
+                'location': 'Austin, TX', 'graduation_date': '2009-05-15', 'gpa': '3.8',
+                'achievements': "Dean's list, robotics club lead"
+            }
+            for i in range(education)
+        ],
+        'skills': [
+            {'name': skill_names[i % len(skill_names)] + ('' if i < len(skill_names) else f' {i}'),
+             'category': 'Technical' if i % 4 else 'Soft'}
+            for i in range(skills)
+        ]
+    }
+
+
+def make_job_info(tone='Professional'):
+    """Build a job_info dictionary as the cover letter page does"""
+    return {
+        'company_name': 'Acme Analytics', 'job_title': 'Senior Data Engineer', 'hiring_manager': 'Sam Rivera',
+        'company_info': 'Acme builds analytics tools for retailers.', 'job_description': SAMPLE_JOB_DESCRIPTION,
+        'tone': tone, 'industry': ''
+    }
+
+
+def measure(func, repeats=5, warmup=1):
+    """Time func over several runs and report latency statistics in milliseconds"""
+    for _ in range(warmup):
+        func()
+
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    durations.sort()
+    return {
+        'runs': repeats,
+        'mean_ms': round(statistics.mean(durations), 3),
+        'median_ms': round(statistics.median(durations), 3),
+        'p95_ms': round(durations[min(len(durations) - 1, int(0.95 * len(durations)))], 3),
+        'min_ms': round(durations[0], 3),
+        'max_ms': round(durations[-1], 3)
+    }
+
+
+def measure_peak_memory(func):
+    """Run func once and return (result, peak traced memory in KiB)"""
+    tracemalloc.start()
+    try:
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, round(peak / 1024, 1)
+
+
+def run_metadata():
+    """Describe the environment a benchmark run happened in"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                  capture_output=True, text=True, timeout=10).stdout.strip()
+    except Exception:
+        revision = ''
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def write_results(results, path=None):
+    """Write benchmark results with run metadata as JSON, returning the path"""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': run_metadata(), 'results': results}, f, indent=2)
+    return path
@@ -0,0 +1,62 @@
+"""Compare two benchmark result files
+
+Usage:
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 10]
+
+Prints every measurement whose median latency changed by more than the
+threshold (in percent).
+"""
+import argparse
+import json
+
+# Keys that describe a measurement rather than measure it
+_PARAMETER_KEYS = ('experiences', 'concurrency', 'paragraphs', 'characters', 'documents', 'mode', 'llm_latency_ms')
+
+
+def _index(results):
+    """Flatten results into {(suite, benchmark, parameters): stats}"""
+    indexed = {}
+    for suite, benchmarks in results['results'].items():
+        for benchmark, entries in benchmarks.items():
+            for entry in entries:
+                parameters = tuple((key, entry[key]) for key in _PARAMETER_KEYS if key in entry)
+                indexed[(suite, benchmark, parameters)] = entry
+    return indexed
+
+
+def compare(old, new, threshold=10.0):
+    """Return (key, old median, new median, percent change) for changes above threshold"""
+    old_index = _index(old)
+    changes = []
+    for key, entry in _index(new).items():
+        previous = old_index.get(key)
+        if not previous or not previous.get('median_ms'):
+            continue
+        change = 100 * (entry['median_ms'] - previous['median_ms']) / previous['median_ms']
+        if abs(change) >= threshold:
+            changes.append((key, previous['median_ms'], entry['median_ms'], round(change, 1)))
+    return sorted(changes, key=lambda item: -abs(item[3]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0, help="minimum change in percent to report")
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    changes = compare(old, new, args.threshold)
+    if not changes:
+        print(f"No changes above {args.threshold}%")
+    for (suite, benchmark, parameters), before, after, change in changes:
+        label = ', '.join(f"{key}={value}" for key, value in parameters)
+        print(f"{suite}.{benchmark} [{label}]: {before:.2f}ms -> {after:.2f}ms ({change:+.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+"""Multi-session load test for the Streamlit app
+
+Simulates N concurrent users walking through personal info -> experience ->
+skills -> generate resume -> cover letter -> PDF export with Streamlit's
+AppTest against the fake LLM backend. Reports per-step latency percentiles,
+CPU and memory, and (with --profile) where the rerun time goes.
+
+AppTest keeps process-wide state and can't drive several sessions from
+threads of one process, so concurrent sessions run in worker processes.
+CPU seconds per session is the figure to size a single server instance with.
+
+Usage (from the repository root):
+    python -m benchmarks.load_test --sessions 20 --llm-latency-ms 300 --profile
+"""
+import argparse
+import os
+import resource
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.common import ROOT_DIR, SAMPLE_JOB_DESCRIPTION, write_results
+
+APP_PATH = os.path.join(ROOT_DIR, 'app.py')
+
+STEPS = ['load', 'personal_info', 'experience', 'skills', 'generate_resume', 'cover_letter', 'pdf_export']
+
+
+def _widget(at, label):
+    """Find a text input or text area by its label"""
+    for widget in list(at.text_input) + list(at.text_area):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No text field labelled {label!r}")
+
+
+def _click(at, label):
+    """Click the button with the given label and rerun"""
+    for button in at.button:
+        if button.label == label:
+            return button.click().run()
+    raise LookupError(f"No button labelled {label!r}")
+
+
+def _wait_for_job(at, state_key, timeout):
+    """Rerun until the background job has stored its result in session state"""
+    deadline = time.monotonic() + timeout
+    while not at.session_state[state_key]:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{state_key} not ready after {timeout}s")
+        time.sleep(0.05)
+        at.run()
+
+
+def _go_to(at, page):
+    at.sidebar.selectbox[0].select(page).run()
+
+
+def _check(at, step):
+    """Fail the step if the script raised"""
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+    if at.error:
+        raise RuntimeError(f"{step}: {at.error[0].value}")
+
+
+def run_session(session_id, experiences=2, timeout=120):
+    """Walk one user session through the whole flow, returning {step: latency_ms}"""
+    from streamlit.testing.v1 import AppTest
+
+    timings = {}
+
+    def timed(step, action):
+        start = time.perf_counter()
+        action()
+        _check(at, step)
+        timings[step] = (time.perf_counter() - start) * 1000
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    timed('load', at.run)
+
+    def personal_info():
+        _go_to(at, "Personal Information")
+        _widget(at, "First Name *").input(f"User{session_id}")
+        _widget(at, "Last Name *").input("Tester")
+        _widget(at, "Email *").input(f"user{session_id}@example.com")
+        _widget(at, "Phone Number *").input("555-123-4567")
+        _widget(at, "Location (City, State) *").input("Austin, TX")
+        _click(at, "Save Personal Information")
+
+    def experience():
+        _go_to(at, "Work Experience")
+        for i in range(experiences):
+            _widget(at, "Job Title").input(f"Engineer {i}")
+            _widget(at, "Company Name").input(f"Company {i}")
+            _widget(at, "Location").input("Remote")
+            _widget(at, "Job Description/Responsibilities (AI will enhance this)").input(
+                "Built data pipelines in Python and SQL, deployed services on AWS with Docker."
+            )
+            _click(at, "Add Work Experience")
+
+    def skills():
+        _go_to(at, "Skills")
+        _widget(at, "Technical Skills").input("Python, SQL, AWS, Docker, Spark")
+        _widget(at, "Soft Skills").input("Communication, Leadership")
+        _click(at, "Save Skills")
+
+    def generate_resume():
+        _go_to(at, "Resume Generator")
+        _click(at, "Generate Resume with AI")
+        _wait_for_job(at, 'generated_resume', timeout)
+
+    def cover_letter():
+        _go_to(at, "Cover Letter Generator")
+        _widget(at, "Company Name").input("Acme Analytics")
+        _widget(at, "Job Title").input("Senior Data Engineer")
+        _widget(at, "Job Description").input(SAMPLE_JOB_DESCRIPTION)
+        _click(at, "Generate Cover Letter")
+        _wait_for_job(at, 'generated_cover_letter', timeout)
+
+    def pdf_export():
+        _go_to(at, "Document Preview")
+        _click(at, "Download Resume as PDF")
+        _click(at, "Download Cover Letter as PDF")
+
+    for step, action in [('personal_info', personal_info), ('experience', experience), ('skills', skills),
+                         ('generate_resume', generate_resume), ('cover_letter', cover_letter),
+                         ('pdf_export', pdf_export)]:
+        timed(step, action)
+
+    return timings
+
+
+class StackSampler:
+    """Statistical profiler that samples the stacks of all threads
+
+    Streamlit runs each script rerun on its own thread, so a sampler sees
+    reruns that an in-thread profiler would miss.
+    """
+
+    def __init__(self, interval=0.005, ignore_threads=()):
+        self.interval = interval
+        self.ignore = set(ignore_threads)
+        self.self_samples = Counter()
+        self.inclusive_samples = Counter()
+        self.total = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _label(self, code):
+        """Short name for a function: repo-relative for our code, package-relative otherwise"""
+        filename = code.co_filename
+        if filename.startswith(ROOT_DIR):
+            filename = os.path.relpath(filename, ROOT_DIR)
+        elif 'site-packages' + os.sep in filename:
+            filename = filename.split('site-packages' + os.sep, 1)[1]
+        else:
+            filename = os.path.basename(filename)
+        return f"{filename}:{code.co_name}"
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or thread_id in self.ignore:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                # Only sample threads that are running a script rerun
+                if 'streamlit/runtime/scriptrunner/script_runner.py:_run_script' not in stack:
+                    continue
+                self.total += 1
+                self.self_samples[stack[0]] += 1
+                for entry in set(stack):
+                    self.inclusive_samples[entry] += 1
+            time.sleep(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def report(self, top=25):
+        """Top functions by share of sampled rerun time"""
+        def share(counter):
+            return [
+                {'function': name, 'samples': count, 'percent': round(100 * count / self.total, 1)}
+                for name, count in counter.most_common(top)
+            ] if self.total else []
+
+        return {'samples': self.total, 'self': share(self.self_samples), 'inclusive': share(self.inclusive_samples)}
+
+
+def _percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def pick(q):
+        return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+    return {'count': len(values), 'p50_ms': pick(0.5), 'p90_ms': pick(0.9), 'p99_ms': pick(0.99), 'max_ms': round(values[-1], 1)}
+
+
+def _rss_kib():
+    """Current resident set size of this process in KiB (Linux), or None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _worker_session(session_id, experiences, profile):
+    """Run one session in a worker process and report its timings and resource use"""
+    memory_samples = []
+    stop_memory = threading.Event()
+
+    def sample_memory():
+        while not stop_memory.is_set():
+            rss = _rss_kib()
+            if rss:
+                memory_samples.append(rss)
+            time.sleep(0.05)
+
+    memory_thread = threading.Thread(target=sample_memory, daemon=True)
+    memory_thread.start()
+
+    sampler = StackSampler(ignore_threads={threading.get_ident(), memory_thread.ident}) if profile else None
+    if sampler:
+        sampler.start()
+
+    cpu_start = os.times()
+    result = {'timings': {}, 'error': None}
+    try:
+        result['timings'] = run_session(session_id, experiences)
+    except Exception as e:
+        result['error'] = str(e)
+    cpu_end = os.times()
+
+    stop_memory.set()
+    memory_thread.join()
+    if sampler:
+        sampler.stop()
+        result['profile'] = {
+            'total': sampler.total,
+            'self': dict(sampler.self_samples),
+            'inclusive': dict(sampler.inclusive_samples)
+        }
+
+    result['cpu_seconds'] = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
+    result['rss_peak_kib'] = max(memory_samples) if memory_samples else None
+    return result
+
+
+def run_load_test(sessions=10, concurrency=None, experiences=2, profile=False):
+    """Run sessions concurrently and summarise latency, CPU and memory"""
+    concurrency = concurrency or sessions
+    step_latencies = defaultdict(list)
+    errors = []
+    cpu_seconds = []
+    rss_peaks = []
+    merged = StackSampler() if profile else None
+
+    wall_start = time.perf_counter()
+
+    # One process per concurrent session, replaced after each session for a clean state
+    with ProcessPoolExecutor(max_workers=concurrency, max_tasks_per_child=1) as executor:
+        futures = [executor.submit(_worker_session, i, experiences, profile) for i in range(sessions)]
+        for future in futures:
+            outcome = future.result()
+            if outcome['error']:
+                errors.append(outcome['error'])
+            for step, latency in outcome['timings'].items():
+                step_latencies[step].append(latency)
+            cpu_seconds.append(outcome['cpu_seconds'])
+            if outcome['rss_peak_kib']:
+                rss_peaks.append(outcome['rss_peak_kib'])
+            if merged:
+                merged.total += outcome['profile']['total']
+                merged.self_samples.update(outcome['profile']['self'])
+                merged.inclusive_samples.update(outcome['profile']['inclusive'])
+
+    wall = time.perf_counter() - wall_start
+    completed = sessions - len(errors)
+
+    result = {
+        'sessions': sessions,
+        'concurrency': concurrency,
+        'llm_backend': os.getenv('LLM_BACKEND'),
+        'llm_latency_ms': float(os.getenv('FAKE_LLM_LATENCY_MS', '0')),
+        'wall_seconds': round(wall, 2),
+        'sessions_per_minute': round(60 * completed / wall, 1) if wall else None,
+        'errors': errors,
+        'steps': {step: _percentiles(step_latencies[step]) for step in STEPS if step_latencies[step]},
+        'cpu': {
+            'cpu_seconds_total': round(sum(cpu_seconds), 2),
+            'cpu_seconds_per_session': round(sum(cpu_seconds) / len(cpu_seconds), 3) if cpu_seconds else None,
+            'utilization_cores': round(sum(cpu_seconds) / wall, 2) if wall else None,
+            # Sessions one fully busy core could complete per minute, ignoring LLM wait time
+            'sessions_per_core_minute': round(60 * len(cpu_seconds) / sum(cpu_seconds), 1) if sum(cpu_seconds) else None
+        },
+        'memory': {
+            'session_rss_peak_kib': max(rss_peaks) if rss_peaks else None,
+            'session_rss_median_kib': sorted(rss_peaks)[len(rss_peaks) // 2] if rss_peaks else None,
+            'parent_max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        }
+    }
+    if merged:
+        result['rerun_profile'] = merged.report()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of the Streamlit app")
+    parser.add_argument('--sessions', type=int, default=10, help="number of user sessions to simulate")
+    parser.add_argument('--concurrency', type=int, help="sessions running at once (default: all)")
+    parser.add_argument('--experiences', type=int, default=2, help="work experiences each user adds")
+    parser.add_argument('--llm-latency-ms', type=float, default=200, help="mean latency of the fake LLM")
+    parser.add_argument('--llm-distribution', default='lognormal', help="fake LLM latency distribution")
+    parser.add_argument('--profile', action='store_true', help="sample stacks to show where rerun time goes")
+    parser.add_argument('--output', help="path of the JSON results file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    # The app must never reach the real API during a load test
+    os.environ['LLM_BACKEND'] = 'fake'
+    os.environ['FAKE_LLM_LATENCY_MS'] = str(args.llm_latency_ms)
+    os.environ.setdefault('FAKE_LLM_JITTER_MS', str(args.llm_latency_ms / 2))
+    os.environ['FAKE_LLM_DISTRIBUTION'] = args.llm_distribution
+
+    result = run_load_test(args.sessions, args.concurrency, args.experiences, args.profile)
+
+    for step, stats in result['steps'].items():
+        print(f"{step:16} p50={stats['p50_ms']:>9}ms  p90={stats['p90_ms']:>9}ms  p99={stats['p99_ms']:>9}ms")
+    print(f"CPU: {result['cpu']['cpu_seconds_per_session']}s per session "
+          f"(~{result['cpu']['sessions_per_core_minute']} sessions per core-minute), "
+          f"peak session RSS: {result['memory']['session_rss_peak_kib']} KiB, errors: {len(result['errors'])}")
+
+    path = write_results({'load_test': result}, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
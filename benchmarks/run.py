@@ -0,0 +1,37 @@
+"""Run the benchmark suite and write the results as JSON
+
+Usage (from the repository root):
+    python -m benchmarks.run                 # full suite
+    python -m benchmarks.run --quick         # smaller sizes, for a smoke run
+    python -m benchmarks.run --only pdf utils --output results.json
+"""
+import argparse
+
+from benchmarks import bench_generation, bench_pdf, bench_utils
+from benchmarks.common import write_results
+
+SUITES = {
+    'generation': bench_generation.run,
+    'pdf': bench_pdf.run,
+    'utils': bench_utils.run
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run generation, rendering and utility benchmarks")
+    parser.add_argument('--quick', action='store_true', help="use small sizes and few repeats")
+    parser.add_argument('--only', nargs='+', choices=sorted(SUITES), help="run only these suites")
+    parser.add_argument('--output', help="path of the JSON results file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or SUITES:
+        print(f"Running {name} benchmarks...")
+        results[name] = SUITES[name](quick=args.quick)
+
+    path = write_results(results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
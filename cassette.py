@@ -0,0 +1,185 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+import metrics
+from llm_backend import LLMBackend, LLMBackendError, LLMResponse
+
+
+def interaction_key(prompt, json_response, stream=False):
+    """Stable key for a call, so replay finds the response recorded for the same request"""
+    payload = json.dumps({'prompt': prompt, 'json_response': json_response, 'stream': stream}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def read_cassette(path):
+    """Read every entry of a cassette file"""
+    entries = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entries.append(json.loads(line))
+    return entries
+
+
+class CassetteBackend(LLMBackend):
+    """Record LLM interactions to a gzip-compressed JSONL cassette, or replay them
+
+    In 'record' mode every call goes to the wrapped backend and the prompt,
+    config and response are appended to the cassette. In 'replay' mode calls
+    are served from the cassette without touching the network; identical
+    requests get their recorded responses back in the order they were
+    recorded. With replay_latency the original call durations are reproduced.
+    """
+
+    name = 'cassette'
+
+    def __init__(self, path, mode='replay', backend=None, replay_latency=False):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == 'record' and backend is None:
+            raise ValueError("Recording needs a backend to record from")
+
+        self.path = path
+        self.mode = mode
+        self.backend = backend
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._interactions = defaultdict(list)
+        self._positions = defaultdict(int)
+        self.inputs = []
+
+        if mode == 'replay':
+            self._load()
+
+    def _load(self):
+        """Index the recorded interactions by request key"""
+        if not os.path.exists(self.path):
+            raise LLMBackendError(f"Cassette not found: {self.path}")
+
+        for entry in read_cassette(self.path):
+            if entry['type'] == 'interaction':
+                self._interactions[entry['key']].append(entry)
+            elif entry['type'] == 'input':
+                self.inputs.append(entry)
+
+    def _append(self, entry):
+        """Append one entry to the cassette (each append is its own gzip member)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(line)
+
+    def _next_recorded(self, key):
+        """Return the next recorded entry for a key, repeating the last one when exhausted"""
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                metrics.increment('llm_cache_misses_total', cache='cassette')
+                raise LLMBackendError("No recorded interaction for this request in the cassette")
+            position = self._positions[key]
+            self._positions[key] = position + 1
+        entry = recorded[min(position, len(recorded) - 1)]
+        metrics.increment('llm_cache_hits_total', cache='cassette')
+
+        if self.replay_latency:
+            time.sleep(entry.get('duration_ms', 0) / 1000)
+        return entry
+
+    def record_input(self, kind, data):
+        """Store the inputs of a pipeline run so the whole run can be replayed later"""
+        if self.mode == 'record':
+            self._append({'type': 'input', 'kind': kind, 'data': data, 'recorded_at': time.time()})
+
+    def generate(self, prompt, json_response=False):
+        key = interaction_key(prompt, json_response)
+
+        if self.mode == 'replay':
+            entry = self._next_recorded(key)
+            return LLMResponse(entry['response'], entry.get('prompt_tokens'), entry.get('response_tokens'))
+
+        start = time.perf_counter()
+        response = self.backend.generate(prompt, json_response=json_response)
+        self._append({
+            'type': 'interaction',
+            'key': key,
+            'backend': self.backend.name,
+            'prompt': prompt,
+            'config': {'json_response': json_response},
+            'response': response.text,
+            'prompt_tokens': response.prompt_tokens,
+            'response_tokens': response.response_tokens,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            'recorded_at': time.time()
+        })
+        return response
+
+    def generate_stream(self, prompt):
+        key = interaction_key(prompt, False, stream=True)
+
+        if self.mode == 'replay':
+            entry = self._next_recorded(key)
+            yield from entry['chunks']
+            return
+
+        start = time.perf_counter()
+        chunks = []
+        for chunk in self.backend.generate_stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._append({
+            'type': 'interaction',
+            'key': key,
+            'backend': self.backend.name,
+            'prompt': prompt,
+            'config': {'json_response': False, 'stream': True},
+            'response': ''.join(chunks),
+            'chunks': chunks,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            'recorded_at': time.time()
+        })
+
+
+def replay_resume_pipeline(path, replay_latency=False):
+    """Re-run every recorded generate_resume -> generate_resume_pdf run from a cassette
+
+    Returns one timing record per run. Runs whose prompts are no longer in the
+    cassette (because prompt construction changed) are reported as failed.
+    """
+    from pdf_generator import PDFGenerator
+    from resume_generator import ResumeGenerator
+
+    backend = CassetteBackend(path, mode='replay', replay_latency=replay_latency)
+    generator = ResumeGenerator(backend)
+    pdf_generator = PDFGenerator()
+
+    results = []
+    for entry in backend.inputs:
+        if entry['kind'] != 'generate_resume':
+            continue
+
+        data = entry['data']
+        start = time.perf_counter()
+        try:
+            content = generator.generate_resume(data['user_data'], data['template_name'],
+                                               previous_resume=data.get('previous_resume'))
+            generated = time.perf_counter()
+            pdf_bytes = pdf_generator.generate_resume_pdf({'content': content, 'template': data['template_name']})
+            finished = time.perf_counter()
+            results.append({
+                'ok': True,
+                'generate_ms': round((generated - start) * 1000, 3),
+                'pdf_ms': round((finished - generated) * 1000, 3),
+                'pdf_bytes': len(pdf_bytes)
+            })
+        except Exception as e:
+            results.append({'ok': False, 'error': str(e)})
+
+    return results
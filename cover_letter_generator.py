@@ -1,21 +1,120 @@
 import json
-import os
-from google import genai
-from google.genai import types
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from prompt_builder import PromptBuilder, record_token_usage
+from llm_backend import LLMResponse, generate_with_retries, get_backend, stream_with_retries
+from relevance import experience_text, select_relevant
+from job_match import score_job_match
+from resume_generator import content_hash
+import metrics
+import tracing
+
+# Fields a letter's candidate-specific paragraphs are written from
+PROFILE_FIELDS = ('personal_info', 'work_experience', 'education', 'skills')
+
+def profile_version(user_data):
+    """Hash of the profile fields; changes whenever anything a letter is written from changes"""
+    return content_hash({field: user_data.get(field) for field in PROFILE_FIELDS})
+
+def cover_letter_owner(user_data, job_info, industry=None):
+    """Whose letter a stored letter is: the same profile version, tone and industry"""
+    return content_hash([profile_version(user_data), job_info.get('tone'), industry or ''])
+
+def find_similar_cover_letter(posting_index, user_data, job_info, industry=None):
+    """The letter this profile got for a near-duplicate of this posting, or None
+
+    Only reads the posting index, so it needs no LLM backend. Returns a
+    dictionary with 'similarity' (1.0 for the same description) and
+    'result', holding the letter's 'content' and 'job_info'.
+    """
+    job_description = job_info.get('job_description')
+    if posting_index is None or not (job_description or '').strip():
+        return None
+    industry = industry or job_info.get('industry')
+    try:
+        return posting_index.find_result(job_description, 'cover_letter',
+                                         cover_letter_owner(user_data, job_info, industry))
+    except Exception:
+        return None  # The index only ever saves work; treat it as a miss
+
+# What a letter says when a field was left empty
+_ADDRESS_DEFAULTS = {'hiring_manager': 'Hiring Manager'}
+
+def _replace_name(content, old, new):
+    """Replace whole-word mentions of old with new, fixing a/an in front of them
+
+    Mentions that are already part of new (old "Engineer", new "Senior
+    Engineer") are left alone.
+    """
+    def replace(match):
+        article = match.group('article')
+        if not article:
+            return new
+        fixed = 'an' if new[:1].lower() in 'aeiou' else 'a'
+        return f"{fixed.capitalize() if article[0].isupper() else fixed} {new}"
+
+    pattern = rf"(?<!\w)(?:(?P<article>[Aa]n?) )?(?:{re.escape(new)}|{re.escape(old)})(?!\w)"
+    return re.sub(pattern, replace, content)
+
+def adapt_cover_letter(previous, job_info):
+    """Re-address a letter found by find_similar_cover_letter to this posting without an LLM call
+
+    The company, position and hiring manager of the old posting are
+    replaced by the new ones as whole words; the rest of the letter is kept.
+    """
+    content = previous['result']['content']
+    previous_job = previous['result']['job_info']
+    for field in ('company_name', 'job_title', 'hiring_manager'):
+        old = previous_job.get(field) or _ADDRESS_DEFAULTS.get(field)
+        new = job_info.get(field) or _ADDRESS_DEFAULTS.get(field)
+        if old and new and old != new:
+            content = _replace_name(content, old, new)
+    return content
 
 class CoverLetterGenerator:
-    def __init__(self):
-        # Using Google Gemini AI which offers better free tier options
-        # Note that the newest Gemini model series is "gemini-2.5-flash" or gemini-2.5-pro"
-        # do not change this unless explicitly requested by the user
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise Exception("GEMINI_API_KEY environment variable is required. Get your free key at https://makersuite.google.com/app/apikey")
-        self.client = genai.Client(api_key=api_key)
-        self.model = "gemini-2.5-flash"
-    
-    def generate_cover_letter(self, user_data, job_info):
-        """Generate a personalized cover letter based on user data and job information"""
+    def __init__(self, backend=None, paragraph_cache=None, posting_index=None):
+        # Gemini by default; pass a backend (or set LLM_BACKEND=fake) to run offline
+        self.backend = backend or get_backend()
+        # Where reusable candidate paragraphs are kept (see enhancement_cache.get_paragraph_cache);
+        # without one they are only reused by this generator
+        self.paragraph_cache = paragraph_cache
+        # Optional index of past job postings and their results (see posting_index.py)
+        self.posting_index = posting_index
+        self._profile_paragraphs = {}
+        self.token_usage = []
+        self.retries = 3
+        self.retry_backoff = 1.0
+    
+    def _call_llm(self, task, prompt, json_response=False):
+        """Send a prompt to the LLM backend and record its prompt and response token counts"""
+        response = generate_with_retries(
+            self.backend, prompt, json_response=json_response,
+            retries=self.retries, backoff=self.retry_backoff, task=task
+        )
+        record_token_usage(self.token_usage, task, prompt, response)
+        return response
+    
+    @tracing.traced('cover_letter.generate')
+    def generate_cover_letter(self, user_data, job_info, industry=None, reuse_paragraphs=False, reuse_similar=False):
+        """Generate a personalized cover letter based on user data and job information
+
+        If an industry is given (or set as job_info['industry']) the industry
+        tailoring is folded into the same prompt, so no second pass is needed.
+        
+        With reuse_paragraphs the letter is assembled from candidate-specific
+        paragraphs written once per profile version (see profile_paragraphs)
+        and an opening and job-match paragraph written for this posting, so
+        each further letter only generates those two.
+        
+        With a posting index, every letter is stored with its posting; with
+        reuse_similar the letter written for a near-duplicate posting is
+        adapted instead of writing a new one (see find_similar_cover_letter).
+        """
+        self.backend.record_input('generate_cover_letter', {
+            'user_data': user_data, 'job_info': job_info, 'industry': industry
+        })
         try:
             # Extract relevant information
             personal_info = user_data['personal_info']
@@ -23,31 +122,70 @@ class CoverLetterGenerator:
             skills = user_data['skills']
             education = user_data['education']
             
+            industry = industry or job_info.get('industry')
+            if reuse_similar:
+                previous = find_similar_cover_letter(self.posting_index, user_data, job_info, industry)
+                if previous:
+                    return adapt_cover_letter(previous, job_info)
+            
             # Prepare context for AI
             context = self._prepare_context(user_data, job_info)
             
-            # Generate cover letter
-            cover_letter = self._generate_cover_letter_content(context, job_info)
+            # Generate cover letter (industry tailoring happens in the same call)
+            if reuse_paragraphs:
+                cover_letter = self._assemble_cover_letter(user_data, context, job_info, industry)
+            else:
+                cover_letter = self._generate_cover_letter_content(context, job_info, industry)
             
+            self._remember_result(job_info.get('job_description'), 'cover_letter',
+                                  cover_letter_owner(user_data, job_info, industry),
+                                  {'content': cover_letter, 'job_info': job_info},
+                                  company_name=job_info.get('company_name'), job_title=job_info.get('job_title'))
             return cover_letter
             
         except Exception as e:
             raise Exception(f"Failed to generate cover letter: {str(e)}")
     
-    def _prepare_context(self, user_data, job_info):
-        """Prepare context for AI generation"""
-        # Extract most relevant work experience (last 2-3 positions)
-        relevant_experience = user_data['work_experience'][:3]
+    @tracing.traced('cover_letter.prepare_context')
+    def _prepare_context(self, user_data, job_info, max_experiences=3, max_bullets=3, max_skills=10):
+        """Prepare context for AI generation
+
+        Experiences, enhanced bullets and technical skills are ranked locally
+        against the job description so only the most relevant ones are sent.
+        """
+        job_description = job_info.get('job_description', '')
+        
+        # Pick the experiences that best match the job (most recent first if no description)
+        work_experience = user_data['work_experience']
+        relevant_experience = select_relevant(
+            work_experience,
+            [experience_text(exp) for exp in work_experience],
+            job_description,
+            max_experiences
+        )
         
-        # Extract technical skills
+        # Keep only the best matching enhanced bullets of each chosen experience
+        trimmed_experience = []
+        for exp in relevant_experience:
+            if exp.get('enhanced_description'):
+                exp = exp.copy()
+                exp['enhanced_description'] = select_relevant(
+                    exp['enhanced_description'], exp['enhanced_description'], job_description, max_bullets
+                )
+                # The raw description is redundant once we have the bullets
+                exp.pop('description', None)
+            trimmed_experience.append(exp)
+        
+        # Extract technical skills, most relevant first
         technical_skills = [skill['name'] for skill in user_data['skills'] if skill['category'] == 'Technical']
+        technical_skills = select_relevant(technical_skills, technical_skills, job_description, max_skills)
         
         # Extract latest education
         latest_education = user_data['education'][0] if user_data['education'] else None
         
         context = {
             'personal_info': user_data['personal_info'],
-            'relevant_experience': relevant_experience,
+            'relevant_experience': trimmed_experience,
             'technical_skills': technical_skills,
             'latest_education': latest_education,
             'job_info': job_info
@@ -55,38 +193,46 @@ class CoverLetterGenerator:
         
         return context
     
-    def _generate_cover_letter_content(self, context, job_info):
-        """Generate the actual cover letter content using AI"""
-        try:
-            # Determine tone instructions
-            tone_instructions = self._get_tone_instructions(job_info['tone'])
-            
-            prompt = f"""
+    def _build_cover_letter_prompt(self, context, job_info, industry=None):
+        """Build the cover letter prompt from the prepared context"""
+        # Determine tone instructions
+        tone_instructions = self._get_tone_instructions(job_info['tone'])
+        industry_instructions = self._get_industry_instructions(industry)
+        
+        # The job description drives the letter; company info and education are trimmed first
+        builder = PromptBuilder('cover_letter')
+        builder.add_text('job_description', job_info['job_description'], priority=4)
+        builder.add_list('technical_skills', context['technical_skills'], priority=3, separator=', ')
+        builder.add_list('work_experience', context['relevant_experience'], priority=2)
+        builder.add_data('education', context['latest_education'], priority=1)
+        builder.add_text('company_info', job_info.get('company_info', ''), priority=0)
+        
+        prompt = builder.build("""
             Write a professional cover letter based on the following information:
             
             CANDIDATE INFORMATION:
-            Name: {context['personal_info']['first_name']} {context['personal_info']['last_name']}
-            Email: {context['personal_info']['email']}
-            Location: {context['personal_info']['location']}
+            Name: {first_name} {last_name}
+            Email: {email}
+            Location: {location}
             
             WORK EXPERIENCE:
-            {json.dumps(context['relevant_experience'])}
+            {work_experience}
             
             TECHNICAL SKILLS:
-            {', '.join(context['technical_skills'])}
+            {technical_skills}
             
             EDUCATION:
-            {json.dumps(context['latest_education'])}
+            {education}
             
             JOB INFORMATION:
-            Company: {job_info['company_name']}
-            Position: {job_info['job_title']}
-            Hiring Manager: {job_info.get('hiring_manager', 'Hiring Manager')}
-            Company Info: {job_info.get('company_info', '')}
-            Job Description: {job_info['job_description']}
+            Company: {company_name}
+            Position: {job_title}
+            Hiring Manager: {hiring_manager}
+            Company Info: {company_info}
+            Job Description: {job_description}
             
             TONE: {tone_instructions}
-            
+            {industry_instructions}
             REQUIREMENTS:
             1. Write a complete, professional cover letter
             2. Address it to the hiring manager or company
@@ -102,20 +248,257 @@ class CoverLetterGenerator:
             9. Include proper salutation and closing
             
             Generate the complete cover letter text with proper formatting.
-            """
+            """,
+            first_name=context['personal_info']['first_name'],
+            last_name=context['personal_info']['last_name'],
+            email=context['personal_info']['email'],
+            location=context['personal_info']['location'],
+            company_name=job_info['company_name'],
+            job_title=job_info['job_title'],
+            hiring_manager=job_info.get('hiring_manager') or 'Hiring Manager',
+            tone_instructions=tone_instructions,
+            industry_instructions=industry_instructions
+        )
+        
+        return prompt
+    
+    @tracing.traced('cover_letter.content')
+    def _generate_cover_letter_content(self, context, job_info, industry=None):
+        """Generate the actual cover letter content using AI"""
+        try:
+            prompt = self._build_cover_letter_prompt(context, job_info, industry)
             
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part(text=prompt)])
-                ]
-            )
+            response = self._call_llm('cover_letter', prompt)
             
             return response.text.strip() if response.text else "Cover letter could not be generated."
             
         except Exception as e:
             raise Exception(f"Failed to generate cover letter content: {str(e)}")
     
+    def profile_paragraphs(self, user_data, tone, industry=None):
+        """The candidate-specific paragraphs of a letter, written once per profile version, tone and industry
+
+        Returns a dictionary with 'experience_paragraph', 'skills_paragraph'
+        and 'closing_paragraph'. The closing refers to the employer as
+        [COMPANY], filled in when a letter is assembled.
+        """
+        key = content_hash([profile_version(user_data), tone, industry or ''])
+        paragraphs = self._profile_paragraphs.get(key)
+        if paragraphs is None and self.paragraph_cache is not None:
+            try:
+                paragraphs = self.paragraph_cache.get(key)
+            except Exception:
+                paragraphs = None  # The cache only ever saves work; never fail a letter over it
+        if paragraphs:
+            metrics.increment('llm_cache_hits_total', cache='profile_paragraphs', task='cover_letter_profile')
+            self._profile_paragraphs[key] = paragraphs
+            return paragraphs
+        
+        metrics.increment('llm_cache_misses_total', cache='profile_paragraphs', task='cover_letter_profile')
+        paragraphs = self._generate_profile_paragraphs(user_data, tone, industry)
+        self._profile_paragraphs[key] = paragraphs
+        if self.paragraph_cache is not None:
+            try:
+                self.paragraph_cache.put(key, paragraphs)
+            except Exception:
+                pass
+        return paragraphs
+    
+    @tracing.traced('cover_letter.profile_paragraphs')
+    def _generate_profile_paragraphs(self, user_data, tone, industry=None):
+        """Write the paragraphs about the candidate that don't depend on the job"""
+        # Without a job description the most recent experiences and top skills are used
+        context = self._prepare_context(user_data, {'job_description': ''})
+        
+        builder = PromptBuilder('cover_letter_profile')
+        builder.add_list('technical_skills', context['technical_skills'], priority=3, separator=', ')
+        builder.add_list('work_experience', context['relevant_experience'], priority=2)
+        builder.add_data('education', context['latest_education'], priority=1)
+        
+        prompt = builder.build("""
+            Write three cover letter paragraphs for this candidate that can be reused for any job application.
+            Do not mention a specific company, position or job posting.
+            
+            CANDIDATE: {first_name} {last_name}
+            WORK EXPERIENCE: {work_experience}
+            TECHNICAL SKILLS: {technical_skills}
+            EDUCATION: {education}
+            
+            TONE: {tone_instructions}
+            {industry_instructions}
+            Provide the paragraphs in JSON format:
+            {{
+                "experience_paragraph": "3-4 sentences on the most relevant experience, with specific examples",
+                "skills_paragraph": "2-3 sentences on skills and education",
+                "closing_paragraph": "2-3 sentences expressing enthusiasm and next steps, calling the employer [COMPANY]"
+            }}
+            """,
+            first_name=context['personal_info']['first_name'],
+            last_name=context['personal_info']['last_name'],
+            tone_instructions=self._get_tone_instructions(tone),
+            industry_instructions=self._get_industry_instructions(industry)
+        )
+        
+        response = self._call_llm('cover_letter_profile', prompt, json_response=True)
+        with tracing.span('parse_json', task='cover_letter_profile'):
+            paragraphs = json.loads(response.text or '{}')
+        if not paragraphs.get('experience_paragraph'):
+            raise Exception("Profile paragraphs could not be generated")
+        return {field: (paragraphs.get(field) or '').strip()
+                for field in ('experience_paragraph', 'skills_paragraph', 'closing_paragraph')}
+    
+    @tracing.traced('cover_letter.job_paragraphs')
+    def _generate_job_paragraphs(self, context, job_info, industry=None):
+        """Write the opening and job-match paragraphs for one posting"""
+        builder = PromptBuilder('cover_letter_job')
+        builder.add_text('job_description', job_info['job_description'], priority=4)
+        builder.add_list('technical_skills', context['technical_skills'], priority=3, separator=', ')
+        builder.add_list('work_experience', context['relevant_experience'], priority=2)
+        builder.add_text('company_info', job_info.get('company_info', ''), priority=0)
+        
+        prompt = builder.build("""
+            Write the opening and job-match paragraphs of a cover letter. The rest of the letter,
+            about the candidate's background in general, is already written.
+            
+            Company: {company_name}
+            Position: {job_title}
+            Company Info: {company_info}
+            Job Description: {job_description}
+            
+            CANDIDATE WORK EXPERIENCE: {work_experience}
+            CANDIDATE TECHNICAL SKILLS: {technical_skills}
+            
+            TONE: {tone_instructions}
+            {industry_instructions}
+            Provide the paragraphs in JSON format:
+            {{
+                "opening_paragraph": "2-3 sentences expressing interest in this position and briefly stating qualifications",
+                "match_paragraph": "3-4 sentences matching the candidate's experience and skills to the job requirements"
+            }}
+            """,
+            company_name=job_info['company_name'],
+            job_title=job_info['job_title'],
+            tone_instructions=self._get_tone_instructions(job_info['tone']),
+            industry_instructions=self._get_industry_instructions(industry)
+        )
+        
+        response = self._call_llm('cover_letter_job', prompt, json_response=True)
+        with tracing.span('parse_json', task='cover_letter_job'):
+            paragraphs = json.loads(response.text or '{}')
+        if not paragraphs.get('opening_paragraph'):
+            raise Exception("Job paragraphs could not be generated")
+        return paragraphs
+    
+    def _assemble_cover_letter(self, user_data, context, job_info, industry=None):
+        """Put a letter together from the reusable profile paragraphs and this job's paragraphs"""
+        profile = self.profile_paragraphs(user_data, job_info['tone'], industry)
+        job = self._generate_job_paragraphs(context, job_info, industry)
+        personal_info = user_data['personal_info']
+        
+        parts = [
+            f"Dear {job_info.get('hiring_manager') or 'Hiring Manager'},",
+            job.get('opening_paragraph'),
+            job.get('match_paragraph'),
+            profile['experience_paragraph'],
+            profile['skills_paragraph'],
+            profile['closing_paragraph'].replace('[COMPANY]', job_info['company_name']),
+            f"Sincerely,\n{personal_info['first_name']} {personal_info['last_name']}"
+        ]
+        return '\n\n'.join(part.strip() for part in parts if part and part.strip())
+    
+    def _remember_result(self, job_description, kind, owner, result, **metadata):
+        """Store a result with its posting in the posting index, if there is one"""
+        if self.posting_index is None or not (job_description or '').strip():
+            return
+        try:
+            self.posting_index.store_result(job_description, kind, owner, result, **metadata)
+        except Exception:
+            pass  # The index only ever saves work; never fail generation over it
+    
+    def _find_result(self, job_description, kind, owner):
+        """The result stored for a near-duplicate posting, or None"""
+        if self.posting_index is None or not (job_description or '').strip():
+            return None
+        try:
+            return self.posting_index.find_result(job_description, kind, owner)
+        except Exception:
+            return None
+    
+    def stream_cover_letter(self, user_data, job_info, industry=None):
+        """Generate a cover letter like generate_cover_letter, yielding the text as it arrives"""
+        self.backend.record_input('generate_cover_letter', {
+            'user_data': user_data, 'job_info': job_info, 'industry': industry
+        })
+        context = self._prepare_context(user_data, job_info)
+        prompt = self._build_cover_letter_prompt(context, job_info, industry or job_info.get('industry'))
+        
+        chunks = []
+        for chunk in stream_with_retries(self.backend, prompt, retries=self.retries, backoff=self.retry_backoff,
+                                         task='cover_letter'):
+            chunks.append(chunk)
+            yield chunk
+        record_token_usage(self.token_usage, 'cover_letter', prompt, LLMResponse(''.join(chunks)))
+    
+    def stream_cover_letter_drafts(self, user_data, job_info, tones, industry=None):
+        """Write one draft per tone at the same time, yielding (tone, chunk) as text arrives
+
+        The context is prepared once and shared by every draft; each tone
+        streams from its own thread, so all drafts take about as long as one.
+        A tone that fails doesn't stop the others; the error is raised once
+        they have finished. Closing the generator early stops the drafts
+        still being written.
+        """
+        if not tones:
+            raise Exception("Failed to generate cover letter drafts: choose at least one tone")
+        self.backend.record_input('generate_cover_letter_drafts', {
+            'user_data': user_data, 'job_info': job_info, 'tones': tones, 'industry': industry
+        })
+        context = self._prepare_context(user_data, job_info)
+        industry = industry or job_info.get('industry')
+        chunks = queue.Queue()
+        stopped = threading.Event()
+        
+        def write(tone):
+            try:
+                prompt = self._build_cover_letter_prompt(context, dict(job_info, tone=tone), industry)
+                text = []
+                stream = stream_with_retries(self.backend, prompt, retries=self.retries,
+                                             backoff=self.retry_backoff, task='cover_letter')
+                for chunk in stream:
+                    if stopped.is_set():
+                        stream.close()
+                        return  # Nobody is reading any more
+                    text.append(chunk)
+                    chunks.put((tone, chunk))
+                record_token_usage(self.token_usage, 'cover_letter', prompt, LLMResponse(''.join(text)))
+            except Exception as e:
+                chunks.put((tone, e))
+            finally:
+                chunks.put((tone, None))
+        
+        executor = ThreadPoolExecutor(max_workers=len(tones))
+        try:
+            for tone in tones:
+                executor.submit(tracing.bind(write), tone)
+            
+            errors = []
+            finished = 0
+            while finished < len(tones):
+                tone, chunk = chunks.get()
+                if chunk is None:
+                    finished += 1
+                elif isinstance(chunk, Exception):
+                    errors.append(f"{tone}: {str(chunk)}")
+                else:
+                    yield tone, chunk
+        finally:
+            # Also reached when the caller stops iterating: stop the drafts still streaming
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if errors:
+            raise Exception(f"Failed to generate cover letter drafts: {'; '.join(errors)}")
+    
     def _get_tone_instructions(self, tone):
         """Get tone-specific instructions for the AI"""
         tone_map = {
@@ -127,10 +510,26 @@ class CoverLetterGenerator:
         
         return tone_map.get(tone, tone_map['Professional'])
     
+    def _get_industry_instructions(self, industry):
+        """Get industry-specific instructions to fold into the main prompt"""
+        if not industry:
+            return ""
+        
+        return (f"INDUSTRY: {industry}. Adjust language, terminology, and emphasis "
+                f"to fit the expectations of the {industry} industry.\n")
+    
+    @tracing.traced('cover_letter.customize_for_industry')
     def customize_for_industry(self, cover_letter, industry):
-        """Customize cover letter for specific industry"""
+        """Re-target an existing cover letter for a different industry
+
+        This is a second full generation. For new letters pass the industry
+        to generate_cover_letter instead.
+        """
         try:
-            prompt = f"""
+            builder = PromptBuilder('industry_customization')
+            builder.add_text('cover_letter', cover_letter)
+            
+            prompt = builder.build("""
             Customize this cover letter for the {industry} industry. 
             Adjust language, terminology, and emphasis to better fit industry expectations.
             
@@ -141,70 +540,73 @@ class CoverLetterGenerator:
             
             Make appropriate adjustments while keeping the core content and structure.
             Return the customized cover letter.
-            """
+            """, industry=industry)
             
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part(text=prompt)])
-                ]
-            )
+            response = self._call_llm('industry_customization', prompt)
             
             return response.text.strip() if response.text else cover_letter
             
         except Exception as e:
             return cover_letter  # Return original if customization fails
     
-    def analyze_job_match(self, user_data, job_description):
-        """Analyze how well the candidate matches the job requirements"""
+    @tracing.traced('cover_letter.job_match')
+    def analyze_job_match(self, user_data, job_description, enrich=True, reuse_similar=False):
+        """Analyze how well the candidate matches the job requirements
+
+        Skills and the match percentage are computed locally. With enrich the
+        LLM is only asked for strengths and recommendations; with
+        reuse_similar (and a posting index) those are taken from the analysis
+        of a near-duplicate posting instead, when there is one.
+        """
+        analysis = score_job_match(user_data, job_description)
+        if not enrich:
+            return analysis
+        
+        owner = profile_version(user_data)
+        if reuse_similar:
+            previous = self._find_result(job_description, 'job_match', owner)
+            if previous:
+                analysis['strengths'] = previous['result']['strengths'] or analysis['strengths']
+                analysis['recommendations'] = previous['result']['recommendations'] or analysis['recommendations']
+                return analysis
+        
         try:
-            user_skills = [skill['name'] for skill in user_data['skills']]
             user_experience = [exp['description'] for exp in user_data['work_experience']]
             
-            prompt = f"""
+            builder = PromptBuilder('job_match')
+            builder.add_list('matching_skills', analysis['matching_skills'], priority=3, separator=', ')
+            builder.add_list('missing_skills', analysis['missing_skills'], priority=3, separator=', ')
+            builder.add_text('job_description', job_description, priority=1)
+            builder.add_list('experience', user_experience, priority=0, separator=' ')
+            
+            prompt = builder.build("""
             Analyze the match between this candidate and job requirements.
             
-            CANDIDATE SKILLS: {', '.join(user_skills)}
-            CANDIDATE EXPERIENCE: {' '.join(user_experience)}
+            MATCHING SKILLS: {matching_skills}
+            MISSING SKILLS: {missing_skills}
+            CANDIDATE EXPERIENCE: {experience}
             
             JOB DESCRIPTION: {job_description}
             
             Provide analysis in JSON format:
             {{
-                "match_percentage": number_between_0_and_100,
-                "matching_skills": ["skill1", "skill2"],
-                "missing_skills": ["skill1", "skill2"],
                 "strengths": ["strength1", "strength2"],
                 "recommendations": ["recommendation1", "recommendation2"]
             }}
-            """
-            
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part(text=prompt)])
-                ],
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json"
-                )
-            )
+            """)
+            
+            response = self._call_llm('job_match', prompt, json_response=True)
             
             if response.text:
-                return json.loads(response.text)
-            else:
-                return {
-                    "match_percentage": 50,
-                    "matching_skills": [],
-                    "missing_skills": [],
-                    "strengths": [],
-                    "recommendations": ["Analysis could not be completed."]
-                }
+                with tracing.span('parse_json', task='job_match'):
+                    result = json.loads(response.text)
+                analysis['strengths'] = result.get('strengths') or analysis['strengths']
+                analysis['recommendations'] = result.get('recommendations') or analysis['recommendations']
+                self._remember_result(job_description, 'job_match', owner, {
+                    'strengths': analysis['strengths'], 'recommendations': analysis['recommendations']
+                })
             
         except Exception as e:
-            return {
-                "match_percentage": 50,
-                "matching_skills": [],
-                "missing_skills": [],
-                "strengths": [],
-                "recommendations": [f"Analysis failed: {str(e)}"]
-            }
+            analysis['recommendations'].append(f"Detailed analysis failed: {str(e)}")
+        
+        return analysis
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import threading
+import time
+
+from storage import get_data_path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enhancements (
+    key TEXT PRIMARY KEY,
+    bullets TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS enhancements_updated ON enhancements (updated_at);
+"""
+
+
+class EnhancementCache:
+    """Enhanced bullet points by experience hash, shared by every session and worker
+
+    Filled by speculative enhancement jobs and by regular resume generation,
+    so an experience is only sent to the LLM once per distinct content.
+    Values can be any JSON, so the same store also keeps the reusable
+    cover letter paragraphs (see get_paragraph_cache).
+    """
+
+    def __init__(self, path=None, max_entries=5000):
+        self.path = path or get_data_path('enhancements.sqlite3')
+        self.max_entries = max_entries
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def get(self, key):
+        """Return the cached bullets for an experience hash, or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT bullets FROM enhancements WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, bullets):
+        """Store bullets for an experience hash, dropping the oldest entries beyond max_entries"""
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO enhancements (key, bullets, updated_at) VALUES (?, ?, ?)",
+                         (key, json.dumps(bullets), time.time()))
+            conn.execute("DELETE FROM enhancements WHERE key NOT IN "
+                         "(SELECT key FROM enhancements ORDER BY updated_at DESC LIMIT ?)", (self.max_entries,))
+        finally:
+            conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_enhancement_cache():
+    """Return the cache stored in the local data directory"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EnhancementCache()
+        return _cache
+
+
+_paragraph_cache = None
+
+
+def get_paragraph_cache():
+    """Return the store of candidate-specific cover letter paragraphs by profile version"""
+    global _paragraph_cache
+    with _cache_lock:
+        if _paragraph_cache is None:
+            _paragraph_cache = EnhancementCache(get_data_path('cover_letter_paragraphs.sqlite3'), max_entries=1000)
+        return _paragraph_cache
@@ -0,0 +1,76 @@
+import math
+import re
+
+from relevance import tokenize
+from skill_matcher import get_skill_matcher
+
+
+def normalize_skill(name):
+    """Normalize a skill name for comparison (case, whitespace, level suffixes)"""
+    if not name:
+        return ''
+    name = re.sub(r'\(.*?\)', '', name)  # e.g. "Spanish (Fluent)"
+    name = re.sub(r'\s+', ' ', name).strip().lower()
+    return name.strip(' .,;:')
+
+
+def score_job_match(user_data, job_description):
+    """Score a candidate against a job description locally, without any LLM call
+
+    Returns the same shape as CoverLetterGenerator.analyze_job_match. Each skill
+    the job mentions is weighted by how often it is mentioned.
+    """
+    job_text = job_description or ''
+
+    # Candidate skills without level suffixes, e.g. "Spanish (Fluent)" -> "Spanish"
+    skill_names = [re.sub(r'\(.*?\)', '', skill.get('name') or '').strip() for skill in user_data.get('skills', [])]
+    skill_names = [name for name in skill_names if name]
+    matcher = get_skill_matcher(skill_names)
+    user_skills = {normalize_skill(matcher.canonicalize(name)) for name in skill_names}
+
+    experience_text = ' '.join(
+        exp.get('description', '') + ' ' + ' '.join(exp.get('enhanced_description') or [])
+        for exp in user_data.get('work_experience', [])
+    )
+
+    # Every skill the job asks for, with its mention count, found in one pass
+    required = matcher.count(job_text)
+    experience_skills = set(matcher.count(experience_text))
+
+    matching_skills = []
+    missing_skills = []
+    matched_weight = 0.0
+    total_weight = 0.0
+
+    for skill, count in required.most_common():
+        weight = 1 + math.log(count)
+        total_weight += weight
+        if normalize_skill(skill) in user_skills or skill in experience_skills:
+            matching_skills.append(skill)
+            matched_weight += weight
+        else:
+            missing_skills.append(skill)
+
+    if total_weight:
+        match_percentage = round(100 * matched_weight / total_weight)
+    else:
+        # No recognizable skills: fall back to plain term overlap
+        job_terms = set(tokenize(job_text))
+        candidate_terms = set(tokenize(experience_text + ' ' + ' '.join(skill_names)))
+        match_percentage = round(100 * len(job_terms & candidate_terms) / len(job_terms)) if job_terms else 0
+
+    strengths = []
+    if matching_skills:
+        strengths.append(f"Has {len(matching_skills)} of the skills mentioned: {', '.join(matching_skills[:5])}")
+
+    recommendations = [
+        f"Highlight any experience with {skill}, or consider learning it" for skill in missing_skills[:3]
+    ]
+
+    return {
+        'match_percentage': match_percentage,
+        'matching_skills': matching_skills,
+        'missing_skills': missing_skills,
+        'strengths': strengths,
+        'recommendations': recommendations
+    }
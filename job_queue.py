@@ -0,0 +1,385 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import tracing
+from storage import get_data_path
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    progress TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    heartbeat_at REAL,
+    owner TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    updated_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_priority ON jobs (status, priority, created_at);
+"""
+
+
+class JobQueue:
+    """Persistent queue of generation jobs in a SQLite database
+
+    Jobs survive Streamlit reruns, browser reconnects and app restarts. Any
+    number of threads or processes can claim jobs from the same database;
+    claiming is a single write transaction, so each job runs once.
+    """
+
+    def __init__(self, path=None, max_attempts=3):
+        self.path = path or get_data_path('jobs.sqlite3')
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            # Queues created before jobs had these columns
+            for column, definition in (('priority', "INTEGER NOT NULL DEFAULT 0"), ('heartbeat_at', "REAL"),
+                                       ('owner', "TEXT")):
+                if columns and column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # A connection per call keeps the queue safe to share between threads
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _Connection(conn)
+
+    def _to_dict(self, row):
+        if row is None:
+            return None
+        job = dict(row)
+        for field in ('payload', 'result', 'progress'):
+            job[field] = json.loads(job[field]) if job[field] else None
+        return job
+
+    def submit(self, kind, payload, priority=0, owner=None):
+        """Queue a job and return its id (jobs with a higher priority are claimed first)
+
+        owner says whose job it is, so get can refuse to show it to anyone else.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, priority, owner, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload, default=str), priority, owner, now, now)
+            )
+        return job_id
+
+    def get(self, job_id, owner=None):
+        """Return a job as a dictionary, or None if it doesn't exist (or, given an owner, isn't theirs)"""
+        with self._connect() as conn:
+            if owner is None:
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            else:
+                row = conn.execute("SELECT * FROM jobs WHERE id = ? AND owner = ?", (job_id, owner)).fetchone()
+        return self._to_dict(row)
+
+    def claim(self, worker):
+        """Mark the next queued job as running for this worker and return it (None if idle)"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute('COMMIT')
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, started_at = ?, updated_at = ?, "
+                    "heartbeat_at = ? WHERE id = ?",
+                    (RUNNING, worker, now, now, now, row['id'])
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return self.get(row['id'])
+
+    def set_progress(self, job_id, progress):
+        """Store the latest progress of a running job"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET progress = ?, updated_at = ?, heartbeat_at = ? WHERE id = ?",
+                         (json.dumps(progress, default=str), now, now, job_id))
+
+    def heartbeat(self, job_id):
+        """Record that a running job's worker is still alive, even if it has no progress to report"""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING))
+
+    def complete(self, job_id, result):
+        """Mark a job as done with its result"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, result = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                         (DONE, json.dumps(result, default=str), now, now, job_id))
+
+    def fail(self, job_id, error):
+        """Mark a job as failed"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                         (FAILED, str(error), now, now, job_id))
+
+    def requeue_stale(self, timeout=300):
+        """Put running jobs whose worker stopped sending heartbeats back in the queue
+
+        Returns how many jobs were requeued. Jobs that already used all their
+        attempts are marked as failed instead.
+        """
+        cutoff = time.time() - timeout
+        last_seen = "MAX(updated_at, COALESCE(heartbeat_at, 0))"
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                         f"WHERE status = ? AND {last_seen} < ? AND attempts >= ?",
+                         (FAILED, "Worker stopped before the job finished", time.time(), RUNNING, cutoff,
+                          self.max_attempts))
+            cursor = conn.execute(f"UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND {last_seen} < ?",
+                                  (QUEUED, RUNNING, cutoff))
+            return cursor.rowcount
+
+    def purge(self, older_than=7 * 24 * 3600):
+        """Delete finished jobs older than the given number of seconds"""
+        cutoff = time.time() - older_than
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                                  (DONE, FAILED, cutoff))
+            return cursor.rowcount
+
+
+class _Connection:
+    """Context manager that closes the SQLite connection (sqlite3's own only commits)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, *exc_info):
+        self.conn.close()
+
+
+def run_resume_job(payload, report_progress):
+    """Generate a resume from a job payload"""
+    import resume_generator
+    from enhancement_cache import get_enhancement_cache
+
+    # Sections finished so far, so the app can show them before the whole resume is done
+    # (experiences are None until enhanced, as they may finish out of order)
+    partial = {'work_experience': [None] * len(payload['user_data']['work_experience'])}
+
+    def on_event(event):
+        if event.type == resume_generator.SUMMARY_READY:
+            partial['professional_summary'] = event.data
+        elif event.type == resume_generator.EXPERIENCE_ENHANCED:
+            partial['work_experience'][event.data['index']] = event.data['experience']
+        elif event.type == resume_generator.SKILLS_ORGANIZED:
+            partial['skills'] = event.data
+        else:
+            return
+        report_progress(event.completed, event.total, event.message, partial=partial)
+
+    generator = resume_generator.ResumeGenerator(enhancement_cache=get_enhancement_cache())
+    content = generator.generate_resume(payload['user_data'], payload['template_name'],
+                                        previous_resume=payload.get('previous_resume'), on_event=on_event)
+    return {
+        'content': content,
+        'template': payload['template_name'],
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def run_cover_letter_job(payload, report_progress):
+    """Generate a cover letter from a job payload"""
+    from cover_letter_generator import CoverLetterGenerator
+    from enhancement_cache import get_paragraph_cache
+    from keyword_engine import record_job_description
+    from posting_index import get_posting_index
+
+    report_progress(0, 1, "Writing cover letter")
+    generator = CoverLetterGenerator(paragraph_cache=get_paragraph_cache(), posting_index=get_posting_index())
+    content = generator.generate_cover_letter(payload['user_data'], payload['job_info'],
+                                              reuse_paragraphs=payload.get('reuse_paragraphs', False),
+                                              reuse_similar=payload.get('reuse_similar', False))
+    record_job_description(payload['job_info'].get('job_description', ''))
+    return {
+        'content': content,
+        'job_info': payload['job_info'],
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def run_enhance_experience_job(payload, report_progress):
+    """Enhance one experience ahead of time and cache the bullets for the next resume job"""
+    from enhancement_cache import get_enhancement_cache
+    from resume_generator import ResumeGenerator, experience_hash
+
+    exp = payload['experience']
+    cache = get_enhancement_cache()
+    if cache.get(experience_hash(exp)) is None:
+        ResumeGenerator(enhancement_cache=cache).enhance_experience(exp)
+    return {'experience_hash': experience_hash(exp)}
+
+
+JOB_HANDLERS = {
+    'resume': run_resume_job,
+    'cover_letter': run_cover_letter_job,
+    'enhance_experience': run_enhance_experience_job
+}
+
+# Speculative work yields to jobs a user is waiting for
+SPECULATIVE_PRIORITY = -10
+
+
+class JobWorker(threading.Thread):
+    """Thread that claims jobs from the queue and runs them until stopped"""
+
+    def __init__(self, queue, handlers=None, poll_interval=0.5, stale_timeout=None):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.handlers = handlers or JOB_HANDLERS
+        self.poll_interval = poll_interval
+        # Seconds without a heartbeat before a running job is requeued (None leaves it to other workers)
+        self.stale_timeout = stale_timeout
+        # Heartbeats go out well within the timeout while a handler runs, however long it takes
+        self.heartbeat_interval = min(30.0, stale_timeout / 3) if stale_timeout else 30.0
+        self._last_stale_check = time.monotonic()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run_job(self, job):
+        """Run one claimed job and store its result or error"""
+        def report_progress(completed, total, message, **details):
+            try:
+                self.queue.set_progress(job['id'], dict(details, completed=completed, total=total, message=message))
+            except sqlite3.Error:
+                pass  # Progress is informational; never fail the job over it
+
+        def send_heartbeats():
+            while not finished.wait(self.heartbeat_interval):
+                try:
+                    self.queue.heartbeat(job['id'])
+                except sqlite3.Error:
+                    pass  # The next one may get through
+
+        handler = self.handlers.get(job['kind'])
+        if handler is None:
+            self.queue.fail(job['id'], f"Unknown job kind: {job['kind']}")
+            return
+
+        finished = threading.Event()
+        threading.Thread(target=send_heartbeats, daemon=True).start()
+        try:
+            with tracing.span(f"job.{job['kind']}", job_id=job['id'], attempt=job['attempts']):
+                result = handler(job['payload'], report_progress)
+        except Exception as e:
+            self.queue.fail(job['id'], str(e))
+        else:
+            self.queue.complete(job['id'], result)
+        finally:
+            finished.set()
+
+    def requeue_stale(self):
+        """Requeue jobs left running by a stopped worker, at most once a minute
+
+        A job that was running when the app restarted only goes stale after
+        stale_timeout seconds, so a single check at startup would miss it.
+        """
+        if self.stale_timeout is None or time.monotonic() - self._last_stale_check < min(60, self.stale_timeout):
+            return
+        self._last_stale_check = time.monotonic()
+        try:
+            self.queue.requeue_stale(self.stale_timeout)
+        except sqlite3.Error:
+            pass  # Tried again at the next check
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.requeue_stale()
+            try:
+                job = self.queue.claim(self.worker_id)
+            except sqlite3.Error:
+                job = None
+            if job is None:
+                self._stop_event.wait(self.poll_interval)
+                continue
+            self.run_job(job)
+
+
+_queue = None
+_workers = []
+_workers_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Return the process-wide job queue, stored in the local data directory"""
+    global _queue
+    with _workers_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+
+def start_workers(count=None):
+    """Start the in-process worker threads once (JOB_WORKERS, default 2; 0 to rely on external workers)
+
+    Safe to call on every Streamlit rerun. Running jobs left behind by a
+    stopped process are requeued after JOB_STALE_SECONDS (default 300); the
+    workers keep checking for them while they run.
+    """
+    queue = get_job_queue()
+    count = count if count is not None else int(os.getenv('JOB_WORKERS', '2'))
+    with _workers_lock:
+        if _workers or count <= 0:
+            return _workers
+        stale_timeout = float(os.getenv('JOB_STALE_SECONDS', '300'))
+        queue.requeue_stale(stale_timeout)
+        for _ in range(count):
+            worker = JobWorker(queue, stale_timeout=stale_timeout)
+            worker.start()
+            _workers.append(worker)
+        return _workers
+
+
+if __name__ == '__main__':
+    # Standalone worker process: python job_queue.py [worker threads]
+    import sys
+
+    workers = start_workers(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    print(f"Running {len(workers)} job workers on {get_job_queue().path}")
+    try:
+        while True:
+            time.sleep(60)
+            get_job_queue().requeue_stale(float(os.getenv('JOB_STALE_SECONDS', '300')))
+    except KeyboardInterrupt:
+        pass
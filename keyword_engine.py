@@ -0,0 +1,216 @@
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+from relevance import STOP_WORDS
+from storage import get_data_path, read_json, write_json_atomic
+
+# Phrases never span punctuation or the end of a sentence
+_SEGMENT_SPLIT = re.compile(r"[,;:!?()\[\]{}\n\r•|/]|\.(?=\s|$)")
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+
+# Words that are common in every job posting and never useful on their own
+JOB_STOP_WORDS = STOP_WORDS | frozenset({
+    'about', 'also', 'any', 'etc', 'more', 'other', 'such', 'than', 'their', 'them',
+    'they', 'what', 'when', 'where', 'which', 'while', 'into', 'across', 'within',
+    'not', 'including', 'plus', 'well', 'us', 'join', 'looking', 'role', 'position',
+    'candidate', 'ideal', 'able', 'ability', 'years', 'year', 'strong', 'work',
+    'working', 'experience', 'preferred', 'required', 'requirements', 'responsibilities',
+    'skills', 'knowledge', 'team', 'new', 'based', 'using', 'use', 'help', 'i', 'if',
+    'so', 'out', 'up', 'how', 'one', 'per', 'both', 'each', 'some', 'very'
+})
+
+
+def tokenize_segments(text):
+    """Split text into runs of content words; stop words and punctuation end a run"""
+    runs = []
+    for segment in _SEGMENT_SPLIT.split((text or '').lower()):
+        run = []
+        for token in _TOKEN_PATTERN.findall(segment):
+            if token in JOB_STOP_WORDS or token.isdigit() or len(token) < 2:
+                if run:
+                    runs.append(run)
+                    run = []
+            else:
+                run.append(token)
+        if run:
+            runs.append(run)
+    return runs
+
+
+def extract_ngrams(text, max_n=3):
+    """Count every 1..max_n-gram in text"""
+    counts = Counter()
+    for run in tokenize_segments(text):
+        for n in range(1, max_n + 1):
+            for i in range(len(run) - n + 1):
+                counts[' '.join(run[i:i + n])] += 1
+    return counts
+
+
+class KeywordCorpus:
+    """Document frequencies of n-grams across past job descriptions
+
+    Updated incrementally as descriptions are seen and persisted as JSON.
+    Each distinct description is only counted once.
+    """
+
+    def __init__(self, path=None, max_n=3):
+        self.path = path
+        self.max_n = max_n
+        self.document_count = 0
+        self.document_frequency = Counter()
+        self.seen = set()
+        self._lock = threading.Lock()
+
+        if path:
+            self.load()
+
+    def load(self):
+        """Load corpus statistics from disk, if present"""
+        data = read_json(self.path, default={})
+        self.document_count = data.get('document_count', 0)
+        self.document_frequency = Counter(data.get('document_frequency', {}))
+        self.seen = set(data.get('seen', []))
+
+    def save(self):
+        """Persist corpus statistics to disk"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'document_count': self.document_count,
+                'document_frequency': dict(self.document_frequency),
+                'seen': sorted(self.seen)
+            }
+        write_json_atomic(self.path, data)
+
+    def add_document(self, text):
+        """Add one job description to the statistics, returning False if already seen"""
+        digest = hashlib.sha1(' '.join((text or '').split()).lower().encode('utf-8')).hexdigest()
+        terms = extract_ngrams(text, self.max_n)
+
+        with self._lock:
+            if digest in self.seen or not terms:
+                return False
+            self.seen.add(digest)
+            self.document_count += 1
+            self.document_frequency.update(terms.keys())
+        return True
+
+    def idf(self, term):
+        """Smoothed inverse document frequency of a term"""
+        return math.log((self.document_count + 1) / (self.document_frequency.get(term, 0) + 1)) + 1
+
+
+class KeywordExtractor:
+    """Rank 1-3-gram keywords in job descriptions by TF-IDF against a corpus"""
+
+    def __init__(self, corpus=None, max_n=3):
+        self.corpus = corpus or KeywordCorpus(max_n=max_n)
+        self.max_n = max_n
+
+    def _select(self, scored, top_n):
+        """Pick the best terms, skipping ones already contained in a better phrase"""
+        selected = []
+        for term, score in scored:
+            padded = f" {term} "
+            if any(padded in f" {chosen} " or f" {chosen} " in padded for chosen, _ in selected):
+                continue
+            selected.append((term, score))
+            if len(selected) >= top_n:
+                break
+        return selected
+
+    def score_terms(self, text):
+        """Return (term, score) pairs for every n-gram in text, best first
+
+        Phrases get a small boost per extra word, and repeated phrases need to
+        appear more than once to outrank the words they are made of.
+        """
+        counts = extract_ngrams(text, self.max_n)
+        scored = []
+        for term, count in counts.items():
+            n = term.count(' ') + 1
+            if n > 1 and count < 2 and len(counts) > 50:
+                continue  # one-off word combinations in long texts are noise
+            tf = 1 + math.log(count)
+            scored.append((term, tf * self.corpus.idf(term) * (1 + 0.5 * (n - 1))))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored
+
+    def extract(self, text, top_n=20):
+        """Return the top keywords and phrases in text"""
+        return [term for term, score in self._select(self.score_terms(text), top_n)]
+
+    def extract_batch(self, texts, top_n=20):
+        """Extract keywords from many texts at once with vectorized scoring
+
+        All documents are scored in one pass over flat (document, term, count)
+        arrays instead of a Python loop per document.
+        """
+        vocabulary = {}
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            for term, count in extract_ngrams(text, self.max_n).items():
+                col = vocabulary.setdefault(term, len(vocabulary))
+                rows.append(row)
+                cols.append(col)
+                values.append(count)
+
+        if not vocabulary:
+            return [[] for _ in texts]
+
+        terms = list(vocabulary)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        counts = np.asarray(values, dtype=np.float64)
+
+        document_frequency = np.fromiter(
+            (self.corpus.document_frequency.get(term, 0) for term in terms), dtype=np.float64, count=len(terms)
+        )
+        idf = np.log((self.corpus.document_count + 1) / (document_frequency + 1)) + 1
+        lengths = np.fromiter((term.count(' ') + 1 for term in terms), dtype=np.float64, count=len(terms))
+
+        scores = (1 + np.log(counts)) * idf[cols] * (1 + 0.5 * (lengths[cols] - 1))
+
+        # Drop one-off phrases in long documents, as in score_terms
+        terms_per_doc = np.bincount(rows, minlength=len(texts))
+        noise = (lengths[cols] > 1) & (counts < 2) & (terms_per_doc[rows] > 50)
+        scores[noise] = -np.inf
+
+        # Sort by document, then by descending score, then alphabetically
+        term_order = np.argsort(np.argsort(np.array(terms, dtype=object)))
+        order = np.lexsort((term_order[cols], -scores, rows))
+        boundaries = np.searchsorted(rows[order], np.arange(len(texts) + 1))
+
+        results = []
+        for doc in range(len(texts)):
+            doc_entries = order[boundaries[doc]:boundaries[doc + 1]]
+            scored = [(terms[cols[i]], scores[i]) for i in doc_entries if np.isfinite(scores[i])]
+            results.append([term for term, score in self._select(scored, top_n)])
+        return results
+
+
+_default_corpus = None
+_default_corpus_lock = threading.Lock()
+
+
+def get_default_corpus():
+    """Return the corpus of job descriptions persisted in the local data directory"""
+    global _default_corpus
+    with _default_corpus_lock:
+        if _default_corpus is None:
+            _default_corpus = KeywordCorpus(get_data_path('keyword_corpus.json'))
+        return _default_corpus
+
+
+def record_job_description(job_description):
+    """Add a job description to the persisted corpus"""
+    corpus = get_default_corpus()
+    if corpus.add_document(job_description):
+        corpus.save()
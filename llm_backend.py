@@ -0,0 +1,337 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import metrics
+import tracing
+from prompt_builder import estimate_tokens
+
+
+class LLMBackendError(Exception):
+    """Raised when the LLM backend fails to produce a response"""
+
+
+class RateLimitError(LLMBackendError):
+    """Raised when the backend rejects a call because of rate limits (HTTP 429)"""
+
+
+class LLMResponse:
+    """Text returned by a backend, with token counts when the backend reports them"""
+
+    def __init__(self, text, prompt_tokens=None, response_tokens=None):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.response_tokens = response_tokens
+
+
+class LLMBackend:
+    """Interface every LLM backend implements"""
+
+    name = 'base'
+
+    def generate(self, prompt, json_response=False):
+        """Return an LLMResponse for a single-turn prompt"""
+        raise NotImplementedError
+
+    def generate_stream(self, prompt):
+        """Yield the response text in chunks (backends without streaming yield it all at once)"""
+        response = self.generate(prompt)
+        if response.text:
+            yield response.text
+
+    def record_input(self, kind, data):
+        """Hook for backends that keep the inputs of a pipeline run (no-op by default)"""
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through the google-genai client"""
+
+    name = 'gemini'
+
+    def __init__(self, model="gemini-2.5-flash"):
+        # Using Google Gemini AI which offers better free tier options
+        # Note that the newest Gemini model series is "gemini-2.5-flash" or gemini-2.5-pro"
+        # do not change this unless explicitly requested by the user
+        from google import genai
+        from google.genai import types
+
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise Exception("GEMINI_API_KEY environment variable is required. Get your free key at https://makersuite.google.com/app/apikey")
+        self.client = genai.Client(api_key=api_key)
+        self.types = types
+        self.model = model
+
+    def _request(self, prompt, json_response):
+        """Build the contents and config arguments for a request"""
+        contents = [self.types.Content(role="user", parts=[self.types.Part(text=prompt)])]
+        config = self.types.GenerateContentConfig(response_mime_type="application/json") if json_response else None
+        return contents, config
+
+    def _translate_error(self, error):
+        """Turn a client error into one of our backend errors"""
+        if getattr(error, 'code', None) == 429:
+            return RateLimitError(str(error))
+        return LLMBackendError(str(error))
+
+    def generate(self, prompt, json_response=False):
+        contents, config = self._request(prompt, json_response)
+        try:
+            response = self.client.models.generate_content(model=self.model, contents=contents, config=config)
+        except Exception as e:
+            raise self._translate_error(e)
+
+        usage = getattr(response, 'usage_metadata', None)
+        return LLMResponse(
+            response.text,
+            prompt_tokens=getattr(usage, 'prompt_token_count', None),
+            response_tokens=getattr(usage, 'candidates_token_count', None)
+        )
+
+    def generate_stream(self, prompt):
+        contents, config = self._request(prompt, False)
+        try:
+            for chunk in self.client.models.generate_content_stream(model=self.model, contents=contents, config=config):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise self._translate_error(e)
+
+
+class FakeBackend(LLMBackend):
+    """Local stand-in for Gemini with configurable latency and failures
+
+    Returns schema-valid JSON for the JSON prompts the generators send and
+    plausible text otherwise, so the whole app runs offline. Latency follows
+    the chosen distribution ('constant', 'uniform', 'normal', 'lognormal' or
+    'exponential') around latency_ms; error_rate and rate_limit_rate inject
+    generic failures and 429s.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency_ms=0, latency_jitter_ms=0, distribution='constant',
+                 error_rate=0.0, rate_limit_rate=0.0, response_words=120, seed=None):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.response_words = response_words
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.call_count = 0
+        self.errors_injected = 0
+        self.rate_limits_injected = 0
+
+    def _sample_latency(self):
+        """Draw one latency in seconds from the configured distribution"""
+        mean = self.latency_ms
+        jitter = self.latency_jitter_ms
+        with self._lock:
+            if self.distribution == 'uniform':
+                value = self.random.uniform(mean - jitter, mean + jitter)
+            elif self.distribution == 'normal':
+                value = self.random.gauss(mean, jitter)
+            elif self.distribution == 'lognormal':
+                # jitter is the standard deviation of the resulting distribution
+                sigma = (jitter / mean) if mean else 0
+                value = mean * self.random.lognormvariate(0, sigma) if mean else 0
+            elif self.distribution == 'exponential':
+                value = self.random.expovariate(1 / mean) if mean else 0
+            else:
+                value = mean
+        return max(0.0, value) / 1000
+
+    def _maybe_fail(self):
+        """Count the call and raise an injected failure if one is due"""
+        with self._lock:
+            self.call_count += 1
+            roll = self.random.random()
+            if roll < self.rate_limit_rate:
+                self.rate_limits_injected += 1
+                raise RateLimitError("429 RESOURCE_EXHAUSTED (injected by FakeBackend)")
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.errors_injected += 1
+                raise LLMBackendError("500 INTERNAL (injected by FakeBackend)")
+
+    def _words(self, prompt, count):
+        """Pick words from the prompt so fake output looks related to the input"""
+        words = re.findall(r"[A-Za-z][A-Za-z+#.-]{3,}", prompt) or ['result']
+        with self._lock:
+            return [self.random.choice(words) for _ in range(count)]
+
+    def _sentence(self, prompt, count=12):
+        words = self._words(prompt, count)
+        return ' '.join(words).capitalize() + '.'
+
+    def _json_response(self, prompt):
+        """Build a JSON object matching the schema the prompt asks for"""
+        if '"bullet_points"' in prompt:
+            return {'bullet_points': [f"Delivered {self._sentence(prompt)}" for _ in range(4)]}
+        if '"experience_paragraph"' in prompt:
+            return {
+                'experience_paragraph': self._sentence(prompt, 40),
+                'skills_paragraph': self._sentence(prompt, 30),
+                'closing_paragraph': self._sentence(prompt, 25)
+            }
+        if '"opening_paragraph"' in prompt:
+            return {'opening_paragraph': self._sentence(prompt, 30), 'match_paragraph': self._sentence(prompt, 40)}
+        if '"suggestions"' in prompt:
+            return {'suggestions': [f"Consider adding {self._sentence(prompt, 8)}" for _ in range(3)]}
+        if '"strengths"' in prompt:
+            return {
+                'match_percentage': 70,
+                'matching_skills': [],
+                'missing_skills': [],
+                'strengths': [self._sentence(prompt, 8) for _ in range(2)],
+                'recommendations': [self._sentence(prompt, 8) for _ in range(2)]
+            }
+        return {'result': self._sentence(prompt)}
+
+    def _text_response(self, prompt):
+        """Build paragraphs of plain text of roughly response_words words"""
+        paragraphs = []
+        remaining = self.response_words
+        while remaining > 0:
+            size = min(remaining, 60)
+            paragraphs.append(self._sentence(prompt, size))
+            remaining -= size
+        return '\n\n'.join(paragraphs)
+
+    def generate(self, prompt, json_response=False):
+        time.sleep(self._sample_latency())
+        self._maybe_fail()
+
+        text = json.dumps(self._json_response(prompt)) if json_response else self._text_response(prompt)
+        return LLMResponse(text, prompt_tokens=estimate_tokens(prompt), response_tokens=estimate_tokens(text))
+
+    def generate_stream(self, prompt):
+        latency = self._sample_latency()
+        self._maybe_fail()
+
+        text = self._text_response(prompt)
+        chunks = re.findall(r"\S+\s*", text)
+        delay = latency / len(chunks) if chunks else latency
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+
+
+def generate_with_retries(backend, prompt, json_response=False, retries=3, backoff=1.0, task=None):
+    """Call backend.generate, retrying rate-limited calls with exponential backoff
+
+    Every call is recorded in the metrics registry by task: outcome, latency
+    (including retries), prompt and response sizes, rate limits and retries.
+    """
+    labels = {'task': task or 'unknown', 'backend': backend.name}
+    status = 'error'
+    start = time.perf_counter()
+    with tracing.span('llm.generate', json_response=json_response, prompt_chars=len(prompt), **labels) as current:
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    response = backend.generate(prompt, json_response=json_response)
+                except RateLimitError:
+                    metrics.increment('llm_rate_limited_total', **labels)
+                    if attempt == retries:
+                        raise
+                    metrics.increment('llm_retries_total', **labels)
+                    time.sleep(backoff * (2 ** attempt))
+                    continue
+                
+                status = 'ok'
+                metrics.observe('llm_prompt_chars', len(prompt), metrics.SIZE_BUCKETS, **labels)
+                metrics.observe('llm_response_chars', len(response.text or ''), metrics.SIZE_BUCKETS, **labels)
+                if current:
+                    current.set(attempts=attempt + 1, response_chars=len(response.text or ''))
+                return response
+        finally:
+            metrics.increment('llm_calls_total', status=status, **labels)
+            metrics.observe('llm_call_duration_seconds', time.perf_counter() - start, **labels)
+
+
+def stream_with_retries(backend, prompt, retries=3, backoff=1.0, task=None):
+    """Stream backend.generate_stream with the retries, metrics and trace of generate_with_retries
+
+    Rate-limited calls are retried until the first chunk arrives; after that
+    the reader already has part of the text, so errors are raised as they are.
+    """
+    labels = {'task': task or 'unknown', 'backend': backend.name}
+    status = 'error'
+    start = time.perf_counter()
+    response_chars = 0
+    with tracing.span('llm.generate_stream', prompt_chars=len(prompt), **labels) as current:
+        stream = None
+        try:
+            for attempt in range(retries + 1):
+                stream = backend.generate_stream(prompt)
+                try:
+                    first = next(stream, None)
+                except RateLimitError:
+                    metrics.increment('llm_rate_limited_total', **labels)
+                    if attempt == retries:
+                        raise
+                    metrics.increment('llm_retries_total', **labels)
+                    time.sleep(backoff * (2 ** attempt))
+                    continue
+                break
+            
+            if first is not None:
+                response_chars += len(first)
+                yield first
+                for chunk in stream:
+                    response_chars += len(chunk)
+                    yield chunk
+            
+            status = 'ok'
+            metrics.observe('llm_prompt_chars', len(prompt), metrics.SIZE_BUCKETS, **labels)
+            metrics.observe('llm_response_chars', response_chars, metrics.SIZE_BUCKETS, **labels)
+            if current:
+                current.set(attempts=attempt + 1, response_chars=response_chars)
+        except GeneratorExit:
+            status = 'cancelled'
+            raise
+        finally:
+            if stream is not None:
+                stream.close()
+            metrics.increment('llm_calls_total', status=status, **labels)
+            metrics.observe('llm_call_duration_seconds', time.perf_counter() - start, **labels)
+
+
+def get_backend():
+    """Create the backend selected by environment variables
+
+    LLM_BACKEND=fake uses FakeBackend, configured with FAKE_LLM_LATENCY_MS,
+    FAKE_LLM_JITTER_MS, FAKE_LLM_DISTRIBUTION, FAKE_LLM_ERROR_RATE,
+    FAKE_LLM_RATE_LIMIT_RATE and FAKE_LLM_SEED. Anything else uses Gemini.
+    LLM_CASSETTE_MODE=record|replay with LLM_CASSETTE_PATH records the calls
+    to a cassette file or serves them from one.
+    """
+    cassette_mode = os.getenv('LLM_CASSETTE_MODE', '').lower()
+    if cassette_mode == 'replay':
+        from cassette import CassetteBackend
+        return CassetteBackend(os.getenv('LLM_CASSETTE_PATH', 'llm_cassette.jsonl.gz'), mode='replay',
+                               replay_latency=os.getenv('LLM_CASSETTE_REPLAY_LATENCY') == '1')
+
+    if os.getenv('LLM_BACKEND', 'gemini').lower() == 'fake':
+        seed = os.getenv('FAKE_LLM_SEED')
+        backend = FakeBackend(
+            latency_ms=float(os.getenv('FAKE_LLM_LATENCY_MS', '0')),
+            latency_jitter_ms=float(os.getenv('FAKE_LLM_JITTER_MS', '0')),
+            distribution=os.getenv('FAKE_LLM_DISTRIBUTION', 'constant'),
+            error_rate=float(os.getenv('FAKE_LLM_ERROR_RATE', '0')),
+            rate_limit_rate=float(os.getenv('FAKE_LLM_RATE_LIMIT_RATE', '0')),
+            seed=int(seed) if seed else None
+        )
+    else:
+        backend = GeminiBackend()
+
+    if cassette_mode == 'record':
+        from cassette import CassetteBackend
+        return CassetteBackend(os.getenv('LLM_CASSETTE_PATH', 'llm_cassette.jsonl.gz'), mode='record', backend=backend)
+
+    return backend
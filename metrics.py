@@ -0,0 +1,272 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from storage import get_data_path, write_json_atomic
+
+# Default histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Buckets for sizes in characters or bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+# Buckets for small counts such as PDF pages
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20)
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class MetricsRegistry:
+    """In-process counters and histograms, keyed by metric name and labels
+
+    This is the default registry. Anything with the same increment, observe
+    and snapshot methods can be installed with set_registry, e.g. an adapter
+    that forwards to prometheus_client or StatsD.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._buckets = {}
+
+    def increment(self, name, value=1, **labels):
+        """Add value to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, buckets=None, **labels):
+        """Record one observation in a histogram (bucket bounds are fixed on first use)"""
+        key = _label_key(labels)
+        with self._lock:
+            bounds = self._buckets.setdefault(name, tuple(buckets or LATENCY_BUCKETS))
+            series = self._histograms.setdefault(name, {})
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = {'count': 0, 'sum': 0.0, 'min': value, 'max': value, 'buckets': [0] * len(bounds)}
+            entry['count'] += 1
+            entry['sum'] += value
+            entry['min'] = min(entry['min'], value)
+            entry['max'] = max(entry['max'], value)
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    entry['buckets'][i] += 1
+                    break
+
+    def snapshot(self):
+        """Return a JSON-serializable copy of every metric"""
+        with self._lock:
+            counters = {
+                name: [{'labels': dict(key), 'value': value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items())
+            }
+            histograms = {}
+            for name, series in sorted(self._histograms.items()):
+                bounds = self._buckets[name]
+                histograms[name] = [
+                    {
+                        'labels': dict(key),
+                        'count': entry['count'],
+                        'sum': entry['sum'],
+                        'min': entry['min'],
+                        'max': entry['max'],
+                        # Cumulative, as in the Prometheus format
+                        'buckets': [[bound, sum(entry['buckets'][:i + 1])] for i, bound in enumerate(bounds)]
+                    }
+                    for key, entry in sorted(series.items())
+                ]
+        return {'timestamp': time.time(), 'counters': counters, 'histograms': histograms}
+
+    def reset(self):
+        """Drop every recorded metric"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._buckets.clear()
+
+
+class NullRegistry:
+    """Registry that records nothing (install it to turn metrics off)"""
+
+    def increment(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, buckets=None, **labels):
+        pass
+
+    def snapshot(self):
+        return {'timestamp': time.time(), 'counters': {}, 'histograms': {}}
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    escaped = []
+    for name, value in items:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_number(value):
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def format_prometheus(snapshot):
+    """Render a registry snapshot in the Prometheus text exposition format"""
+    lines = []
+    for name, series in snapshot['counters'].items():
+        lines.append(f"# TYPE {name} counter")
+        for entry in series:
+            lines.append(f"{name}{_format_labels(entry['labels'])} {_format_number(entry['value'])}")
+
+    for name, series in snapshot['histograms'].items():
+        lines.append(f"# TYPE {name} histogram")
+        for entry in series:
+            for bound, count in entry['buckets']:
+                lines.append(f"{name}_bucket{_format_labels(entry['labels'], {'le': _format_number(float(bound))})} {count}")
+            lines.append(f"{name}_bucket{_format_labels(entry['labels'], {'le': '+Inf'})} {entry['count']}")
+            lines.append(f"{name}_sum{_format_labels(entry['labels'])} {_format_number(float(entry['sum']))}")
+            lines.append(f"{name}_count{_format_labels(entry['labels'])} {entry['count']}")
+
+    return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry() if os.getenv('METRICS_ENABLED', '1') != '0' else NullRegistry()
+
+
+def get_registry():
+    """Return the registry every instrumented call records to"""
+    return _registry
+
+
+def set_registry(registry):
+    """Install a different registry, returning the previous one"""
+    global _registry
+    previous = _registry
+    _registry = registry
+    return previous
+
+
+def increment(name, value=1, **labels):
+    """Add value to a counter in the current registry"""
+    _registry.increment(name, value, **labels)
+
+
+def observe(name, value, buckets=None, **labels):
+    """Record a histogram observation in the current registry"""
+    _registry.observe(name, value, buckets, **labels)
+
+
+@contextmanager
+def timed(name, **labels):
+    """Record how long the block takes, in seconds, as a histogram observation"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def snapshot():
+    """Return a snapshot of the current registry"""
+    return _registry.snapshot()
+
+
+def dump_json(path=None):
+    """Write the current metrics as JSON (to the data directory by default) and return the path"""
+    path = path or get_data_path('metrics', 'metrics.json')
+    write_json_atomic(path, snapshot())
+    return path
+
+
+def write_prometheus(path=None):
+    """Write the current metrics in Prometheus text format, for the node_exporter textfile collector"""
+    path = path or get_data_path('metrics', 'metrics.prom')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(format_prometheus(snapshot()))
+    os.replace(tmp_path, path)
+    return path
+
+
+_last_export = 0.0
+_export_lock = threading.Lock()
+
+
+def export_metrics(min_interval=None):
+    """Write the JSON and Prometheus files, at most once every min_interval seconds
+
+    The interval defaults to METRICS_EXPORT_INTERVAL (10 seconds), so this is
+    cheap enough to call after every page render.
+    """
+    global _last_export
+    if min_interval is None:
+        min_interval = float(os.getenv('METRICS_EXPORT_INTERVAL', '10'))
+
+    with _export_lock:
+        now = time.monotonic()
+        if _last_export and now - _last_export < min_interval:
+            return False
+        _last_export = now
+
+    try:
+        dump_json()
+        write_prometheus()
+    except OSError:
+        # Metrics must never break the page that triggered the export
+        return False
+    return True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] == '/metrics':
+            body = format_prometheus(snapshot()).encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif self.path.split('?')[0] == '/metrics.json':
+            body = json.dumps(snapshot()).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host='127.0.0.1'):
+    """Serve /metrics (Prometheus) and /metrics.json from a background thread
+
+    The port defaults to METRICS_PORT. Only one server is started per process,
+    so this is safe to call on every Streamlit rerun. Returns the server, or
+    None if no port is configured.
+    """
+    global _server
+    port = port or os.getenv('METRICS_PORT')
+    if not port:
+        return None
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
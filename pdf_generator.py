@@ -1,42 +1,58 @@
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.lib.colors import black, blue, darkblue
+from reportlab.lib.colors import black, blue, darkblue, HexColor
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime
 
+import metrics
+import tracing
+from templates import get_available_templates, get_template_structure
+
+# Built-in PDF fonts standing in for each template's font (regular, bold, italic)
+_TEMPLATE_FONTS = {
+    'Times New Roman': ('Times-Roman', 'Times-Bold', 'Times-Italic')
+}
+_DEFAULT_FONTS = ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique')
+
 
 class PDFGenerator:
 
     def __init__(self):
         self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self._setup_custom_styles(self.styles)
+        self._template_styles = {}
 
-    def _setup_custom_styles(self):
+    def _setup_custom_styles(self, styles):
         """Setup custom styles for the PDF"""
         # Header style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(name='CustomHeader',
-                           parent=self.styles['Heading1'],
+                           parent=styles['Heading1'],
                            fontSize=16,
                            spaceAfter=12,
                            textColor=darkblue,
                            alignment=TA_CENTER))
 
         # Contact info style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(name='ContactInfo',
-                           parent=self.styles['Normal'],
+                           parent=styles['Normal'],
                            fontSize=10,
                            alignment=TA_CENTER,
                            spaceAfter=12))
 
         # Section header style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(name='SectionHeader',
-                           parent=self.styles['Heading2'],
+                           parent=styles['Heading2'],
                            fontSize=12,
                            spaceAfter=6,
                            spaceBefore=12,
@@ -46,9 +62,9 @@ class PDFGenerator:
                            borderPadding=2))
 
         # Job title style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(name='JobTitle',
-                           parent=self.styles['Normal'],
+                           parent=styles['Normal'],
                            fontSize=11,
                            spaceBefore=6,
                            spaceAfter=2,
@@ -56,25 +72,71 @@ class PDFGenerator:
                            fontName='Helvetica-Bold'))
 
         # Company info style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(name='CompanyInfo',
-                           parent=self.styles['Normal'],
+                           parent=styles['Normal'],
                            fontSize=10,
                            spaceAfter=4,
                            textColor=black,
                            fontName='Helvetica-Oblique'))
 
         # Bullet point style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(name='BulletPoint',
-                           parent=self.styles['Normal'],
+                           parent=styles['Normal'],
                            fontSize=10,
                            leftIndent=20,
                            spaceAfter=3,
                            bulletIndent=10))
 
-    def generate_resume_pdf(self, resume_data):
-        """Generate PDF for resume"""
+    def styles_for_template(self, template_name):
+        """Stylesheet with a resume template's colors and font (cached per template)"""
+        if template_name not in self._template_styles:
+            formatting = get_template_structure(template_name)['formatting']
+            regular, bold, italic = _TEMPLATE_FONTS.get(formatting['font'], _DEFAULT_FONTS)
+            header_color = HexColor(formatting['header_color'])
+            accent_color = HexColor(formatting['accent_color'])
+
+            styles = getSampleStyleSheet()
+            self._setup_custom_styles(styles)
+            styles['Normal'].fontName = regular
+            styles['CustomHeader'].fontName = bold
+            styles['CustomHeader'].textColor = header_color
+            styles['SectionHeader'].fontName = bold
+            styles['SectionHeader'].textColor = accent_color
+            styles['SectionHeader'].borderColor = accent_color
+            styles['JobTitle'].fontName = bold
+            styles['CompanyInfo'].fontName = italic
+            styles['ContactInfo'].fontName = regular
+            styles['BulletPoint'].fontName = regular
+            self._template_styles[template_name] = styles
+        return self._template_styles[template_name]
+
+    def _build(self, doc, story, buffer, document):
+        """Build the PDF and record its build time, page count and size"""
+        start = time.perf_counter()
+        with tracing.span('pdf.build', document=document, flowables=len(story)) as current:
+            try:
+                doc.build(story)
+            except Exception:
+                metrics.increment('pdf_builds_total', document=document, status='error')
+                raise
+            if current:
+                current.set(pages=doc.page, bytes=buffer.tell())
+
+        pdf_bytes = buffer.getvalue()
+        metrics.increment('pdf_builds_total', document=document, status='ok')
+        metrics.observe('pdf_build_duration_seconds', time.perf_counter() - start, document=document)
+        metrics.observe('pdf_pages', doc.page, metrics.COUNT_BUCKETS, document=document)
+        metrics.observe('pdf_bytes', len(pdf_bytes), metrics.SIZE_BUCKETS, document=document)
+        return pdf_bytes
+
+    def generate_resume_pdf(self, resume_data, outline=None):
+        """Generate PDF for resume, styled by its template
+
+        outline, if given, is a resume_outline already built from the same
+        content (so several templates can share one).
+        """
         try:
             buffer = io.BytesIO()
             doc = SimpleDocTemplate(buffer,
@@ -84,134 +146,129 @@ class PDFGenerator:
                                     topMargin=0.75 * inch,
                                     bottomMargin=0.75 * inch)
 
-            story = []
-            content = resume_data['content']
-
-            # Header - Name and Contact Info (always include this)
-            personal_info = content.get('personal_info', {})
-            first_name = personal_info.get('first_name', 'Name')
-            last_name = personal_info.get('last_name', 'Not Provided')
-            name = f"{first_name} {last_name}"
-            story.append(Paragraph(name, self.styles['CustomHeader']))
-
-            # Contact information (always include this)
-            contact_parts = []
-            if personal_info.get('email'):
-                contact_parts.append(personal_info['email'])
-            if personal_info.get('phone'):
-                contact_parts.append(personal_info['phone'])
-            if personal_info.get('location'):
-                contact_parts.append(personal_info['location'])
-
-            if contact_parts:
-                contact_info = " • ".join(contact_parts)
-                story.append(Paragraph(contact_info, self.styles['ContactInfo']))
-
-            # Add LinkedIn and other links
-            links = []
-            if personal_info.get('linkedin'):
-                links.append(f"LinkedIn: {personal_info['linkedin']}")
-            if personal_info.get('github'):
-                links.append(f"GitHub: {personal_info['github']}")
-            if personal_info.get('website'):
-                links.append(f"Website: {personal_info['website']}")
-
-            if links:
-                story.append(Paragraph(" • ".join(links), self.styles['ContactInfo']))
-            
-            # Add some space after header
-            story.append(Spacer(1, 0.2*inch))
-
-            # Professional Summary
-            if content.get('professional_summary'):
-                story.append(
-                    Paragraph("PROFESSIONAL SUMMARY",
-                              self.styles['SectionHeader']))
-                story.append(
-                    Paragraph(content['professional_summary'],
-                              self.styles['Normal']))
-                story.append(Spacer(1, 0.1 * inch))
-
-            # Work Experience
-            if content.get('work_experience'):
-                story.append(
-                    Paragraph("PROFESSIONAL EXPERIENCE",
-                              self.styles['SectionHeader']))
-
-                for exp in content['work_experience']:
-                    # Job title and company
-                    job_title = f"{exp['job_title']} - {exp['company']}"
-                    story.append(Paragraph(job_title, self.styles['JobTitle']))
-
-                    # Date and location
-                    date_location = f"{exp['start_date']} to {exp['end_date']}"
-                    if exp.get('location'):
-                        date_location += f" • {exp['location']}"
-                    story.append(
-                        Paragraph(date_location, self.styles['CompanyInfo']))
-
-                    # Job description bullets
-                    if 'enhanced_description' in exp:
-                        for bullet in exp['enhanced_description']:
-                            story.append(
-                                Paragraph(f"• {bullet}",
-                                          self.styles['BulletPoint']))
-                    else:
-                        story.append(
-                            Paragraph(f"• {exp['description']}",
-                                      self.styles['BulletPoint']))
-
-                    story.append(Spacer(1, 0.1 * inch))
-
-            # Education
-            if content.get('education'):
-                story.append(
-                    Paragraph("EDUCATION", self.styles['SectionHeader']))
-
-                for edu in content['education']:
-                    degree_info = f"{edu['degree']}"
-                    if edu.get('major'):
-                        degree_info += f" in {edu['major']}"
-                    story.append(
-                        Paragraph(degree_info, self.styles['JobTitle']))
-
-                    school_info = f"{edu['school']} • {edu['graduation_date']}"
-                    if edu.get('location'):
-                        school_info += f" • {edu['location']}"
-                    story.append(
-                        Paragraph(school_info, self.styles['CompanyInfo']))
-
-                    if edu.get('gpa'):
-                        story.append(
-                            Paragraph(f"GPA: {edu['gpa']}",
-                                      self.styles['Normal']))
-
-                    if edu.get('achievements'):
-                        story.append(
-                            Paragraph(f"• {edu['achievements']}",
-                                      self.styles['BulletPoint']))
-
-                    story.append(Spacer(1, 0.1 * inch))
-
-            # Skills
-            if content.get('skills'):
-                story.append(Paragraph("SKILLS", self.styles['SectionHeader']))
-
-                for category, skills_list in content['skills'].items():
-                    if skills_list:
-                        skills_text = f"<b>{category}:</b> {', '.join(skills_list)}"
-                        story.append(
-                            Paragraph(skills_text, self.styles['Normal']))
-                        story.append(Spacer(1, 0.05 * inch))
+            if outline is None:
+                outline = self.resume_outline(resume_data['content'])
+            styles = self.styles_for_template(resume_data.get('template') or 'Professional')
+            story = [Spacer(1, value) if style is None else Paragraph(value, styles[style])
+                     for style, value in outline]
 
             # Build PDF
-            doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
+            return self._build(doc, story, buffer, 'resume')
 
         except Exception as e:
             raise Exception(f"Failed to generate resume PDF: {str(e)}")
 
+    @staticmethod
+    def resume_outline(content):
+        """The template-independent part of a resume PDF
+
+        A list of (style name, text) paragraphs and (None, height) spacers,
+        in page order. It is plain data, so it can be built once and sent to
+        other processes to be rendered with each template's styles.
+        """
+        outline = []
+
+        # Header - Name and Contact Info (always include this)
+        personal_info = content.get('personal_info', {})
+        first_name = personal_info.get('first_name', 'Name')
+        last_name = personal_info.get('last_name', 'Not Provided')
+        name = f"{first_name} {last_name}"
+        outline.append(('CustomHeader', name))
+
+        # Contact information (always include this)
+        contact_parts = []
+        if personal_info.get('email'):
+            contact_parts.append(personal_info['email'])
+        if personal_info.get('phone'):
+            contact_parts.append(personal_info['phone'])
+        if personal_info.get('location'):
+            contact_parts.append(personal_info['location'])
+
+        if contact_parts:
+            contact_info = " • ".join(contact_parts)
+            outline.append(('ContactInfo', contact_info))
+
+        # Add LinkedIn and other links
+        links = []
+        if personal_info.get('linkedin'):
+            links.append(f"LinkedIn: {personal_info['linkedin']}")
+        if personal_info.get('github'):
+            links.append(f"GitHub: {personal_info['github']}")
+        if personal_info.get('website'):
+            links.append(f"Website: {personal_info['website']}")
+
+        if links:
+            outline.append(('ContactInfo', " • ".join(links)))
+        
+        # Add some space after header
+        outline.append((None, 0.2*inch))
+
+        # Professional Summary
+        if content.get('professional_summary'):
+            outline.append(('SectionHeader', "PROFESSIONAL SUMMARY"))
+            outline.append(('Normal', content['professional_summary']))
+            outline.append((None, 0.1 * inch))
+
+        # Work Experience
+        if content.get('work_experience'):
+            outline.append(('SectionHeader', "PROFESSIONAL EXPERIENCE"))
+
+            for exp in content['work_experience']:
+                # Job title and company
+                job_title = f"{exp['job_title']} - {exp['company']}"
+                outline.append(('JobTitle', job_title))
+
+                # Date and location
+                date_location = f"{exp['start_date']} to {exp['end_date']}"
+                if exp.get('location'):
+                    date_location += f" • {exp['location']}"
+                outline.append(('CompanyInfo', date_location))
+
+                # Job description bullets
+                if 'enhanced_description' in exp:
+                    for bullet in exp['enhanced_description']:
+                        outline.append(('BulletPoint', f"• {bullet}"))
+                else:
+                    outline.append(('BulletPoint', f"• {exp['description']}"))
+
+                outline.append((None, 0.1 * inch))
+
+        # Education
+        if content.get('education'):
+            outline.append(('SectionHeader', "EDUCATION"))
+
+            for edu in content['education']:
+                degree_info = f"{edu['degree']}"
+                if edu.get('major'):
+                    degree_info += f" in {edu['major']}"
+                outline.append(('JobTitle', degree_info))
+
+                school_info = f"{edu['school']} • {edu['graduation_date']}"
+                if edu.get('location'):
+                    school_info += f" • {edu['location']}"
+                outline.append(('CompanyInfo', school_info))
+
+                if edu.get('gpa'):
+                    outline.append(('Normal', f"GPA: {edu['gpa']}"))
+
+                if edu.get('achievements'):
+                    outline.append(('BulletPoint', f"• {edu['achievements']}"))
+
+                outline.append((None, 0.1 * inch))
+
+        # Skills
+        if content.get('skills'):
+            outline.append(('SectionHeader', "SKILLS"))
+
+            for category, skills_list in content['skills'].items():
+                if skills_list:
+                    skills_text = f"<b>{category}:</b> {', '.join(skills_list)}"
+                    outline.append(('Normal', skills_text))
+                    outline.append((None, 0.05 * inch))
+
+
+        return outline
+
     def generate_cover_letter_pdf(self, cover_letter_data):
         """Generate PDF for cover letter"""
         try:
@@ -245,9 +302,7 @@ class PDFGenerator:
                     story.append(Spacer(1, 0.1 * inch))
 
             # Build PDF
-            doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
+            return self._build(doc, story, buffer, 'cover_letter')
 
         except Exception as e:
             raise Exception(f"Failed to generate cover letter PDF: {str(e)}")
@@ -297,9 +352,77 @@ class PDFGenerator:
                 # Continue with rest of resume content...
                 # (Implementation similar to generate_resume_pdf)
 
-            doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
+            return self._build(doc, story, buffer, 'portfolio')
 
         except Exception as e:
             raise Exception(f"Failed to generate portfolio PDF: {str(e)}")
+
+
+def _render_resume_template(content, outline, template_name):
+    """Process pool task: render one template of a resume from a shared outline"""
+    return PDFGenerator().generate_resume_pdf({'content': content, 'template': template_name}, outline)
+
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _get_render_pool():
+    """Process pool for template renders, started on first use and kept for later sets
+
+    PDF_RENDER_WORKERS sets its size (default: one per CPU, at most one per
+    template); 1 renders in the calling process instead.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            workers = int(os.getenv('PDF_RENDER_WORKERS', '0')) or min(os.cpu_count() or 1,
+                                                                       len(get_available_templates()))
+            if workers > 1:
+                # Spawned, not forked: a fork of the threaded app can inherit a held lock and hang
+                _render_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _render_pool
+
+
+def _discard_render_pool(pool):
+    """Stop using a pool whose renders timed out; the next set starts a fresh one
+
+    shutdown alone leaves a stuck worker running, so the workers are killed
+    first (the executor has no public way to do that before Python 3.14).
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is pool:
+            _render_pool = None
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def render_all_templates(resume_data, template_names=None):
+    """Render one generated resume with every template, in parallel
+
+    Returns {template name: PDF bytes} in template order. The outline is
+    built once and each template is rendered in the process pool, so a full
+    set takes about as long as a single render when there are enough CPUs.
+    A set that takes longer than PDF_RENDER_TIMEOUT seconds (default 60)
+    fails instead of waiting forever.
+    """
+    template_names = list(template_names or get_available_templates())
+    content = resume_data['content']
+    start = time.perf_counter()
+    with tracing.span('pdf.render_all_templates', templates=len(template_names)):
+        outline = PDFGenerator.resume_outline(content)
+        pool = _get_render_pool()
+        if pool is None:
+            pdfs = [_render_resume_template(content, outline, name) for name in template_names]
+        else:
+            futures = [pool.submit(_render_resume_template, content, outline, name) for name in template_names]
+            deadline = time.monotonic() + float(os.getenv('PDF_RENDER_TIMEOUT', '60'))
+            try:
+                pdfs = [future.result(timeout=max(0, deadline - time.monotonic())) for future in futures]
+            except FuturesTimeoutError:
+                _discard_render_pool(pool)
+                raise Exception("Failed to render templates: timed out waiting for the render processes")
+    metrics.observe('pdf_template_set_duration_seconds', time.perf_counter() - start)
+    return dict(zip(template_names, pdfs))
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+import metrics
+import tracing
+from storage import get_data_path
+
+_WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# Universal hashing modulo a prime just above 2**32 (shingle hashes are CRC32s)
+_PRIME = np.uint64(4294967311)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    metadata TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket TEXT NOT NULL,
+    posting_id TEXT NOT NULL,
+    PRIMARY KEY (bucket, posting_id)
+);
+CREATE TABLE IF NOT EXISTS results (
+    posting_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (posting_id, kind, owner)
+);
+"""
+
+
+def normalize_posting(text):
+    """Lowercase words of a job description, without punctuation or layout"""
+    return _WORD_PATTERN.findall((text or '').lower())
+
+
+def posting_id(text):
+    """Identity of a job description; whitespace, case and punctuation don't count"""
+    return hashlib.sha1(' '.join(normalize_posting(text)).encode('utf-8')).hexdigest()
+
+
+def shingles(text, size=3):
+    """The set of overlapping word n-grams in a job description"""
+    words = normalize_posting(text)
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class PostingIndex:
+    """MinHash/LSH index of job descriptions, persisted in SQLite
+
+    Each posting gets a MinHash signature of its word 3-grams, split into
+    bands; postings that share any band bucket are candidates, and their
+    signatures estimate the Jaccard similarity. Lookups only read the
+    candidate rows, so they stay fast however many postings are stored.
+
+    Results generated for a posting (a cover letter, a job match analysis)
+    are stored next to it by kind and owner, so a near-duplicate posting can
+    reuse them. The owner says whose result it is, e.g. a profile version.
+    """
+
+    def __init__(self, path=None, num_perm=128, bands=16, threshold=0.8, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path or get_data_path('postings.sqlite3')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        # Products of these and 32-bit hashes stay below 2**64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)
+
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def signature(self, text):
+        """MinHash signature of a job description (num_perm unsigned integers)"""
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(text)), dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _buckets(self, signature):
+        """One bucket key per band of the signature"""
+        return [
+            f"{band}:{hashlib.sha1(signature[band * self.rows:(band + 1) * self.rows].tobytes()).hexdigest()[:16]}"
+            for band in range(self.bands)
+        ]
+
+    def add(self, text, **metadata):
+        """Index a job description (no-op if already indexed) and return its id"""
+        key = posting_id(text)
+        signature = self.signature(text)
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO postings (id, signature, metadata, created_at) VALUES (?, ?, ?, ?)",
+                    (key, signature.tobytes(), json.dumps(metadata, default=str), time.time())
+                )
+                if cursor.rowcount:
+                    conn.executemany("INSERT OR IGNORE INTO buckets (bucket, posting_id) VALUES (?, ?)",
+                                     [(bucket, key) for bucket in self._buckets(signature)])
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+        return key
+
+    @tracing.traced('posting_index.query')
+    def query(self, text, threshold=None, limit=5):
+        """Indexed postings similar to a job description, most similar first
+
+        Returns dictionaries with 'id', 'similarity' (estimated Jaccard
+        similarity of the 3-gram sets, 1.0 for the same text) and 'metadata'.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        key = posting_id(text)
+        signature = self.signature(text)
+        buckets = self._buckets(signature)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, signature, metadata FROM postings WHERE id IN "
+                f"(SELECT posting_id FROM buckets WHERE bucket IN ({', '.join('?' * len(buckets))}))",
+                buckets
+            ).fetchall()
+        finally:
+            conn.close()
+
+        matches = []
+        for candidate_id, candidate_signature, metadata in rows:
+            similarity = self._similarity(key, signature, candidate_id, candidate_signature)
+            if similarity >= threshold:
+                matches.append({'id': candidate_id, 'similarity': similarity,
+                                'metadata': json.loads(metadata) if metadata else {}})
+        matches.sort(key=lambda match: -match['similarity'])
+        return matches[:limit]
+
+    def _similarity(self, key, signature, candidate_id, candidate_signature):
+        """Estimated Jaccard similarity of a posting to a stored candidate (1.0 for the same text)"""
+        if candidate_id == key:
+            return 1.0
+        return float(np.mean(np.frombuffer(candidate_signature, dtype=np.uint64) == signature))
+
+    def store_result(self, text, kind, owner, result, **metadata):
+        """Index a job description and keep a result generated for it"""
+        key = self.add(text, **metadata)
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO results (posting_id, kind, owner, result, created_at) "
+                         "VALUES (?, ?, ?, ?, ?)", (key, kind, owner, json.dumps(result, default=str), time.time()))
+        finally:
+            conn.close()
+        return key
+
+    @tracing.traced('posting_index.find_result')
+    def find_result(self, text, kind, owner, threshold=None):
+        """The stored result of the most similar near-duplicate posting, or None
+
+        Only candidates that have a result of this kind and owner are
+        compared, so a match can't be crowded out by near-duplicates stored
+        for someone else. Returns a dictionary with 'posting_id',
+        'similarity', 'metadata' and 'result'.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        key = posting_id(text)
+        signature = self.signature(text)
+        buckets = self._buckets(signature)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT postings.id, postings.signature, postings.metadata, results.result "
+                "FROM postings JOIN results ON results.posting_id = postings.id "
+                "WHERE results.kind = ? AND results.owner = ? AND postings.id IN "
+                f"(SELECT posting_id FROM buckets WHERE bucket IN ({', '.join('?' * len(buckets))}))",
+                [kind, owner] + buckets
+            ).fetchall()
+        finally:
+            conn.close()
+
+        best = None
+        for candidate_id, candidate_signature, metadata, result in rows:
+            similarity = self._similarity(key, signature, candidate_id, candidate_signature)
+            if similarity >= threshold and (best is None or similarity > best['similarity']):
+                best = {'posting_id': candidate_id, 'similarity': similarity,
+                        'metadata': json.loads(metadata) if metadata else {}, 'result': result}
+
+        if best is None:
+            metrics.increment('llm_cache_misses_total', cache='near_duplicate', task=kind)
+            return None
+        metrics.increment('llm_cache_hits_total', cache='near_duplicate', task=kind)
+        best['result'] = json.loads(best['result'])
+        return best
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_posting_index():
+    """Return the index stored in the local data directory"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PostingIndex()
+        return _index
@@ -0,0 +1,111 @@
+import cProfile
+import os
+import re
+import threading
+import time
+import tracemalloc
+
+from storage import get_data_path
+
+PROFILE_MODES = ('cpu', 'memory')
+
+# Only one profiler can be active per process, so concurrent sessions take turns
+_profile_lock = threading.Lock()
+
+
+def profiling_mode(query_params=None):
+    """Return the profiling mode for this render ('cpu', 'memory') or None
+
+    APP_PROFILE=cpu|memory profiles every page render. A ?profile=cpu|memory
+    query parameter profiles a single render, but only when APP_PROFILE_QUERY=1,
+    so visitors can't switch it on in production by default.
+    """
+    mode = os.getenv('APP_PROFILE', '').lower()
+    if mode in PROFILE_MODES:
+        return mode
+
+    if query_params is not None and os.getenv('APP_PROFILE_QUERY') == '1':
+        mode = str(query_params.get('profile', '')).lower()
+        if mode in PROFILE_MODES:
+            return mode
+    return None
+
+
+def _profile_path(name, extension):
+    """Path for a new profile file, named by time and page"""
+    slug = re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'page'
+    now = time.time()
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now))
+    return get_data_path('profiles', f"{stamp}-{int(now * 1000) % 1000:03d}-{slug}.{extension}")
+
+
+def rotate_profiles(keep=None):
+    """Delete the oldest profile files, keeping the newest `keep` (APP_PROFILE_KEEP, default 50)"""
+    keep = keep if keep is not None else int(os.getenv('APP_PROFILE_KEEP', '50'))
+    directory = os.path.dirname(get_data_path('profiles', 'x'))
+    files = sorted(
+        (os.path.join(directory, name) for name in os.listdir(directory)),
+        key=os.path.getmtime
+    )
+    for path in files[:max(0, len(files) - keep)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _profile_cpu(func, name):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        try:
+            profiler.dump_stats(_profile_path(name, 'prof'))
+        except OSError:
+            pass
+
+
+def _profile_memory(func, name):
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(25)
+    tracemalloc.reset_peak()
+    try:
+        return func()
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+
+        path = _profile_path(name, 'tracemalloc')
+        try:
+            snapshot.dump(path)
+            with open(f"{path}.txt", 'w', encoding='utf-8') as f:
+                f.write(f"current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n\n")
+                for stat in snapshot.statistics('lineno')[:30]:
+                    f.write(f"{stat}\n")
+        except OSError:
+            pass
+
+
+def profile_call(func, name, mode):
+    """Run func under the given profiler and save the result to the profiles directory
+
+    'cpu' writes a cProfile .prof file (open it with pstats or snakeviz);
+    'memory' writes a tracemalloc snapshot plus a text summary of the top
+    allocations and the peak. Old files are rotated away.
+    """
+    if mode not in PROFILE_MODES or not _profile_lock.acquire(blocking=False):
+        # Not profiling, or another session is being profiled right now
+        return func()
+
+    try:
+        if mode == 'cpu':
+            return _profile_cpu(func, name)
+        return _profile_memory(func, name)
+    finally:
+        _profile_lock.release()
+        rotate_profiles()
@@ -0,0 +1,163 @@
+import json
+import re
+
+import metrics
+import tracing
+
+# Rough per-task input budgets (in tokens) for the prompts we send to Gemini
+TASK_BUDGETS = {
+    'professional_summary': 1500,
+    'enhance_experience': 800,
+    'cover_letter': 2500,
+    'cover_letter_profile': 2000,
+    'cover_letter_job': 2000,
+    'industry_customization': 1500,
+    'job_match': 2500,
+    'suggest_improvements': 3000,
+    'default': 2000
+}
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text):
+    """Estimate the number of model tokens in a piece of text without calling the API"""
+    if not text:
+        return 0
+
+    # Words and punctuation are roughly one token each, long words split into several
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        tokens += 1 + len(match.group()) // 6
+    return tokens
+
+
+def drop_empty_fields(data):
+    """Recursively remove empty strings, lists, dicts and None values"""
+    if isinstance(data, dict):
+        cleaned = {k: drop_empty_fields(v) for k, v in data.items()}
+        return {k: v for k, v in cleaned.items() if v not in (None, '', [], {})}
+    if isinstance(data, list):
+        cleaned = [drop_empty_fields(item) for item in data]
+        return [item for item in cleaned if item not in (None, '', [], {})]
+    return data
+
+
+def compact_json(data):
+    """Serialize data as compact JSON with empty fields removed"""
+    return json.dumps(drop_empty_fields(data), separators=(',', ':'), ensure_ascii=False)
+
+
+class PromptBuilder:
+    """Build a prompt from a template and prioritised sections under a token budget
+
+    Sections are filled into the template by name. When the prompt is over
+    budget the lowest-priority sections are trimmed first: list sections lose
+    their trailing items, text sections are truncated.
+    """
+
+    def __init__(self, task, budget=None):
+        self.task = task
+        self.budget = budget or TASK_BUDGETS.get(task, TASK_BUDGETS['default'])
+        self.sections = {}
+
+    def add_text(self, name, text, priority=0):
+        """Add a free-text section"""
+        self.sections[name] = {'kind': 'text', 'value': text or '', 'priority': priority}
+        return self
+
+    def add_list(self, name, items, priority=0, separator=None):
+        """Add a list section, serialized as compact JSON unless a separator is given"""
+        self.sections[name] = {
+            'kind': 'list',
+            'value': list(items or []),
+            'priority': priority,
+            'separator': separator
+        }
+        return self
+
+    def add_data(self, name, data, priority=0):
+        """Add a structured section serialized as compact JSON"""
+        self.sections[name] = {'kind': 'data', 'value': data, 'priority': priority}
+        return self
+
+    def _render_section(self, section):
+        """Render a single section to text"""
+        if section['kind'] == 'text':
+            return section['value']
+        if section['kind'] == 'list':
+            if section['separator'] is not None:
+                return section['separator'].join(str(item) for item in section['value'] if item)
+            return compact_json(section['value'])
+        return compact_json(section['value']) if section['value'] is not None else ''
+
+    def _trim_section(self, section, excess_tokens):
+        """Shrink a section by roughly excess_tokens, returning True if anything changed"""
+        if section['kind'] == 'list' and section['value']:
+            section['value'] = section['value'][:-1]
+            return True
+
+        if section['kind'] == 'text' and section['value']:
+            text = section['value']
+            current = estimate_tokens(text)
+            keep_ratio = max(0.0, (current - excess_tokens) / current) if current else 0.0
+            new_length = int(len(text) * keep_ratio)
+            if new_length >= len(text):
+                new_length = len(text) - 1
+            trimmed = text[:new_length].rsplit(' ', 1)[0] + '...' if new_length > 0 else ''
+            # The ellipsis can make a text that is down to one word longer; every trim must
+            # shorten it, or build would never finish
+            section['value'] = trimmed if len(trimmed) < len(text) else ''
+            return True
+
+        if section['kind'] == 'data' and section['value'] is not None:
+            section['value'] = None
+            return True
+
+        return False
+
+    @tracing.traced('prompt.build')
+    def build(self, template, **fixed):
+        """Fill the template with the sections, trimming until it fits the budget
+
+        Keyword arguments are filled in as-is and are never trimmed.
+        """
+        rendered = {name: self._render_section(section) for name, section in self.sections.items()}
+        rendered.update(fixed)
+        prompt = template.format(**rendered)
+
+        # Trim lowest priority first
+        trim_order = sorted(self.sections, key=lambda name: self.sections[name]['priority'])
+        for name in trim_order:
+            while estimate_tokens(prompt) > self.budget:
+                excess = estimate_tokens(prompt) - self.budget
+                if not self._trim_section(self.sections[name], excess):
+                    break
+                rendered[name] = self._render_section(self.sections[name])
+                prompt = template.format(**rendered)
+
+            if estimate_tokens(prompt) <= self.budget:
+                break
+
+        return prompt
+
+
+def record_token_usage(usage_log, task, prompt, response):
+    """Append prompt and response token counts for one LLM call to usage_log
+
+    Uses the counts reported by the backend and falls back to local estimates.
+    """
+    response_text = getattr(response, 'text', None) or ''
+    prompt_tokens = getattr(response, 'prompt_tokens', None)
+    response_tokens = getattr(response, 'response_tokens', None)
+
+    entry = {
+        'task': task,
+        'prompt_tokens': prompt_tokens if prompt_tokens is not None else estimate_tokens(prompt),
+        'response_tokens': response_tokens if response_tokens is not None else estimate_tokens(response_text),
+        'estimated': prompt_tokens is None
+    }
+    usage_log.append(entry)
+    metrics.increment('llm_tokens_total', entry['prompt_tokens'], task=task, kind='prompt')
+    metrics.increment('llm_tokens_total', entry['response_tokens'], task=task, kind='response')
+    return entry
@@ -0,0 +1,287 @@
+import argparse
+import glob
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+import metrics
+import tracing
+from job_match import normalize_skill
+from relevance import experience_text, tokenize
+from skill_matcher import get_skill_matcher
+
+
+def load_profiles(paths):
+    """Read exported profiles (the export_user_data JSON) from files and directories
+
+    A file may hold one profile or a list of them; directories are searched
+    for *.json files.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.json'))))
+        else:
+            files.append(path)
+
+    profiles = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        profiles.extend(data if isinstance(data, list) else [data])
+    return profiles
+
+
+def profile_name(profile):
+    """Display name of a profile"""
+    info = profile.get('personal_info') or {}
+    name = f"{info.get('first_name', '')} {info.get('last_name', '')}".strip()
+    return name or info.get('email') or 'Unnamed candidate'
+
+
+def profile_text(profile):
+    """Everything searchable in a profile as one text"""
+    info = profile.get('personal_info') or {}
+    parts = [info.get('professional_summary', '')]
+    parts.extend(experience_text(exp) for exp in profile.get('work_experience') or [])
+    parts.extend(f"{edu.get('degree', '')} {edu.get('major', '')}" for edu in profile.get('education') or [])
+    parts.extend(skill.get('name', '') for skill in profile.get('skills') or [])
+    return ' '.join(part for part in parts if part)
+
+
+# Words as written, for the skills that only count with exact capitalisation
+_EXACT_WORD = re.compile(r"[A-Za-z0-9+#]+")
+
+
+@lru_cache(maxsize=1)
+def _skill_lookup():
+    """Taxonomy terms (names and aliases) -> normalized canonical skill, split for fast lookups
+
+    Returns the one-word terms, the longer terms, the first words of the
+    longer terms, and the terms that only count with exact capitalisation
+    ("Go", "REST", "Excel") by spelling, since the rest is looked up lowercased.
+    """
+    matcher = get_skill_matcher()
+    terms = {term: normalize_skill(skill) for term, skill in matcher.canonical.items()
+             if term not in matcher.case_sensitive}
+    words = {term: skill for term, skill in terms.items() if ' ' not in term}
+    phrases = {term: skill for term, skill in terms.items() if ' ' in term}
+    exact = {spelling: normalize_skill(matcher.canonical[term]) for term, spelling in matcher.case_sensitive.items()}
+    return words, phrases, frozenset(term.split(' ')[0] for term in phrases), exact
+
+
+@lru_cache(maxsize=4096)
+def _canonical_skill(name):
+    """Normalized canonical name of a listed skill, e.g. 'JS (Advanced)' -> 'javascript'"""
+    name = re.sub(r'\(.*?\)', '', name).strip()
+    return normalize_skill(get_skill_matcher().canonicalize(name)) if name else ''
+
+
+def profile_skills(profile, tokens=None):
+    """Normalized skills of a profile: the ones listed plus the ones its text mentions
+
+    Listed skills are canonicalized with the bundled taxonomy, as in
+    score_job_match, so "JS" and "JavaScript" count as the same skill.
+    Mentions are found by looking up the profile's words (and the phrases
+    starting at them), which is much faster than scanning with the matcher.
+    """
+    words, phrases, first_words, exact = _skill_lookup()
+    text = profile_text(profile)
+    tokens = tokens if tokens is not None else tokenize(text)
+
+    skills = {_canonical_skill(skill.get('name') or '') for skill in profile.get('skills') or []}
+    skills.update(words[token] for token in words.keys() & set(tokens))
+    for i, token in enumerate(tokens):
+        if token in first_words:
+            for n in (2, 3):
+                skill = phrases.get(' '.join(tokens[i:i + n]))
+                if skill:
+                    skills.add(skill)
+    skills.update(exact[word] for word in exact.keys() & set(_EXACT_WORD.findall(text)))
+    skills.discard('')
+    return skills
+
+
+def job_skills(job_description):
+    """Skills a job description asks for as (normalized, name, weight), most mentioned first"""
+    required = get_skill_matcher().count(job_description or '')
+    return [(normalize_skill(skill), skill, 1 + math.log(count)) for skill, count in required.most_common()]
+
+
+def index_rows(rows, vocabulary=None):
+    """Vocabulary and (row, column, value) arrays for a list of {term: value} rows
+
+    Pass a vocabulary to index the rows onto the same columns as another
+    matrix; new terms are added to it.
+    """
+    vocabulary = {} if vocabulary is None else vocabulary
+    row_ids, col_ids, values = [], [], []
+    for row, terms in enumerate(rows):
+        for term, value in terms.items():
+            row_ids.append(row)
+            col_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+            values.append(value)
+    return vocabulary, row_ids, col_ids, values
+
+
+class CandidateRanker:
+    """Rank many candidate profiles against job descriptions with sparse matrix products
+
+    The profiles are turned into two sparse matrices once: BM25-weighted
+    term frequencies (profiles x terms) and normalized skills (profiles x
+    skills, boolean). Scoring a job is then one sparse matrix-vector product
+    each, so thousands of profiles rank in milliseconds.
+
+    The score blends skill coverage (the share of the job's weighted skills a
+    candidate has) with BM25 text relevance scaled to the best candidate.
+    Jobs that mention no known skills are ranked on text relevance alone.
+    """
+
+    def __init__(self, profiles, k1=1.5, b=0.75, skill_weight=0.6):
+        self.profiles = list(profiles)
+        self.skill_weight = skill_weight
+
+        with tracing.span('recruiter.index', profiles=len(self.profiles)):
+            # BM25 weights of every (profile, term) pair; only the query side changes per job
+            tokens = [tokenize(profile_text(profile)) for profile in self.profiles]
+            self.vocabulary, rows, cols, values = index_rows([Counter(profile_tokens) for profile_tokens in tokens])
+            shape = (len(self.profiles), max(len(self.vocabulary), 1))
+            tf = sparse.csr_matrix((np.asarray(values, dtype=np.float64), (rows, cols)), shape=shape)
+
+            lengths = np.asarray(tf.sum(axis=1)).ravel()
+            average = lengths.mean() if len(lengths) and lengths.mean() else 1.0
+            document_frequency = np.bincount(tf.indices, minlength=shape[1])
+            idf = np.log(1 + (shape[0] - document_frequency + 0.5) / (document_frequency + 0.5))
+
+            # tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / average)), scaled by idf
+            norms = np.repeat(k1 * (1 - b + b * lengths / average), np.diff(tf.indptr))
+            weights = tf.copy()
+            weights.data = idf[tf.indices] * tf.data * (k1 + 1) / (tf.data + norms)
+            self.term_weights = weights
+
+            self.skill_sets = [profile_skills(profile, profile_tokens)
+                               for profile, profile_tokens in zip(self.profiles, tokens)]
+            self.skill_vocabulary, rows, cols, values = index_rows(
+                [dict.fromkeys(skills, 1.0) for skills in self.skill_sets]
+            )
+            self.skills = sparse.csr_matrix(
+                (np.asarray(values, dtype=np.float32), (rows, cols)),
+                shape=(len(self.profiles), max(len(self.skill_vocabulary), 1))
+            )
+
+    def _query_vector(self, vocabulary, weights, size):
+        """Sparse column vector of a job's {term: weight}, ignoring terms no profile has"""
+        entries = [(vocabulary[term], weight) for term, weight in weights.items() if term in vocabulary]
+        if not entries:
+            return None
+        cols, values = zip(*entries)
+        return sparse.csr_matrix((values, (cols, [0] * len(cols))), shape=(size, 1))
+
+    def score(self, job_description):
+        """Scores of every profile against a job, as (total, skill coverage, text relevance) arrays in [0, 1]"""
+        count = len(self.profiles)
+
+        query = self._query_vector(self.vocabulary, Counter(tokenize(job_description)), self.term_weights.shape[1])
+        text = np.asarray((self.term_weights @ query).todense()).ravel() if query is not None else np.zeros(count)
+        if text.max(initial=0) > 0:
+            text = text / text.max()
+
+        required = {skill: weight for skill, _, weight in job_skills(job_description)}
+        if not required:
+            return text, np.zeros(count), text
+        query = self._query_vector(self.skill_vocabulary, required, self.skills.shape[1])
+        matched = np.asarray((self.skills @ query).todense()).ravel() if query is not None else np.zeros(count)
+        coverage = matched / sum(required.values())
+
+        return self.skill_weight * coverage + (1 - self.skill_weight) * text, coverage, text
+
+    def rank(self, job_description, top_k=10):
+        """The top_k profiles for a job, best first
+
+        Each result has the profile's 'index' and 'name', its 'score',
+        'skill_coverage' and 'text_relevance', and the job's skills it has
+        ('matching_skills') and lacks ('missing_skills').
+        """
+        start = time.perf_counter()
+        with tracing.span('recruiter.rank', profiles=len(self.profiles), top_k=top_k):
+            total, coverage, text = self.score(job_description)
+            top_k = min(top_k, len(total))
+            if not top_k:
+                return []
+            best = np.argpartition(-total, top_k - 1)[:top_k]
+            best = best[np.lexsort((best, -total[best]))]
+
+            required = job_skills(job_description)
+            results = []
+            for index in best:
+                skills = self.skill_sets[index]
+                results.append({
+                    'index': int(index),
+                    'name': profile_name(self.profiles[index]),
+                    'score': round(float(total[index]) * 100, 1),
+                    'skill_coverage': round(float(coverage[index]) * 100, 1),
+                    'text_relevance': round(float(text[index]) * 100, 1),
+                    'matching_skills': [name for skill, name, _ in required if skill in skills],
+                    'missing_skills': [name for skill, name, _ in required if skill not in skills]
+                })
+        metrics.observe('recruiter_rank_duration_seconds', time.perf_counter() - start)
+        return results
+
+    def analyze_top(self, job_description, ranked, generator=None, max_concurrency=None):
+        """Run the LLM job match analysis on ranked candidates only, adding it as 'analysis'"""
+        if generator is None:
+            from cover_letter_generator import CoverLetterGenerator
+            generator = CoverLetterGenerator()
+        max_concurrency = max_concurrency or int(os.getenv('LLM_MAX_CONCURRENCY', '1'))
+
+        def analyze(result):
+            return dict(result, analysis=generator.analyze_job_match(self.profiles[result['index']], job_description))
+
+        if max_concurrency <= 1 or len(ranked) <= 1:
+            return [analyze(result) for result in ranked]
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(ranked))) as executor:
+            return list(executor.map(tracing.bind(analyze), ranked))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank exported candidate profiles against a job description")
+    parser.add_argument('job', help="text file with the job description")
+    parser.add_argument('profiles', nargs='+', help="profile JSON files or directories of them")
+    parser.add_argument('--top-k', type=int, default=10, help="how many candidates to list")
+    parser.add_argument('--analyze', action='store_true', help="run the LLM job match analysis on the top candidates")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args()
+
+    with open(args.job, 'r', encoding='utf-8') as f:
+        job_description = f.read()
+    profiles = load_profiles(args.profiles)
+
+    start = time.perf_counter()
+    ranker = CandidateRanker(profiles)
+    indexed = time.perf_counter()
+    ranked = ranker.rank(job_description, args.top_k)
+    ranked_at = time.perf_counter()
+    if args.analyze:
+        ranked = ranker.analyze_top(job_description, ranked)
+
+    if args.json:
+        print(json.dumps(ranked, indent=2))
+        return
+    print(f"{len(profiles)} profiles indexed in {(indexed - start) * 1000:.0f}ms, "
+          f"ranked in {(ranked_at - indexed) * 1000:.1f}ms")
+    for position, result in enumerate(ranked, 1):
+        print(f"{position:3d}. {result['name']:<30} score={result['score']:5.1f}  "
+              f"skills={result['skill_coverage']:5.1f}%  text={result['text_relevance']:5.1f}  "
+              f"missing: {', '.join(result['missing_skills'][:5]) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
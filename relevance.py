@@ -0,0 +1,88 @@
+import math
+import re
+from collections import Counter
+
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
+    'we', 'you', 'our', 'your', 'as', 'from', 'it', 'its', 'all', 'who'
+})
+
+
+def tokenize(text):
+    """Lowercase and split text into search terms, dropping stop words"""
+    if not text:
+        return []
+    return [word for word in _WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+class BM25Ranker:
+    """Okapi BM25 ranking over a small in-memory collection of documents"""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_terms = [Counter(tokenize(doc)) for doc in documents]
+        self.doc_lengths = [sum(terms.values()) for terms in self.doc_terms]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0
+
+        document_frequency = Counter()
+        for terms in self.doc_terms:
+            document_frequency.update(terms.keys())
+
+        total = len(self.doc_terms)
+        self.idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_frequency.items()
+        }
+
+    def scores(self, query):
+        """Score every document against the query"""
+        query_terms = Counter(tokenize(query))
+        results = []
+
+        for terms, length in zip(self.doc_terms, self.doc_lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            for term, query_count in query_terms.items():
+                freq = terms.get(term)
+                if not freq:
+                    continue
+                score += query_count * self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+
+        return results
+
+    def top_k(self, query, k):
+        """Return indices of the k best-scoring documents, best first"""
+        doc_scores = self.scores(query)
+        ranked = sorted(range(len(doc_scores)), key=lambda i: (-doc_scores[i], i))
+        return ranked[:k]
+
+
+def select_relevant(items, texts, query, k, keep_order=True):
+    """Pick the k items whose texts are most relevant to the query
+
+    Falls back to the first k items when there is no query. With keep_order the
+    selected items keep their original order (e.g. most recent job first).
+    """
+    if len(items) <= k:
+        return list(items)
+    if not query or not query.strip():
+        return list(items[:k])
+
+    chosen = BM25Ranker(texts).top_k(query, k)
+    if keep_order:
+        chosen = sorted(chosen)
+    return [items[i] for i in chosen]
+
+
+def experience_text(exp):
+    """Flatten a work experience entry into searchable text"""
+    parts = [exp.get('job_title', ''), exp.get('company', ''), exp.get('description', '')]
+    parts.extend(exp.get('enhanced_description') or [])
+    return ' '.join(part for part in parts if part)
@@ -1,33 +1,113 @@
+import hashlib
 import json
 import os
-from google import genai
-from google.genai import types
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from prompt_builder import PromptBuilder, record_token_usage
+from llm_backend import generate_with_retries, get_backend
+import metrics
+import tracing
+
+def content_hash(data):
+    """Stable hash of JSON-serializable data"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def experience_hash(exp):
+    """Hash of the fields an experience's enhanced bullets are generated from"""
+    return content_hash([exp.get('job_title'), exp.get('company'), exp.get('description')])
+
+# Events yielded by iter_generate_resume, in the order they first occur
+SUMMARY_READY = 'summary_ready'
+EXPERIENCE_ENHANCED = 'experience_enhanced'
+SKILLS_ORGANIZED = 'skills_organized'
+DONE = 'done'
+
+# completed/total count the finished steps (summary, each experience, skills)
+ResumeEvent = namedtuple('ResumeEvent', ['type', 'data', 'completed', 'total', 'message'])
 
 class ResumeGenerator:
-    def __init__(self):
-        # Using Google Gemini AI which offers better free tier options
-        # Note that the newest Gemini model series is "gemini-2.5-flash" or gemini-2.5-pro"
-        # do not change this unless explicitly requested by the user
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise Exception("GEMINI_API_KEY environment variable is required. Get your free key at https://makersuite.google.com/app/apikey")
-        self.client = genai.Client(api_key=api_key)
-        self.model = "gemini-2.5-flash"
+    def __init__(self, backend=None, max_concurrency=None, enhancement_cache=None):
+        # Gemini by default; pass a backend (or set LLM_BACKEND=fake) to run offline
+        self.backend = backend or get_backend()
+        # Optional shared store of enhanced bullets (see enhancement_cache.py)
+        self.enhancement_cache = enhancement_cache
+        self.token_usage = []
+        self.retries = 3
+        self.retry_backoff = 1.0
+        # How many experiences are enhanced at once (1 keeps calls sequential)
+        self.max_concurrency = max_concurrency or int(os.getenv('LLM_MAX_CONCURRENCY', '1'))
+    
+    def _call_llm(self, task, prompt, json_response=False):
+        """Send a prompt to the LLM backend and record its prompt and response token counts"""
+        response = generate_with_retries(
+            self.backend, prompt, json_response=json_response,
+            retries=self.retries, backoff=self.retry_backoff, task=task
+        )
+        record_token_usage(self.token_usage, task, prompt, response)
+        return response
+    
+    @tracing.traced('resume.generate')
+    def generate_resume(self, user_data, template_name, previous_resume=None, on_event=None):
+        """Generate a complete resume using AI
+
+        on_event, if given, is called with each ResumeEvent as it happens
+        (see iter_generate_resume).
+        
+        previous_resume is the content of an earlier generate_resume result.
+        When given, only new or changed experiences are enhanced again and the
+        summary is only rewritten if its inputs changed; the rest is reused.
+        """
+        for event in self.iter_generate_resume(user_data, template_name, previous_resume):
+            if on_event:
+                on_event(event)
+        return event.data
     
-    def generate_resume(self, user_data, template_name):
-        """Generate a complete resume using AI"""
+    def iter_generate_resume(self, user_data, template_name, previous_resume=None):
+        """Generate a resume step by step, yielding a ResumeEvent as each section is ready
+
+        Yields SUMMARY_READY (data is the summary text), EXPERIENCE_ENHANCED
+        once per experience in the order they finish (data is {'index',
+        'experience'}), SKILLS_ORGANIZED (data is the skills by category) and
+        finally DONE, whose data is the same content generate_resume returns.
+        """
+        self.backend.record_input('generate_resume', {
+            'user_data': user_data, 'template_name': template_name, 'previous_resume': previous_resume
+        })
         try:
-            # Generate professional summary if not provided
-            if not user_data['personal_info'].get('professional_summary'):
-                professional_summary = self._generate_professional_summary(user_data)
-            else:
+            previous = previous_resume or {}
+            needs_summary = not user_data['personal_info'].get('professional_summary')
+            total = int(needs_summary) + len(user_data['work_experience']) + 1
+            completed = 0
+            
+            # Generate professional summary if not provided (or reuse it if nothing it is based on changed)
+            summary_hash = content_hash(self._summary_context(user_data)) if needs_summary else None
+            if not needs_summary:
                 professional_summary = user_data['personal_info']['professional_summary']
+                message = "Professional summary provided"
+            elif previous.get('professional_summary') and previous.get('summary_hash') == summary_hash:
+                professional_summary = previous['professional_summary']
+                metrics.increment('llm_cache_hits_total', cache='previous_resume', task='professional_summary')
+                message = "Professional summary unchanged"
+            else:
+                professional_summary = self._generate_professional_summary(user_data)
+                message = "Professional summary written"
+            completed += int(needs_summary)
+            yield ResumeEvent(SUMMARY_READY, professional_summary, completed, total, message)
             
-            # Enhance work experience descriptions
-            enhanced_work_experience = self._enhance_work_experience(user_data['work_experience'])
+            # Enhance work experience descriptions, reporting each as soon as it is done
+            enhanced_work_experience = [None] * len(user_data['work_experience'])
+            for index, enhanced_exp, message in self._iter_enhanced_experience(
+                user_data['work_experience'], previous.get('work_experience')
+            ):
+                enhanced_work_experience[index] = enhanced_exp
+                completed += 1
+                yield ResumeEvent(EXPERIENCE_ENHANCED, {'index': index, 'experience': enhanced_exp},
+                                  completed, total, message)
             
             # Organize skills by category
             organized_skills = self._organize_skills(user_data['skills'])
+            completed += 1
+            yield ResumeEvent(SKILLS_ORGANIZED, organized_skills, completed, total, "Skills organized")
             
             # Create complete resume structure
             resume_content = {
@@ -36,24 +116,30 @@ class ResumeGenerator:
                 'work_experience': enhanced_work_experience,
                 'education': user_data['education'],
                 'skills': organized_skills,
-                'template': template_name
+                'template': template_name,
+                'summary_hash': summary_hash
             }
             
-            return resume_content
+            yield ResumeEvent(DONE, resume_content, completed, total, "Resume ready")
             
         except Exception as e:
             raise Exception(f"Failed to generate resume: {str(e)}")
     
+    def _summary_context(self, user_data):
+        """The parts of the user data the professional summary is written from"""
+        return {
+            'work_experience': user_data.get('work_experience', []),
+            'education': user_data.get('education', []),
+            'skills': [skill['name'] for skill in user_data.get('skills', []) if skill['category'] == 'Technical']
+        }
+    
+    @tracing.traced('resume.professional_summary')
     def _generate_professional_summary(self, user_data):
         """Generate a professional summary based on user's experience and skills"""
         try:
             # Prepare context for AI
             has_work_experience = bool(user_data.get('work_experience'))
-            context = {
-                'work_experience': user_data.get('work_experience', []),
-                'education': user_data.get('education', []),
-                'skills': [skill['name'] for skill in user_data.get('skills', []) if skill['category'] == 'Technical']
-            }
+            context = self._summary_context(user_data)
             
             # Different prompts based on experience level
             if has_work_experience:
@@ -63,93 +149,161 @@ class ResumeGenerator:
                 experience_context = "education, skills, and academic/personal projects"
                 summary_focus = "educational background, technical skills, and potential"
             
-            prompt = f"""
+            # Skills matter most, then experience; education is trimmed first
+            builder = PromptBuilder('professional_summary')
+            builder.add_list('skills', context['skills'], priority=2, separator=', ')
+            if has_work_experience:
+                builder.add_list('work_experience', context['work_experience'], priority=1)
+            else:
+                builder.add_text('work_experience', "No formal work experience yet", priority=1)
+            builder.add_list('education', context['education'], priority=0)
+            
+            prompt = builder.build("""
             Based on the following information, write a compelling professional summary for a resume. 
             The candidate has {experience_context}. Focus on {summary_focus}.
             The summary should be 3-4 sentences, highlight key strengths, and be tailored to the candidate's background.
             
-            Work Experience: {json.dumps(context['work_experience']) if has_work_experience else "No formal work experience yet"}
-            Education: {json.dumps(context['education'])}
-            Key Skills: {', '.join(context['skills'])}
+            Work Experience: {work_experience}
+            Education: {education}
+            Key Skills: {skills}
             
             Write a professional summary that:
-            {"1. Highlights years of experience and key accomplishments" if has_work_experience else "1. Starts with educational level or recent graduate status"}
+            {first_guideline}
             2. Highlights 2-3 key areas of expertise or learning
             3. Mentions relevant skills and potential contributions
             4. Ends with career goals or value proposition
-            {"5. Keep it professional and achievement-focused" if has_work_experience else "5. Focus on potential, enthusiasm, and readiness to contribute"}
+            {last_guideline}
             
             Respond with just the professional summary text, no additional formatting.
-            """
-            
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part(text=prompt)])
-                ]
+            """,
+                experience_context=experience_context,
+                summary_focus=summary_focus,
+                first_guideline=("1. Highlights years of experience and key accomplishments" if has_work_experience
+                                 else "1. Starts with educational level or recent graduate status"),
+                last_guideline=("5. Keep it professional and achievement-focused" if has_work_experience
+                                else "5. Focus on potential, enthusiasm, and readiness to contribute")
             )
             
+            response = self._call_llm('professional_summary', prompt)
+            
             return response.text.strip() if response.text else "Professional summary could not be generated."
             
         except Exception as e:
             raise Exception(f"Failed to generate professional summary: {str(e)}")
     
-    def _enhance_work_experience(self, work_experience):
-        """Enhance work experience descriptions with AI"""
-        enhanced_experiences = []
-        
+    def _iter_enhanced_experience(self, work_experience, previous_experience=None):
+        """Enhance work experiences, yielding (index, enhanced experience, message) as each finishes
+
+        Entries whose title, company and description match an entry of
+        previous_experience keep its bullets instead of calling the LLM again.
+        """
         # Handle empty work experience
         if not work_experience:
-            return enhanced_experiences
+            return
         
-        for exp in work_experience:
-            try:
-                prompt = f"""
-                Transform the following job description into 3-5 professional bullet points for a resume. 
-                Use action verbs, quantify achievements where possible, and focus on impact and results.
-                
-                Job Title: {exp['job_title']}
-                Company: {exp['company']}
-                Description: {exp['description']}
-                
-                Guidelines:
-                1. Start each bullet point with a strong action verb
-                2. Focus on achievements and results, not just responsibilities
-                3. Use specific numbers, percentages, or metrics where applicable
-                4. Keep each bullet point to 1-2 lines
-                5. Make it ATS-friendly
-                
-                Return the response as a JSON object with this format:
-                {{"bullet_points": ["bullet point 1", "bullet point 2", "bullet point 3"]}}
-                """
-                
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=[
-                        types.Content(role="user", parts=[types.Part(text=prompt)])
-                    ],
-                    config=types.GenerateContentConfig(
-                        response_mime_type="application/json"
-                    )
-                )
-                
-                if response.text:
-                    result = json.loads(response.text)
-                    enhanced_description = result.get('bullet_points', [exp['description']])
-                else:
-                    enhanced_description = [exp['description']]
-                
-                enhanced_exp = exp.copy()
-                enhanced_exp['enhanced_description'] = enhanced_description
-                enhanced_experiences.append(enhanced_exp)
-                
-            except Exception as e:
-                # Fallback to original description if AI enhancement fails
+        reusable = {}
+        for exp in previous_experience or []:
+            bullets = exp.get('enhanced_description')
+            # Entries that fell back to the raw description are retried
+            if bullets and bullets != [exp.get('description')]:
+                reusable[experience_hash(exp)] = bullets
+        
+        def enhance(exp):
+            key = experience_hash(exp)
+            bullets = reusable.get(key)
+            if bullets:
+                metrics.increment('llm_cache_hits_total', cache='previous_resume', task='enhance_experience')
+            else:
+                bullets = self._cached_enhancement(key)
+            
+            if bullets:
                 enhanced_exp = exp.copy()
-                enhanced_exp['enhanced_description'] = [exp['description']]
-                enhanced_experiences.append(enhanced_exp)
+                enhanced_exp['enhanced_description'] = list(bullets)
+                return enhanced_exp, f"Kept {exp['job_title']} at {exp['company']}"
+            return self.enhance_experience(exp), f"Enhanced {exp['job_title']} at {exp['company']}"
         
-        return enhanced_experiences
+        if self.max_concurrency <= 1 or len(work_experience) == 1:
+            for index, exp in enumerate(work_experience):
+                yield (index, *enhance(exp))
+            return
+        
+        # The calls are independent, so run them side by side and report them in the order they finish
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(work_experience)))
+        try:
+            futures = {executor.submit(tracing.bind(enhance), exp): index for index, exp in enumerate(work_experience)}
+            for future in as_completed(futures):
+                yield (futures[future], *future.result())
+        finally:
+            # Don't start calls nobody will read if the caller stops early
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _cached_enhancement(self, key):
+        """Bullets for an experience hash from the enhancement cache, if there is one"""
+        if self.enhancement_cache is None:
+            return None
+        try:
+            bullets = self.enhancement_cache.get(key)
+        except Exception:
+            return None  # The cache only ever saves work; never fail generation over it
+        metrics.increment('llm_cache_hits_total' if bullets else 'llm_cache_misses_total',
+                          cache='enhancement', task='enhance_experience')
+        return bullets
+    
+    def enhance_experience(self, exp):
+        """Enhance one experience and store successful results in the enhancement cache"""
+        enhanced_exp = self._enhance_single_experience(exp)
+        bullets = enhanced_exp['enhanced_description']
+        if self.enhancement_cache is not None and bullets and bullets != [exp['description']]:
+            try:
+                self.enhancement_cache.put(experience_hash(exp), bullets)
+            except Exception:
+                pass
+        return enhanced_exp
+    
+    @tracing.traced('resume.enhance_experience')
+    def _enhance_single_experience(self, exp):
+        """Turn one work experience description into AI-enhanced bullet points"""
+        try:
+            builder = PromptBuilder('enhance_experience')
+            builder.add_text('description', exp['description'])
+            
+            prompt = builder.build("""
+            Transform the following job description into 3-5 professional bullet points for a resume. 
+            Use action verbs, quantify achievements where possible, and focus on impact and results.
+            
+            Job Title: {job_title}
+            Company: {company}
+            Description: {description}
+            
+            Guidelines:
+            1. Start each bullet point with a strong action verb
+            2. Focus on achievements and results, not just responsibilities
+            3. Use specific numbers, percentages, or metrics where applicable
+            4. Keep each bullet point to 1-2 lines
+            5. Make it ATS-friendly
+            
+            Return the response as a JSON object with this format:
+            {{"bullet_points": ["bullet point 1", "bullet point 2", "bullet point 3"]}}
+            """, job_title=exp['job_title'], company=exp['company'])
+            
+            response = self._call_llm('enhance_experience', prompt, json_response=True)
+            
+            if response.text:
+                with tracing.span('parse_json', task='enhance_experience'):
+                    result = json.loads(response.text)
+                enhanced_description = result.get('bullet_points', [exp['description']])
+            else:
+                enhanced_description = [exp['description']]
+            
+            enhanced_exp = exp.copy()
+            enhanced_exp['enhanced_description'] = enhanced_description
+            return enhanced_exp
+            
+        except Exception as e:
+            # Fallback to original description if AI enhancement fails
+            enhanced_exp = exp.copy()
+            enhanced_exp['enhanced_description'] = [exp['description']]
+            return enhanced_exp
     
     def _organize_skills(self, skills):
         """Organize skills by category"""
@@ -174,14 +328,36 @@ class ResumeGenerator:
         # Remove empty categories
         return {k: v for k, v in organized.items() if v}
     
+    @tracing.traced('resume.suggest_improvements')
     def suggest_improvements(self, resume_content, target_job_description=""):
         """Suggest improvements for the resume based on job description"""
         try:
-            prompt = f"""
+            # Contact details don't help the analysis; send only what is reviewed
+            experiences = [
+                {
+                    'job_title': exp.get('job_title'),
+                    'company': exp.get('company'),
+                    'bullets': exp.get('enhanced_description') or exp.get('description')
+                }
+                for exp in resume_content.get('work_experience', [])
+            ]
+            
+            builder = PromptBuilder('suggest_improvements')
+            builder.add_text('summary', resume_content.get('professional_summary', ''), priority=3)
+            builder.add_data('skills', resume_content.get('skills', {}), priority=4)
+            builder.add_list('work_experience', experiences, priority=2)
+            builder.add_text('job_description', target_job_description, priority=1)
+            builder.add_list('education', resume_content.get('education', []), priority=0)
+            
+            prompt = builder.build("""
             Analyze the following resume and provide 3-5 specific improvement suggestions.
             
-            Resume Content: {json.dumps(resume_content)}
-            Target Job Description: {target_job_description}
+            Resume Content:
+            Summary: {summary}
+            Experience: {work_experience}
+            Education: {education}
+            Skills: {skills}
+            Target Job Description: {job_description}
             
             Provide suggestions for:
             1. Missing keywords for ATS optimization
@@ -191,20 +367,13 @@ class ResumeGenerator:
             
             Return suggestions as a JSON object:
             {{"suggestions": ["suggestion 1", "suggestion 2", "suggestion 3"]}}
-            """
-            
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part(text=prompt)])
-                ],
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json"
-                )
-            )
+            """)
+            
+            response = self._call_llm('suggest_improvements', prompt, json_response=True)
             
             if response.text:
-                result = json.loads(response.text)
+                with tracing.span('parse_json', task='suggest_improvements'):
+                    result = json.loads(response.text)
                 return result.get('suggestions', [])
             else:
                 return []
@@ -0,0 +1,448 @@
+"""HTTP/JSON service for the resume and cover letter generators
+
+Runs without Streamlit so other systems can call the generators directly:
+
+    python service.py --port 8080
+
+LLM calls run in a thread pool and PDF rendering in a process pool, so the
+event loop only parses requests and writes responses. Set LLM_BACKEND=fake
+to run it entirely on localhost.
+
+Endpoints (POST bodies and responses are JSON unless noted):
+    POST /v1/resume           {"user_data", "template_name"} -> resume content
+    POST /v1/cover-letter     {"user_data", "job_info", "industry"?, "stream"?, "reuse_paragraphs"?,
+                               "reuse_similar"?}
+                              -> {"content"}, or plain text streamed as it is
+                              generated when "stream" is true; with
+                              "reuse_paragraphs" the candidate paragraphs are
+                              written once per profile and reused, with
+                              "reuse_similar" the letter for a near-duplicate
+                              posting is adapted instead
+    POST /v1/job-match        {"user_data", "job_description", "enrich"?, "reuse_similar"?}
+    POST /v1/suggestions      {"resume_content", "job_description"?}
+    POST /v1/pdf/resume       {"content", "template"?} -> application/pdf
+    POST /v1/pdf/cover-letter {"content", "job_info"} -> application/pdf
+    GET  /healthz             liveness and load
+    GET  /metrics             Prometheus text (/metrics.json for JSON)
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+import metrics
+
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class HTTPError(Exception):
+    """Error that is returned to the client with the given status"""
+
+    def __init__(self, status, message):
+        # Both go to Exception so the error pickles back from the PDF process pool
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+def _require(body, *fields):
+    """Fail with 400 unless every field is present in the request body"""
+    missing = [field for field in fields if field not in body]
+    if missing:
+        raise HTTPError(400, f"Missing fields: {', '.join(missing)}")
+
+
+# Keys of the request objects that the generators read
+USER_DATA_FIELDS = ('personal_info', 'work_experience', 'education', 'skills')
+JOB_INFO_FIELDS = ('company_name', 'job_title', 'job_description', 'tone')
+
+
+def _require_keys(body, field, keys):
+    """Fail with 400 unless body[field] is a JSON object with every key"""
+    value = body.get(field)
+    if not isinstance(value, dict):
+        raise HTTPError(400, f"{field} must be a JSON object")
+    missing = [f"{field}.{key}" for key in keys if key not in value]
+    if missing:
+        raise HTTPError(400, f"Missing fields: {', '.join(missing)}")
+
+
+def _require_cover_letter_fields(body):
+    """Validate a cover letter request (also done before a streamed response starts)"""
+    _require(body, 'user_data', 'job_info')
+    _require_keys(body, 'user_data', USER_DATA_FIELDS)
+    _require_keys(body, 'job_info', JOB_INFO_FIELDS)
+
+
+# Handlers run in worker threads or processes; generators are created per
+# request because they keep per-instance token usage.
+
+def _generate_resume(body):
+    from resume_generator import ResumeGenerator
+
+    _require(body, 'user_data', 'template_name')
+    _require_keys(body, 'user_data', USER_DATA_FIELDS)
+    return ResumeGenerator().generate_resume(body['user_data'], body['template_name'])
+
+
+def _generate_cover_letter(body):
+    from cover_letter_generator import CoverLetterGenerator
+    from enhancement_cache import get_paragraph_cache
+    from posting_index import get_posting_index
+
+    _require_cover_letter_fields(body)
+    generator = CoverLetterGenerator(paragraph_cache=get_paragraph_cache(), posting_index=get_posting_index())
+    content = generator.generate_cover_letter(body['user_data'], body['job_info'], body.get('industry'),
+                                              reuse_paragraphs=body.get('reuse_paragraphs', False),
+                                              reuse_similar=body.get('reuse_similar', False))
+    return {'content': content}
+
+
+def _stream_cover_letter(body):
+    from cover_letter_generator import CoverLetterGenerator
+
+    _require_cover_letter_fields(body)
+    return CoverLetterGenerator().stream_cover_letter(body['user_data'], body['job_info'], body.get('industry'))
+
+
+def _analyze_job_match(body):
+    from cover_letter_generator import CoverLetterGenerator
+    from posting_index import get_posting_index
+
+    _require(body, 'user_data', 'job_description')
+    _require_keys(body, 'user_data', ('work_experience',))
+    generator = CoverLetterGenerator(posting_index=get_posting_index())
+    return generator.analyze_job_match(body['user_data'], body['job_description'], enrich=body.get('enrich', True),
+                                       reuse_similar=body.get('reuse_similar', False))
+
+
+def _suggest_improvements(body):
+    from resume_generator import ResumeGenerator
+
+    _require(body, 'resume_content')
+    suggestions = ResumeGenerator().suggest_improvements(body['resume_content'], body.get('job_description', ''))
+    return {'suggestions': suggestions}
+
+
+def _resume_pdf(body):
+    from pdf_generator import PDFGenerator
+
+    _require(body, 'content')
+    return PDFGenerator().generate_resume_pdf(body)
+
+
+def _cover_letter_pdf(body):
+    from pdf_generator import PDFGenerator
+
+    _require(body, 'content', 'job_info')
+    return PDFGenerator().generate_cover_letter_pdf(body)
+
+
+# path -> (handler, pool, kind of response)
+ROUTES = {
+    '/v1/resume': (_generate_resume, 'llm', 'json'),
+    '/v1/cover-letter': (_generate_cover_letter, 'llm', 'json'),
+    '/v1/job-match': (_analyze_job_match, 'llm', 'json'),
+    '/v1/suggestions': (_suggest_improvements, 'llm', 'json'),
+    '/v1/pdf/resume': (_resume_pdf, 'pdf', 'pdf'),
+    '/v1/pdf/cover-letter': (_cover_letter_pdf, 'pdf', 'pdf')
+}
+
+
+class GeneratorService:
+    """asyncio HTTP/1.1 server that hands requests to worker pools
+
+    Requests over max_concurrent_requests in flight are rejected with 503,
+    bodies over max_body_bytes with 413, and requests running longer than
+    request_timeout seconds with 504.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8080, llm_workers=8, pdf_workers=2,
+                 max_concurrent_requests=32, max_body_bytes=1024 * 1024, request_timeout=120):
+        self.host = host
+        self.port = port
+        self.llm_pool = ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix='llm')
+        # PDF rendering is CPU-bound; with 0 workers it runs in the thread pool instead. Workers
+        # are spawned, not forked: a fork of this threaded process can inherit a held lock and hang
+        self.pdf_pool = (ProcessPoolExecutor(max_workers=pdf_workers, mp_context=multiprocessing.get_context('spawn'))
+                         if pdf_workers > 0 else self.llm_pool)
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_body_bytes = max_body_bytes
+        self.request_timeout = request_timeout
+        self.in_flight = 0
+        self.started_at = time.time()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                 limit=MAX_HEADER_BYTES)
+        # Report the real port when started with port 0
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.llm_pool.shutdown(wait=False, cancel_futures=True)
+        if self.pdf_pool is not self.llm_pool:
+            self.pdf_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _read_request(self, reader):
+        """Parse the request line, headers and body"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=30)
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request headers too large")
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return None
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, "Send the body with a Content-Length")
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"Request body larger than {self.max_body_bytes} bytes")
+        body = await asyncio.wait_for(reader.readexactly(length), timeout=30) if length else b''
+
+        return method.upper(), target.split('?', 1)[0], headers, body
+
+    async def _send(self, writer, status, body, content_type='application/json', extra_headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode('utf-8')
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+        headers = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close"
+        ] + list(extra_headers or [])
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def _send_stream(self, writer, chunks, timeout=None):
+        """Send an async iterator of text chunks with chunked transfer encoding, returning the status
+
+        The status line is only sent once the first chunk arrives, so errors
+        before that (the usual case for LLM failures, or the timeout) still get
+        a JSON error response. A failure mid-stream, including running past
+        timeout seconds, drops the connection without the final chunk, which
+        tells the client the response is incomplete.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        def next_chunk():
+            if deadline is None:
+                return anext(chunks)
+            return asyncio.wait_for(anext(chunks), timeout=max(0, deadline - time.monotonic()))
+
+        try:
+            first = await next_chunk()
+        except StopAsyncIteration:
+            first = ''
+
+        writer.write(("HTTP/1.1 200 OK\r\nContent-Type: text/plain; charset=utf-8\r\n"
+                      "Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n").encode('latin-1'))
+        try:
+            chunk = first
+            while True:
+                data = chunk.encode('utf-8')
+                if data:
+                    writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b'\r\n')
+                    await writer.drain()
+                try:
+                    chunk = await next_chunk()
+                except StopAsyncIteration:
+                    break
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+            return 200
+        except asyncio.TimeoutError:
+            writer.transport.abort()
+            return 504
+        except Exception:
+            writer.transport.abort()
+            return 500
+
+    async def _iterate_in_thread(self, make_iterator):
+        """Run a blocking generator in the LLM pool and yield its items on the event loop"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+
+        def produce():
+            try:
+                for item in make_iterator():
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        loop.run_in_executor(self.llm_pool, produce)
+        while True:
+            item = await queue.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'in_flight': self.in_flight,
+            'max_concurrent_requests': self.max_concurrent_requests,
+            'llm_backend': os.getenv('LLM_BACKEND', 'gemini')
+        }
+
+    async def _dispatch(self, writer, method, path, body):
+        """Route one request; returns the response status"""
+        if path == '/healthz' and method == 'GET':
+            await self._send(writer, 200, self.health())
+            return 200
+        if path == '/metrics' and method == 'GET':
+            await self._send(writer, 200, metrics.format_prometheus(metrics.snapshot()),
+                             'text/plain; version=0.0.4; charset=utf-8')
+            return 200
+        if path == '/metrics.json' and method == 'GET':
+            await self._send(writer, 200, metrics.snapshot())
+            return 200
+
+        if path not in ROUTES:
+            raise HTTPError(404, f"No route for {path}")
+        if method != 'POST':
+            raise HTTPError(405, "Use POST")
+
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+
+        if path == '/v1/cover-letter' and payload.get('stream'):
+            # Validate before the 200 status line goes out
+            _require_cover_letter_fields(payload)
+            return await self._send_stream(writer, self._iterate_in_thread(lambda: _stream_cover_letter(payload)),
+                                           timeout=self.request_timeout)
+
+        handler, pool_name, response_kind = ROUTES[path]
+        pool = self.llm_pool if pool_name == 'llm' else self.pdf_pool
+        loop = asyncio.get_running_loop()
+        result = await asyncio.wait_for(loop.run_in_executor(pool, handler, payload), timeout=self.request_timeout)
+
+        if response_kind == 'pdf':
+            await self._send(writer, 200, result, 'application/pdf')
+        else:
+            await self._send(writer, 200, result)
+        return 200
+
+    async def _handle_connection(self, reader, writer):
+        start = time.perf_counter()
+        route = 'unknown'
+        status = 500
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            method, path, headers, body = request
+            if path in ROUTES or path in ('/healthz', '/metrics', '/metrics.json'):
+                route = path
+
+            if path in ROUTES and self.in_flight >= self.max_concurrent_requests:
+                raise HTTPError(503, "Too many requests in flight, retry later")
+
+            self.in_flight += 1
+            try:
+                status = await self._dispatch(writer, method, path, body)
+            finally:
+                self.in_flight -= 1
+        except HTTPError as e:
+            status = e.status
+            extra = ["Retry-After: 1"] if e.status == 503 else None
+            await self._safe_send(writer, e.status, {'error': e.message}, extra)
+        except asyncio.TimeoutError:
+            status = 504
+            await self._safe_send(writer, 504, {'error': "Request timed out"})
+        except Exception as e:
+            status = 500
+            await self._safe_send(writer, 500, {'error': str(e)})
+        finally:
+            metrics.increment('http_requests_total', path=route, status=status)
+            metrics.observe('http_request_duration_seconds', time.perf_counter() - start, path=route)
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _safe_send(self, writer, status, body, extra_headers=None):
+        """Send an error response unless the client is gone or a response already started"""
+        try:
+            if not writer.is_closing():
+                await self._send(writer, status, body, extra_headers=extra_headers)
+        except (ConnectionError, OSError):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON service for the resume and cover letter generators")
+    parser.add_argument('--host', default=os.getenv('SERVICE_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('SERVICE_PORT', '8080')))
+    parser.add_argument('--llm-workers', type=int, default=int(os.getenv('SERVICE_LLM_WORKERS', '8')))
+    parser.add_argument('--pdf-workers', type=int, default=int(os.getenv('SERVICE_PDF_WORKERS', '2')))
+    parser.add_argument('--max-concurrent-requests', type=int,
+                        default=int(os.getenv('SERVICE_MAX_CONCURRENT_REQUESTS', '32')))
+    parser.add_argument('--max-body-bytes', type=int, default=int(os.getenv('SERVICE_MAX_BODY_BYTES', str(1024 * 1024))))
+    parser.add_argument('--request-timeout', type=float, default=float(os.getenv('SERVICE_REQUEST_TIMEOUT', '120')))
+    args = parser.parse_args()
+
+    service = GeneratorService(
+        host=args.host, port=args.port, llm_workers=args.llm_workers, pdf_workers=args.pdf_workers,
+        max_concurrent_requests=args.max_concurrent_requests, max_body_bytes=args.max_body_bytes,
+        request_timeout=args.request_timeout
+    )
+
+    async def run():
+        await service.start()
+        print(f"Serving on http://{service.host}:{service.port}")
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
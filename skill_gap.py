@@ -0,0 +1,219 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+
+import metrics
+import tracing
+from recruiter import index_rows, job_skills, load_profiles, profile_name, profile_skills
+
+COLUMNS = ['candidate', 'job', 'match_percentage', 'matched_count', 'missing_count',
+           'matching_skills', 'missing_skills']
+
+
+def load_jobs(paths):
+    """Read job postings from files and directories
+
+    A .json file holds one job_info dictionary (job_title, company_name,
+    job_description) or a list of them; any other file is one job
+    description, titled after the file name. Directories are searched for
+    *.json and *.txt files.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.json')) + glob.glob(os.path.join(path, '*.txt'))))
+        else:
+            files.append(path)
+
+    jobs = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                data = json.load(f)
+                jobs.extend(data if isinstance(data, list) else [data])
+            else:
+                jobs.append({'job_title': os.path.splitext(os.path.basename(path))[0], 'job_description': f.read()})
+    return jobs
+
+
+def job_label(job):
+    """Display name of a job posting"""
+    title = job.get('job_title') or 'Untitled job'
+    return f"{title} at {job['company_name']}" if job.get('company_name') else title
+
+
+class SkillGapMatrix:
+    """Matched and missing skills of every candidate for every job, without any LLM call
+
+    Candidates and jobs become boolean sparse matrices over one vocabulary
+    of normalized skills; a single sparse product then counts the shared
+    skills of every (candidate, job) pair, and a weighted one gives the
+    match percentages. Skills are weighted by mentions as in score_job_match;
+    unlike it, jobs are only searched for skills the bundled taxonomy knows,
+    not for each candidate's own uncommon skills.
+
+    Skill names are only spelled out for export; candidates with the same
+    skills for a job share the same strings.
+    """
+
+    def __init__(self, profiles, jobs):
+        self.profiles = list(profiles)
+        self.jobs = [job if isinstance(job, dict) else {'job_description': job} for job in jobs]
+        start = time.perf_counter()
+
+        with tracing.span('skill_gap.build', candidates=len(self.profiles), jobs=len(self.jobs)):
+            # Skills each job asks for, most mentioned first, weighted by mentions
+            self.requirements = [job_skills(job.get('job_description', '')) for job in self.jobs]
+            self.vocabulary, rows, cols, values = index_rows(
+                [{skill: weight for skill, _, weight in required} for required in self.requirements]
+            )
+            shape = (len(self.jobs), max(len(self.vocabulary), 1))
+            weights = sparse.csr_matrix((np.asarray(values, dtype=np.float64), (rows, cols)), shape=shape)
+            self.required = weights.astype(bool)
+
+            # Candidate skills no job asks for can't change any count, so they are left out
+            _, rows, cols, values = index_rows(
+                [dict.fromkeys((skill for skill in profile_skills(profile) if skill in self.vocabulary), True)
+                 for profile in self.profiles],
+                self.vocabulary
+            )
+            self.skills = sparse.csr_matrix((np.asarray(values, dtype=bool), (rows, cols)),
+                                            shape=(len(self.profiles), shape[1]))
+
+            # candidates x jobs: shared skills, and the weight they carry
+            candidates = self.skills.astype(np.float64)
+            self.required_count = np.asarray(self.required.sum(axis=1)).ravel().astype(np.int32)
+            self.matched_count = (candidates @ self.required.T.astype(np.float64)).toarray().astype(np.int32)
+            self.missing_count = self.required_count[None, :] - self.matched_count
+
+            total_weight = np.asarray(weights.sum(axis=1)).ravel()
+            matched_weight = (candidates @ weights.T).toarray()
+            self.match_percentage = np.round(
+                100 * np.divide(matched_weight, total_weight, out=np.zeros_like(matched_weight),
+                                where=total_weight > 0)
+            ).astype(np.int32)
+
+            # Columns sliced per job when spelling out skill names
+            self._by_skill = self.skills.tocsc()
+        metrics.observe('skill_gap_build_duration_seconds', time.perf_counter() - start)
+
+    @property
+    def shape(self):
+        """(candidates, jobs)"""
+        return self.matched_count.shape
+
+    def job_skill_lists(self, job_index):
+        """Matching and missing skill names of every candidate for one job, as two arrays of strings"""
+        required = self.requirements[job_index]
+        count = len(self.profiles)
+        if not required:
+            empty = np.full(count, '', dtype=object)
+            return empty, empty
+
+        has = self._by_skill[:, [self.vocabulary[skill] for skill, _, _ in required]].toarray()
+        patterns, inverse = np.unique(np.packbits(has, axis=1), axis=0, return_inverse=True)
+
+        matching = np.empty(len(patterns), dtype=object)
+        missing = np.empty(len(patterns), dtype=object)
+        for i, pattern in enumerate(np.unpackbits(patterns, axis=1, count=len(required)).astype(bool)):
+            matching[i] = '; '.join(name for (_, name, _), present in zip(required, pattern) if present)
+            missing[i] = '; '.join(name for (_, name, _), present in zip(required, pattern) if not present)
+        inverse = inverse.ravel()
+        return matching[inverse], missing[inverse]
+
+    def pair(self, candidate_index, job_index):
+        """The gap analysis of one candidate for one job, shaped like score_job_match"""
+        skills = self.skills[candidate_index]
+        owned = set(skills.indices)
+        required = self.requirements[job_index]
+        return {
+            'candidate': profile_name(self.profiles[candidate_index]),
+            'job': job_label(self.jobs[job_index]),
+            'match_percentage': int(self.match_percentage[candidate_index, job_index]),
+            'matching_skills': [name for skill, name, _ in required if self.vocabulary[skill] in owned],
+            'missing_skills': [name for skill, name, _ in required if self.vocabulary[skill] not in owned]
+        }
+
+    def columns(self, skills=True):
+        """The matrix as flat columns (see COLUMNS), one row per pair, grouped by job"""
+        candidates, jobs = self.shape
+        names = np.array([profile_name(profile) for profile in self.profiles], dtype=object)
+        labels = np.array([job_label(job) for job in self.jobs], dtype=object)
+
+        # Job-major order, so each job's skill lists are computed once
+        columns = {
+            'candidate': np.tile(names, jobs),
+            'job': np.repeat(labels, candidates),
+            'match_percentage': self.match_percentage.T.ravel(),
+            'matched_count': self.matched_count.T.ravel(),
+            'missing_count': self.missing_count.T.ravel()
+        }
+        if skills:
+            lists = [self.job_skill_lists(job_index) for job_index in range(jobs)]
+            columns['matching_skills'] = np.concatenate([matching for matching, _ in lists]) if lists else names[:0]
+            columns['missing_skills'] = np.concatenate([missing for _, missing in lists]) if lists else names[:0]
+        return columns
+
+    def to_csv(self, path, skills=True):
+        """Write the matrix to a CSV file, one row per (candidate, job) pair"""
+        with tracing.span('skill_gap.export', format='csv', pairs=self.matched_count.size):
+            columns = self.columns(skills)
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(list(columns))
+                writer.writerows(zip(*(column.tolist() for column in columns.values())))
+
+    def to_parquet(self, path, skills=True):
+        """Write the matrix to a Parquet file (requires the optional pyarrow package)"""
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception("Parquet export requires the pyarrow package: pip install pyarrow")
+
+        with tracing.span('skill_gap.export', format='parquet', pairs=self.matched_count.size):
+            columns = self.columns(skills)
+            table = pyarrow.table({
+                name: pyarrow.array(column, type=pyarrow.string()) if column.dtype == object else column
+                for name, column in columns.items()
+            })
+            pyarrow.parquet.write_table(table, path)
+
+    def export(self, path, skills=True):
+        """Write the matrix to Parquet if the path ends in .parquet, otherwise to CSV"""
+        if path.lower().endswith('.parquet'):
+            self.to_parquet(path, skills)
+        else:
+            self.to_csv(path, skills)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the skill gaps of every candidate for every job")
+    parser.add_argument('--profiles', nargs='+', required=True, help="profile JSON files or directories of them")
+    parser.add_argument('--jobs', nargs='+', required=True,
+                        help="job_info JSON files, job description text files, or directories of them")
+    parser.add_argument('-o', '--output', default='skill_gaps.csv', help="CSV or .parquet file to write")
+    parser.add_argument('--counts-only', action='store_true', help="leave out the skill names")
+    args = parser.parse_args()
+
+    profiles = load_profiles(args.profiles)
+    jobs = load_jobs(args.jobs)
+
+    start = time.perf_counter()
+    matrix = SkillGapMatrix(profiles, jobs)
+    built = time.perf_counter()
+    matrix.export(args.output, skills=not args.counts_only)
+    exported = time.perf_counter()
+
+    print(f"{len(profiles)} candidates x {len(jobs)} jobs: computed in {(built - start) * 1000:.0f}ms, "
+          f"written to {args.output} in {(exported - built) * 1000:.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
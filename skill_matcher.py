@@ -0,0 +1,237 @@
+from collections import Counter, deque, namedtuple
+from functools import lru_cache
+
+# Canonical skill name -> aliases that should be recognized as the same skill
+SKILL_TAXONOMY = {
+    'Python': [],
+    'Java': [],
+    'JavaScript': ['JS', 'ECMAScript'],
+    'TypeScript': ['TS'],
+    'C++': ['CPP'],
+    'C#': ['C Sharp', 'CSharp'],
+    'Go': ['Golang'],
+    'Rust': [],
+    'Ruby': [],
+    'PHP': [],
+    'Swift': [],
+    'Kotlin': [],
+    'Scala': [],
+    'R': [],
+    'SQL': [],
+    'NoSQL': [],
+    'PostgreSQL': ['Postgres'],
+    'MySQL': [],
+    'MongoDB': ['Mongo'],
+    'HTML': ['HTML5'],
+    'CSS': ['CSS3'],
+    'React': ['ReactJS', 'React.js'],
+    'Angular': ['AngularJS'],
+    'Vue': ['Vue.js', 'VueJS'],
+    'Node.js': ['Node', 'NodeJS'],
+    'Django': [],
+    'Flask': [],
+    'Spring': ['Spring Boot'],
+    'AWS': ['Amazon Web Services'],
+    'Azure': ['Microsoft Azure'],
+    'GCP': ['Google Cloud', 'Google Cloud Platform'],
+    'Docker': [],
+    'Kubernetes': ['K8s'],
+    'Terraform': [],
+    'Git': ['GitHub', 'GitLab'],
+    'Linux': ['Unix'],
+    'Spark': ['Apache Spark', 'PySpark'],
+    'Hadoop': [],
+    'Kafka': ['Apache Kafka'],
+    'Tableau': [],
+    'Power BI': ['PowerBI'],
+    'Excel': ['Microsoft Excel', 'MS Excel'],
+    'Machine Learning': ['ML'],
+    'Deep Learning': ['DL'],
+    'Artificial Intelligence': ['AI'],
+    'Natural Language Processing': ['NLP'],
+    'Data Analysis': ['Data Analytics'],
+    'Data Visualization': [],
+    'Statistics': ['Statistical Analysis'],
+    'TensorFlow': [],
+    'PyTorch': [],
+    'Pandas': [],
+    'NumPy': [],
+    'REST APIs': ['REST', 'RESTful', 'REST API', 'RESTful APIs'],
+    'GraphQL': [],
+    'CI/CD': ['CICD', 'Continuous Integration'],
+    'Agile': [],
+    'Scrum': [],
+    'Project Management': [],
+    'Communication': ['Communication Skills'],
+    'Leadership': [],
+    'Problem Solving': ['Problem-Solving'],
+    'Teamwork': ['Collaboration'],
+    'Customer Service': [],
+    'Salesforce': [],
+    'SEO': ['Search Engine Optimization'],
+    'Figma': [],
+    'Photoshop': ['Adobe Photoshop'],
+    'Accounting': [],
+    'Microsoft Office': ['MS Office', 'Office 365']
+}
+
+# Skills that are also everyday words ("the rest of the team", "excel at", "each node");
+# like the very short terms, they only count when written exactly as listed here
+AMBIGUOUS_TERMS = frozenset([
+    'REST', 'Node', 'Excel', 'Swift', 'Spring', 'React', 'Spark', 'Rust', 'Ruby', 'Go', 'R'
+])
+
+SkillMatch = namedtuple('SkillMatch', ['skill', 'text', 'start', 'end'])
+
+# Characters that make a neighbouring match part of a bigger word ("Java" in "JavaScript")
+_WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_+#')
+
+
+def _normalize_term(term):
+    """Lowercase a term and collapse internal whitespace"""
+    return ' '.join(term.lower().split())
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton that finds every skill mention in one pass over a text
+
+    The vocabulary is the bundled SKILL_TAXONOMY (with aliases) plus any extra
+    skills given. Very short terms like "R" or "AI", and the AMBIGUOUS_TERMS
+    like "REST" or "Excel", only match with the same capitalisation, so
+    ordinary words don't count as skills.
+    """
+
+    def __init__(self, skills=None, include_taxonomy=True):
+        self.canonical = {}        # normalized term -> canonical skill name
+        self.case_sensitive = {}   # normalized term -> exact spelling required, if any
+
+        if include_taxonomy:
+            for skill, aliases in SKILL_TAXONOMY.items():
+                for term in [skill] + aliases:
+                    self._add_term(term, skill)
+
+        for skill in skills or []:
+            name = ' '.join(skill.split())
+            if name and _normalize_term(name) not in self.canonical:
+                self._add_term(name, name)
+
+        self._build()
+
+    def _add_term(self, term, skill):
+        """Register a term as a way of writing skill"""
+        normalized = _normalize_term(term)
+        self.canonical.setdefault(normalized, skill)
+        if len(normalized) <= 2 or term in AMBIGUOUS_TERMS:
+            self.case_sensitive[normalized] = ' '.join(term.split())
+
+    def _build(self):
+        """Build the goto, failure and output tables"""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for term in self.canonical:
+            state = 0
+            for char in term:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(term)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def canonicalize(self, name):
+        """Map a skill name or alias to its canonical name"""
+        return self.canonical.get(_normalize_term(name), ' '.join(name.split()))
+
+    def find_all(self, text, overlapping=False):
+        """Return every skill mention in text as SkillMatch tuples, in order of position
+
+        Whitespace runs in the text are treated as a single space. Unless
+        overlapping is set, the longest match wins where mentions overlap.
+        """
+        if not text:
+            return []
+
+        matches = []
+        positions = []  # normalized index -> original index
+        state = 0
+        previous_space = True
+
+        for index, char in enumerate(text):
+            if char.isspace():
+                if previous_space:
+                    continue
+                char = ' '
+                previous_space = True
+            else:
+                char = char.lower()
+                previous_space = False
+            positions.append(index)
+
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            for term in self.output[state]:
+                start = positions[len(positions) - len(term)]
+                end = index + 1
+                if start > 0 and text[start - 1].lower() in _WORD_CHARS:
+                    continue
+                if end < len(text) and text[end].lower() in _WORD_CHARS:
+                    continue
+                matched = text[start:end]
+                exact = self.case_sensitive.get(term)
+                if exact and ' '.join(matched.split()) != exact:
+                    continue
+                matches.append(SkillMatch(self.canonical[term], matched, start, end))
+
+        matches.sort(key=lambda match: (match.start, -(match.end - match.start)))
+        if overlapping:
+            return matches
+
+        resolved = []
+        last_end = -1
+        for match in matches:
+            if match.start >= last_end:
+                resolved.append(match)
+                last_end = match.end
+        return resolved
+
+    def count(self, text):
+        """Count mentions of each canonical skill in text
+
+        Everyday words that share a name with a skill are not counted:
+
+        >>> get_skill_matcher().count("Python developer who will mentor the rest of the team and excel at communication.")
+        Counter({'Python': 1, 'Communication': 1})
+        >>> get_skill_matcher().count("Keep a swift pace in spring planning; each node of the team will react and go.")
+        Counter()
+        >>> sorted(get_skill_matcher().count("Build REST services in Node and Go, with Excel and Swift.").items())
+        [('Excel', 1), ('Go', 1), ('Node.js', 1), ('REST APIs', 1), ('Swift', 1)]
+        """
+        return Counter(match.skill for match in self.find_all(text))
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(skills):
+    return SkillMatcher(skills)
+
+
+def get_skill_matcher(skills=()):
+    """Return a (cached) matcher for the taxonomy plus the given skill names"""
+    return _cached_matcher(tuple(sorted(set(skills))))
@@ -0,0 +1,37 @@
+import json
+import os
+import tempfile
+
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser('~'), '.ai_resume_generator')
+
+
+def get_data_path(*parts):
+    """Return a path inside the local data directory (APP_DATA_DIR), creating parent folders"""
+    base = os.getenv('APP_DATA_DIR', DEFAULT_DATA_DIR)
+    path = os.path.join(base, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def write_json_atomic(path, data):
+    """Write JSON to path so readers never see a half-written file"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path, default=None):
+    """Read JSON from path, returning default if it doesn't exist or is unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
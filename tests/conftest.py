@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the app modules from the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from llm_backend import FakeBackend
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Keep every SQLite store and export in a fresh directory, and never call Gemini"""
+    monkeypatch.setenv('APP_DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('LLM_BACKEND', 'fake')
+    return tmp_path
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend(seed=7)
+
+
+@pytest.fixture
+def user_data():
+    """A small profile with two experiences and a mix of skills"""
+    return {
+        'personal_info': {
+            'first_name': 'Jordan', 'last_name': 'Lee', 'email': 'jordan.lee@example.com',
+            'phone': '(555) 123-4567', 'location': 'Austin, TX', 'linkedin': '', 'github': '',
+            'website': '', 'professional_summary': ''
+        },
+        'work_experience': [
+            {
+                'job_title': 'Data Engineer', 'company': 'Acme', 'location': 'Remote',
+                'start_date': '2020-01-01', 'end_date': '', 'current': True,
+                'description': 'Built data pipelines in Python and SQL on AWS'
+            },
+            {
+                'job_title': 'Analyst', 'company': 'Globex', 'location': 'Austin, TX',
+                'start_date': '2017-01-01', 'end_date': '2019-12-31', 'current': False,
+                'description': 'Made Tableau dashboards for the sales team'
+            }
+        ],
+        'education': [
+            {'degree': 'Bachelor of Science', 'major': 'Computer Science', 'school': 'UT Austin',
+             'location': 'Austin, TX', 'graduation_date': '2016-05-15', 'gpa': '3.8', 'achievements': ''}
+        ],
+        'skills': [
+            {'name': 'Python', 'category': 'Technical'},
+            {'name': 'SQL', 'category': 'Technical'},
+            {'name': 'Communication', 'category': 'Soft'}
+        ]
+    }
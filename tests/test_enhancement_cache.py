@@ -0,0 +1,25 @@
+from enhancement_cache import EnhancementCache
+
+
+def test_get_returns_stored_bullets(tmp_path):
+    cache = EnhancementCache(str(tmp_path / 'enhancements.sqlite3'))
+
+    assert cache.get('missing') is None
+    cache.put('key', ['Shipped a pipeline', 'Led a team'])
+
+    assert cache.get('key') == ['Shipped a pipeline', 'Led a team']
+    # A second instance on the same file sees the same entries
+    assert EnhancementCache(cache.path).get('key') == ['Shipped a pipeline', 'Led a team']
+
+
+def test_put_replaces_and_evicts_the_oldest(tmp_path):
+    cache = EnhancementCache(str(tmp_path / 'enhancements.sqlite3'), max_entries=2)
+
+    cache.put('a', ['first'])
+    cache.put('a', ['replaced'])
+    cache.put('b', ['second'])
+    cache.put('c', ['third'])
+
+    assert cache.get('a') is None
+    assert cache.get('b') == ['second']
+    assert cache.get('c') == ['third']
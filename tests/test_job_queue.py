@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / 'jobs.sqlite3'), max_attempts=2)
+
+
+def test_claim_takes_highest_priority_then_oldest(queue):
+    first = queue.submit('resume', {'n': 1})
+    second = queue.submit('resume', {'n': 2})
+    urgent = queue.submit('resume', {'n': 3}, priority=5)
+
+    claimed = [queue.claim('worker')['id'] for _ in range(3)]
+
+    assert claimed == [urgent, first, second]
+    assert queue.claim('worker') is None
+
+
+def test_claimed_job_is_running_once(queue):
+    job_id = queue.submit('resume', {'n': 1})
+
+    job = queue.claim('worker-1')
+
+    assert job['id'] == job_id
+    assert job['status'] == RUNNING
+    assert job['worker'] == 'worker-1'
+    assert job['attempts'] == 1
+    assert job['payload'] == {'n': 1}
+    assert queue.claim('worker-2') is None
+
+
+def test_complete_and_fail_store_the_outcome(queue):
+    done = queue.submit('resume', {})
+    failed = queue.submit('resume', {})
+    queue.claim('worker')
+    queue.claim('worker')
+
+    queue.complete(done, {'text': 'ok'})
+    queue.fail(failed, ValueError('boom'))
+
+    assert queue.get(done)['status'] == DONE
+    assert queue.get(done)['result'] == {'text': 'ok'}
+    assert queue.get(failed)['status'] == FAILED
+    assert queue.get(failed)['error'] == 'boom'
+
+
+def test_get_checks_the_owner(queue):
+    job_id = queue.submit('resume', {}, owner='alice')
+
+    assert queue.get(job_id, owner='alice')['id'] == job_id
+    assert queue.get(job_id, owner='bob') is None
+    assert queue.get(job_id)['owner'] == 'alice'
+
+
+def test_requeue_stale_puts_silent_jobs_back(queue):
+    job_id = queue.submit('resume', {})
+    queue.claim('worker')
+
+    assert queue.requeue_stale(timeout=60) == 0
+    time.sleep(0.05)
+    assert queue.requeue_stale(timeout=0.01) == 1
+
+    job = queue.get(job_id)
+    assert job['status'] == QUEUED
+    assert job['worker'] is None
+    assert queue.claim('worker')['attempts'] == 2
+
+
+def test_heartbeats_keep_a_job_running(queue):
+    job_id = queue.submit('resume', {})
+    queue.claim('worker')
+    time.sleep(0.2)
+
+    queue.heartbeat(job_id)
+
+    assert queue.requeue_stale(timeout=0.1) == 0
+    assert queue.get(job_id)['status'] == RUNNING
+
+
+def test_requeue_stale_fails_jobs_out_of_attempts(queue):
+    job_id = queue.submit('resume', {})
+    for _ in range(2):
+        queue.claim('worker')
+        time.sleep(0.05)
+        queue.requeue_stale(timeout=0.01)
+
+    job = queue.get(job_id)
+    assert job['status'] == FAILED
+    assert job['attempts'] == 2
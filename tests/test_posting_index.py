@@ -0,0 +1,62 @@
+import pytest
+
+from posting_index import PostingIndex, posting_id
+
+POSTING = """
+We are looking for a Senior Data Engineer to join our platform team. You will design and build
+scalable data pipelines in Python and SQL, run Spark jobs on AWS, and deploy services with Docker
+and Kubernetes. Experience with Kafka, Airflow and machine learning pipelines is a plus.
+"""
+
+REPOSTED = POSTING.replace("Senior Data Engineer", "Senior Data Engineer (Remote)") + " Apply by Friday."
+
+UNRELATED = """
+Our bakery is hiring a pastry chef to prepare croissants, cakes and seasonal desserts every morning,
+manage the ovens, order ingredients from local farms and train two apprentices on weekends.
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    return PostingIndex(str(tmp_path / 'postings.sqlite3'))
+
+
+def test_posting_id_ignores_case_and_spacing():
+    assert posting_id("Data  Engineer\nRemote") == posting_id("data engineer remote")
+
+
+def test_query_finds_near_duplicates_only(index):
+    key = index.add(POSTING, company_name='Acme')
+    index.add(UNRELATED)
+
+    matches = index.query(REPOSTED)
+
+    assert [match['id'] for match in matches] == [key]
+    assert 0.8 <= matches[0]['similarity'] < 1.0
+    assert matches[0]['metadata'] == {'company_name': 'Acme'}
+    assert index.query(POSTING)[0]['similarity'] == 1.0
+
+
+def test_add_is_idempotent(index):
+    assert index.add(POSTING) == index.add(POSTING)
+    assert len(index.query(POSTING)) == 1
+
+
+def test_find_result_reuses_results_of_the_same_kind_and_owner(index):
+    index.store_result(POSTING, 'cover_letter', 'alice', {'text': 'Dear Acme'})
+
+    found = index.find_result(REPOSTED, 'cover_letter', 'alice')
+
+    assert found['result'] == {'text': 'Dear Acme'}
+    assert found['similarity'] >= 0.8
+    assert index.find_result(REPOSTED, 'cover_letter', 'bob') is None
+    assert index.find_result(REPOSTED, 'job_match', 'alice') is None
+    assert index.find_result(UNRELATED, 'cover_letter', 'alice') is None
+
+
+def test_find_result_is_not_crowded_out_by_other_owners(index):
+    for i in range(40):
+        index.store_result(POSTING + f" Reference {i}.", 'cover_letter', f'user-{i}', {'text': str(i)})
+    index.store_result(POSTING, 'cover_letter', 'alice', {'text': 'alice'})
+
+    assert index.find_result(REPOSTED, 'cover_letter', 'alice')['result'] == {'text': 'alice'}
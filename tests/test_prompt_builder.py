@@ -0,0 +1,41 @@
+from prompt_builder import PromptBuilder, estimate_tokens
+
+
+def test_prompt_under_budget_is_untouched():
+    builder = PromptBuilder('test', budget=1000)
+    builder.add_text('summary', 'Experienced engineer')
+    builder.add_list('skills', ['Python', 'SQL'], separator=', ')
+
+    assert builder.build("{summary} | {skills}") == "Experienced engineer | Python, SQL"
+
+
+def test_lowest_priority_section_is_trimmed_first():
+    builder = PromptBuilder('test', budget=40)
+    builder.add_list('skills', ['Python', 'SQL', 'AWS'], priority=2, separator=', ')
+    builder.add_list('education', [f'School number {i} with a long name' for i in range(20)], priority=0)
+
+    prompt = builder.build("Skills: {skills}\nEducation: {education}")
+
+    assert estimate_tokens(prompt) <= 40
+    assert 'Skills: Python, SQL, AWS' in prompt
+    assert 'School number 19' not in prompt
+
+
+def test_text_sections_are_truncated_with_an_ellipsis():
+    builder = PromptBuilder('test', budget=30)
+    builder.add_text('description', ' '.join(['word'] * 100))
+
+    prompt = builder.build("Description: {description}")
+
+    assert estimate_tokens(prompt) <= 30
+    assert prompt.endswith('...')
+
+
+def test_fixed_values_are_never_trimmed():
+    builder = PromptBuilder('test', budget=5)
+    builder.add_text('a', 'abcdefghijkl mnop')
+
+    # Even once the section is empty the fixed text keeps the prompt over budget; build must still finish
+    prompt = builder.build('{a} fixed text here that is long enough to stay over budget')
+
+    assert prompt == ' fixed text here that is long enough to stay over budget'
@@ -0,0 +1,63 @@
+from recruiter import CandidateRanker, index_rows, profile_skills
+
+JOB = """
+We need a Data Engineer to build pipelines in Python and SQL, run Spark on AWS and
+deploy with Docker and Kubernetes.
+"""
+
+
+def make_profile(first_name, summary, skills):
+    return {
+        'personal_info': {'first_name': first_name, 'last_name': 'Doe', 'professional_summary': summary},
+        'work_experience': [],
+        'education': [],
+        'skills': [{'name': skill, 'category': 'Technical'} for skill in skills]
+    }
+
+
+PROFILES = [
+    make_profile('Chef', "Pastry chef baking cakes", ['Baking']),
+    make_profile('Partial', "Analyst writing SQL reports", ['SQL', 'Excel']),
+    make_profile('Strong', "Data engineer building Spark pipelines on AWS",
+                 ['Python', 'SQL', 'Spark', 'AWS', 'Docker', 'Kubernetes']),
+    make_profile('Python', "Backend developer", ['Python', 'Docker'])
+]
+
+
+def test_rank_orders_candidates_by_fit():
+    ranked = CandidateRanker(PROFILES).rank(JOB, top_k=4)
+
+    assert [result['name'] for result in ranked] == ['Strong Doe', 'Python Doe', 'Partial Doe', 'Chef Doe']
+    assert ranked[0]['skill_coverage'] == 100.0
+    assert ranked[0]['missing_skills'] == []
+    assert ranked[-1]['score'] == 0.0
+    assert [result['score'] for result in ranked] == sorted((result['score'] for result in ranked), reverse=True)
+
+
+def test_rank_reports_matching_and_missing_skills():
+    ranked = CandidateRanker(PROFILES).rank(JOB, top_k=2)
+    second = ranked[1]
+
+    assert len(ranked) == 2
+    assert second['index'] == 3
+    assert set(second['matching_skills']) == {'Python', 'Docker'}
+    assert 'Spark' in second['missing_skills']
+
+
+def test_rank_handles_empty_inputs():
+    assert CandidateRanker([]).rank(JOB) == []
+    assert len(CandidateRanker(PROFILES).rank("", top_k=10)) == len(PROFILES)
+
+
+def test_profile_skills_canonicalizes_listed_and_mentioned_skills():
+    profile = make_profile('Alias', "Deploys with k8s", ['JS (Advanced)'])
+
+    assert {'javascript', 'kubernetes'} <= profile_skills(profile)
+
+
+def test_index_rows_builds_a_shared_vocabulary():
+    vocabulary, rows, cols, values = index_rows([{'a': 1.0, 'b': 2.0}, {'b': 3.0}])
+
+    assert sorted(vocabulary) == ['a', 'b']
+    assert sorted(zip(rows, cols, values)) == [(0, vocabulary['a'], 1.0), (0, vocabulary['b'], 2.0),
+                                               (1, vocabulary['b'], 3.0)]
@@ -0,0 +1,42 @@
+from relevance import BM25Ranker, experience_text, select_relevant, tokenize
+
+
+def test_tokenize_drops_stop_words_and_keeps_symbols():
+    assert tokenize("The C++ and C# developers of Node.js") == ['c++', 'c#', 'developers', 'node.js']
+    assert tokenize('') == []
+
+
+def test_bm25_ranks_matching_documents_first():
+    ranker = BM25Ranker([
+        "Made Tableau dashboards for sales",
+        "Built Spark pipelines in Python on AWS",
+        "Ran Python scripts"
+    ])
+
+    scores = ranker.scores("python spark pipelines")
+
+    assert scores[0] == 0
+    assert scores[1] > scores[2] > 0
+    assert ranker.top_k("python spark pipelines", 2) == [1, 2]
+
+
+def test_select_relevant_keeps_original_order():
+    items = ['dashboards', 'pipelines', 'scripts', 'support']
+    texts = ["Tableau dashboards", "Spark pipelines in Python", "Python scripts", "Customer support"]
+
+    assert select_relevant(items, texts, "python spark", 2) == ['pipelines', 'scripts']
+    assert select_relevant(items, texts, "customer support python", 2, keep_order=False)[0] == 'support'
+
+
+def test_select_relevant_without_query_takes_the_first_items():
+    items = ['a', 'b', 'c']
+
+    assert select_relevant(items, ['x', 'y', 'z'], '', 2) == ['a', 'b']
+    assert select_relevant(items, ['x', 'y', 'z'], 'anything', 5) == items
+
+
+def test_experience_text_includes_enhanced_bullets():
+    exp = {'job_title': 'Engineer', 'company': 'Acme', 'description': 'Built things',
+           'enhanced_description': ['Shipped a Kafka pipeline']}
+
+    assert experience_text(exp) == 'Engineer Acme Built things Shipped a Kafka pipeline'
@@ -0,0 +1,57 @@
+from enhancement_cache import EnhancementCache
+from resume_generator import DONE, EXPERIENCE_ENHANCED, SUMMARY_READY, ResumeGenerator, experience_hash
+
+
+def test_generate_resume_enhances_every_experience(backend, user_data):
+    events = []
+
+    resume = ResumeGenerator(backend=backend).generate_resume(user_data, 'modern', on_event=events.append)
+
+    assert resume['professional_summary']
+    assert [exp['job_title'] for exp in resume['work_experience']] == ['Data Engineer', 'Analyst']
+    assert all(exp['enhanced_description'] for exp in resume['work_experience'])
+    assert events[0].type == SUMMARY_READY
+    assert [event.type for event in events].count(EXPERIENCE_ENHANCED) == 2
+    assert events[-1].type == DONE
+    assert events[-1].completed == events[-1].total
+
+
+def test_regeneration_only_enhances_changed_experiences(backend, user_data):
+    generator = ResumeGenerator(backend=backend)
+    first = generator.generate_resume(user_data, 'modern')
+    calls = backend.call_count
+
+    user_data['work_experience'][1]['description'] = 'Made Tableau and Excel dashboards for the sales team'
+    second = generator.generate_resume(user_data, 'modern', previous_resume=first)
+
+    # The summary and the changed experience are written again; the unchanged one is reused
+    assert backend.call_count - calls == 2
+    assert second['work_experience'][0]['enhanced_description'] == first['work_experience'][0]['enhanced_description']
+
+
+def test_unchanged_regeneration_makes_no_calls(backend, user_data):
+    generator = ResumeGenerator(backend=backend)
+    first = generator.generate_resume(user_data, 'modern')
+    calls = backend.call_count
+
+    second = generator.generate_resume(user_data, 'modern', previous_resume=first)
+
+    assert backend.call_count == calls
+    assert second['professional_summary'] == first['professional_summary']
+    assert second['work_experience'] == first['work_experience']
+
+
+def test_enhancement_cache_is_shared_between_generators(tmp_path, backend, user_data):
+    cache = EnhancementCache(str(tmp_path / 'enhancements.sqlite3'))
+    first = ResumeGenerator(backend=backend, enhancement_cache=cache).generate_resume(user_data, 'modern')
+
+    assert cache.get(experience_hash(user_data['work_experience'][0])) == \
+        first['work_experience'][0]['enhanced_description']
+
+    other = ResumeGenerator(backend=backend, enhancement_cache=cache)
+    calls = backend.call_count
+    second = other.generate_resume(user_data, 'modern')
+
+    # Only the summary is written; both experiences come from the cache
+    assert backend.call_count - calls == 1
+    assert second['work_experience'] == first['work_experience']
@@ -0,0 +1,34 @@
+from skill_matcher import SkillMatcher, get_skill_matcher
+
+
+def test_aliases_map_to_canonical_names():
+    matcher = get_skill_matcher()
+
+    assert matcher.canonicalize('js') == 'JavaScript'
+    assert matcher.count("Write JS and TypeScript with k8s") == {'JavaScript': 1, 'TypeScript': 1, 'Kubernetes': 1}
+
+
+def test_everyday_words_are_not_skills():
+    text = "Keep a swift pace in spring planning; each node of the team will react and go."
+
+    assert get_skill_matcher().count(text) == {}
+
+
+def test_capitalised_skill_names_are_found():
+    counts = get_skill_matcher().count("Build REST services in Node and Go, with Excel and Swift.")
+
+    assert set(counts) == {'REST APIs', 'Node.js', 'Go', 'Excel', 'Swift'}
+
+
+def test_longest_match_wins_unless_overlapping():
+    matcher = get_skill_matcher()
+    text = "Experience with machine learning"
+
+    assert [match.skill for match in matcher.find_all(text)] == ['Machine Learning']
+    assert len(matcher.find_all(text, overlapping=True)) >= 1
+
+
+def test_extra_skills_are_matched():
+    matcher = SkillMatcher(['Frobnicator'])
+
+    assert matcher.count("We use the frobnicator daily") == {'Frobnicator': 1}
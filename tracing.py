@@ -0,0 +1,218 @@
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from storage import get_data_path
+
+# The span the current code runs in (None outside any span)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed operation inside a trace"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'attributes', 'start', 'duration', 'thread_id', 'error')
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes or {}
+        self.start = time.time()
+        self.duration = None
+        self.thread_id = threading.get_ident()
+        self.error = None
+
+    def set(self, **attributes):
+        """Add attributes to the span while it runs"""
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'duration_ms': round(self.duration * 1000, 3),
+            'thread_id': self.thread_id,
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+
+def chrome_event(span_data, pid=None):
+    """Convert a finished span (as a dict) to a Chrome trace-event 'complete' event"""
+    args = dict(span_data['attributes'])
+    args.update({'trace_id': span_data['trace_id'], 'span_id': span_data['span_id'],
+                 'parent_id': span_data['parent_id']})
+    if span_data['error']:
+        args['error'] = span_data['error']
+    return {
+        'name': span_data['name'],
+        'cat': span_data['name'].split('.')[0],
+        'ph': 'X',
+        'ts': round(span_data['start'] * 1e6),
+        'dur': round(span_data['duration_ms'] * 1000),
+        'pid': pid if pid is not None else os.getpid(),
+        'tid': span_data['thread_id'],
+        'args': args
+    }
+
+
+class JsonlExporter:
+    """Append finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _line(self, span):
+        return json.dumps(span.to_dict(), default=str)
+
+    def export(self, span):
+        line = self._line(span) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+class ChromeTraceExporter(JsonlExporter):
+    """Append finished spans as Chrome trace events (load the file in Perfetto or chrome://tracing)
+
+    The file is a JSON array that is never closed, which the trace-event
+    format explicitly allows, so spans can be appended as they finish.
+    """
+
+    def _line(self, span):
+        return json.dumps(chrome_event(span.to_dict()), default=str) + ','
+
+    def export(self, span):
+        with self._lock:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write('[\n')
+        super().export(span)
+
+
+_exporter = None
+_exporter_configured = False
+_exporter_lock = threading.Lock()
+
+
+def _configure_from_env():
+    """Create the exporter selected by TRACE_EXPORT (jsonl or chrome), or None"""
+    kind = os.getenv('TRACE_EXPORT', '').lower()
+    if kind not in ('jsonl', 'chrome'):
+        return None
+
+    extension = 'jsonl' if kind == 'jsonl' else 'json'
+    path = os.getenv('TRACE_PATH') or get_data_path(
+        'traces', f"trace-{time.strftime('%Y%m%d')}-{os.getpid()}.{extension}"
+    )
+    return JsonlExporter(path) if kind == 'jsonl' else ChromeTraceExporter(path)
+
+
+def get_exporter():
+    """Return the active exporter (configured from the environment on first use)"""
+    global _exporter, _exporter_configured
+    if not _exporter_configured:
+        with _exporter_lock:
+            if not _exporter_configured:
+                _exporter = _configure_from_env()
+                _exporter_configured = True
+    return _exporter
+
+
+def set_exporter(exporter):
+    """Install an exporter (None turns tracing off), returning the previous one"""
+    global _exporter, _exporter_configured
+    previous = get_exporter()
+    with _exporter_lock:
+        _exporter = exporter
+        _exporter_configured = True
+    return previous
+
+
+@contextmanager
+def span(name, **attributes):
+    """Time a block as a child of the current span (or as a new trace)
+
+    Yields the Span, or None when tracing is off, in which case the block
+    runs with no overhead beyond the exporter lookup.
+    """
+    exporter = get_exporter()
+    if exporter is None:
+        yield None
+        return
+
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - start
+        _current_span.reset(token)
+        try:
+            exporter.export(current)
+        except OSError:
+            pass
+
+
+def traced(name):
+    """Decorator that runs the function inside a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(func):
+    """Wrap func so it runs under the current span, e.g. when handed to a thread pool
+
+    Thread pools don't carry context variables into their workers, so without
+    this spans created in the workers would start new traces.
+    """
+    parent = _current_span.get()
+
+    def wrapper(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return wrapper
+
+
+def convert_to_chrome(jsonl_path, output_path):
+    """Convert a JSONL trace file to a Chrome trace-event JSON file"""
+    events = []
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                events.append(chrome_event(json.loads(line), pid=1))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return len(events)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("Usage: python tracing.py TRACE.jsonl OUTPUT.json")
+        sys.exit(1)
+    count = convert_to_chrome(sys.argv[1], sys.argv[2])
+    print(f"Wrote {count} events to {sys.argv[2]}")
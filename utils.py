@@ -2,6 +2,8 @@ import re
 import streamlit as st
 from datetime import datetime, date
 import json
+from skill_matcher import get_skill_matcher
+from ats_checker import analyze_resume, analyze_text, job_keywords
 
 def validate_email(email):
     """Validate email address format"""
@@ -164,69 +166,37 @@ def get_experience_level(work_experience):
     else:
         return "executive"
 
-def extract_keywords_from_job_description(job_description):
-    """Extract potential keywords from job description for ATS optimization"""
-    import re
-    from collections import Counter
-    
-    # Common stop words to ignore
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-        'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-        'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
-    }
-    
-    # Extract words and phrases
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', job_description.lower())
-    
-    # Filter out stop words
-    filtered_words = [word for word in words if word not in stop_words]
-    
-    # Count frequency
-    word_counts = Counter(filtered_words)
-    
-    # Get most common words (potential keywords)
-    keywords = [word for word, count in word_counts.most_common(20) if count > 1]
-    
-    return keywords
+def extract_keywords_from_job_description(job_description, skills=(), top_n=20):
+    """Extract potential keywords from job description for ATS optimization (see ats_checker.job_keywords)"""
+    return list(job_keywords(job_description or '', tuple(skills), top_n))
 
-def check_ats_compatibility(content):
-    """Check content for ATS compatibility issues"""
-    issues = []
-    recommendations = []
-    
-    # Check for common ATS issues
-    text_content = str(content)
-    
-    # Check for special characters that might cause issues
-    problematic_chars = ['•', '→', '★', '◆', '▪', '▫']
-    for char in problematic_chars:
-        if char in text_content:
-            issues.append(f"Contains special character '{char}' that might not be ATS-friendly")
-            recommendations.append(f"Replace '{char}' with standard bullet points or dashes")
-    
-    # Check for very long lines
-    lines = text_content.split('\n')
-    long_lines = [i for i, line in enumerate(lines) if len(line) > 100]
-    if long_lines:
-        issues.append("Some lines are very long and might not parse well")
-        recommendations.append("Break long sentences into shorter, more digestible bullet points")
-    
-    # Check for proper section headers
-    required_headers = ['experience', 'education', 'skills']
-    text_lower = text_content.lower()
-    missing_headers = [header for header in required_headers if header not in text_lower]
-    
-    if missing_headers:
-        issues.append(f"Missing standard section headers: {', '.join(missing_headers)}")
-        recommendations.append("Include standard section headers for better ATS parsing")
-    
-    return {
-        'issues': issues,
-        'recommendations': recommendations,
-        'ats_score': max(0, 100 - len(issues) * 10)  # Simple scoring system
-    }
+def highlight_skills(text, skills=(), marker='**'):
+    """Wrap every skill mention in text with a marker (Markdown bold by default)"""
+    matches = get_skill_matcher(skills).find_all(text)
+    if not matches:
+        return text
+    
+    parts = []
+    last_end = 0
+    for match in matches:
+        parts.append(text[last_end:match.start])
+        parts.append(f"{marker}{match.text}{marker}")
+        last_end = match.end
+    parts.append(text[last_end:])
+    
+    return ''.join(parts)
+
+def check_ats_compatibility(content, job_description=None):
+    """Check content for ATS compatibility issues
+
+    Accepts a structured resume (dict) or plain text such as the text of the
+    rendered PDF. Returns issues, recommendations and a score, plus per-section
+    issues and keyword coverage when a job description is given.
+    """
+    if isinstance(content, dict):
+        return analyze_resume(content, job_description)
+    
+    return analyze_text(str(content), job_description)
 
 def generate_filename_suggestions(personal_info, document_type):
     """Generate filename suggestions for downloads"""